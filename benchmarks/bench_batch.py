@@ -0,0 +1,95 @@
+"""Benchmark batch matching against sequential nearest available at up-peak.
+
+Every few ticks a burst of calls arrives at the lobby, with some
+interfloor calls in between. Runs the same calls assigned one by one by
+`nearest_available` and jointly per tick by `matching.BatchMatcher`,
+reporting waits, total times, and decision latency per call or batch.
+
+    python -m benchmarks.bench_batch --duration 5000 --burst 24 --every 20
+"""
+
+import argparse
+import random
+import time
+
+from orrery.matching import BatchMatcher
+from orrery.simulator import Building, nearest_available
+from orrery.stats import PassengerStats
+
+
+def up_peak_requests(args):
+    requests = []
+    for tick in range(args.duration):
+        if tick % args.every == 0:
+            for _ in range(args.burst):
+                dest = random.randint(2, args.floors)
+                requests.append((tick, len(requests), 1, dest))
+        if random.random() < args.interfloor:
+            source, dest = random.sample(range(1, args.floors + 1), 2)
+            requests.append((tick, len(requests), source, dest))
+    return requests
+
+
+def run(args, requests, batch):
+    building = Building(
+        args.floors,
+        args.elevators,
+        args.capacity,
+        nearest_available,
+        stats=PassengerStats(),
+        keep_passenger_times=False,
+        batch_strategy=BatchMatcher() if batch else None,
+    )
+    start = time.perf_counter()
+    building.run_simulation(requests, event_driven=True, report=False)
+    elapsed = time.perf_counter() - start
+    return building.summary_statistics(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark batch matching against sequential nearest available.",
+    )
+    parser.add_argument("-d", "--duration", type=int, default=5000)
+    parser.add_argument("-f", "--floors", type=int, default=30)
+    parser.add_argument("-e", "--elevators", type=int, default=8)
+    parser.add_argument("-c", "--capacity", type=int, default=12)
+    parser.add_argument("--burst", type=int, default=24, help="Lobby calls per burst")
+    parser.add_argument("--every", type=int, default=20, help="Ticks between bursts")
+    parser.add_argument(
+        "--interfloor", type=float, default=0.3, help="Interfloor calls per tick"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    requests = up_peak_requests(args)
+    print(
+        f"{len(requests)} calls, {args.burst} at the lobby every {args.every} ticks, "
+        f"{args.elevators} elevators of capacity {args.capacity}"
+    )
+    print(
+        f"{'dispatch':>10} {'mean wait':>10} {'p95 wait':>9} {'mean total':>11} "
+        f"{'seconds':>8}"
+    )
+    results = {}
+    for name, batch in (("sequential", False), ("batch", True)):
+        summary, elapsed = run(args, requests, batch)
+        results[name] = summary
+        print(
+            f"{name:>10} {summary['mean_wait']:>10.2f} {summary['p95_wait']:>9} "
+            f"{summary['mean_total']:>11.2f} {elapsed:>8.2f}"
+        )
+    batch = results["batch"]
+    gain = 1 - batch["mean_wait"] / results["sequential"]["mean_wait"]
+    print(f"Batch matching: {gain:.1%} lower mean wait than sequential nearest")
+    print(
+        f"{batch['batches']} batches of mean {batch['mean_batch']:.1f} calls, "
+        f"decision mean {batch['mean_batch_decision'] * 1e3:.3f}ms, "
+        f"p95 < {batch['p95_batch_decision'] * 1e3:.3f}ms, "
+        f"max {batch['max_batch_decision'] * 1e3:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
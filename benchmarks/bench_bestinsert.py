@@ -0,0 +1,74 @@
+"""Benchmark REOPT-BESTINSERT decision latency and service against nearest.
+
+Runs the same heavy traffic through `best_insertion` and
+`nearest_available`, timing every assignment decision. The README
+requires each assignment within one second.
+
+    python -m benchmarks.bench_bestinsert --floors 50 --elevators 16 --arrivingevery 0.5
+"""
+
+import argparse
+import random
+import time
+
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import Building, best_insertion, nearest_available
+from orrery.stats import PassengerStats
+
+
+def timed_strategy(strategy, latencies):
+    """Wrap strategy to record the wall-clock time of each decision."""
+
+    def timed(elevators, passenger_id, source_floor, dest_floor):
+        start = time.perf_counter()
+        elevator = strategy(elevators, passenger_id, source_floor, dest_floor)
+        latencies.append(time.perf_counter() - start)
+        return elevator
+
+    return timed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark best insertion against nearest available.",
+    )
+    parser.add_argument("-f", "--floors", type=int, default=50)
+    parser.add_argument("-e", "--elevators", type=int, default=16)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("-d", "--duration", type=int, default=3600)
+    parser.add_argument("--arrivingevery", type=float, default=0.5)
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    hall_calls = generate_hall_calls(args.duration, args.floors, args.arrivingevery)
+    requests = generate_requests(hall_calls)
+    print(
+        f"{len(requests)} requests, {args.floors} floors, "
+        f"{args.elevators} elevators of capacity {args.capacity}"
+    )
+    print(
+        f"{'strategy':>18} {'mean wait':>10} {'p95 wait':>9} {'mean total':>11} "
+        f"{'mean decision':>14} {'max decision':>13}"
+    )
+    for strategy in (nearest_available, best_insertion):
+        latencies = []
+        building = Building(
+            args.floors,
+            args.elevators,
+            args.capacity,
+            timed_strategy(strategy, latencies),
+            stats=PassengerStats(),
+        )
+        building.run_simulation(requests, report=False)
+        summary = building.summary_statistics()
+        print(
+            f"{strategy.__name__:>18} {summary['mean_wait']:>10.2f} "
+            f"{summary['p95_wait']:>9} {summary['mean_total']:>11.2f} "
+            f"{sum(latencies) / len(latencies) * 1e3:>12.3f}ms "
+            f"{max(latencies) * 1e3:>11.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark per-request dispatch latency with and without the elevator index.
+
+Cars are scattered over random floors with random loads, then the same
+burst of hall calls is dispatched by `nearest_available` over a plain
+list (sort and scan) and over `IndexedElevators`. Both must pick the
+same cars.
+
+    python -m benchmarks.bench_dispatch_index --sizes 10 100 1000
+"""
+
+import argparse
+import random
+import time
+
+from orrery.elevator_index import IndexedElevators
+from orrery.simulator import Elevator, nearest_available
+
+
+def scattered_elevators(count, floors, capacity):
+    elevators = []
+    for i in range(1, count + 1):
+        elevator = Elevator(i, capacity)
+        elevator.current_floor = random.randint(1, floors)
+        for pid in range(random.randint(0, capacity)):
+            elevator.passengers[pid] = random.randint(1, floors)
+        elevators.append(elevator)
+    return elevators
+
+
+def time_dispatch(elevators, calls):
+    start = time.perf_counter()
+    chosen = [
+        nearest_available(elevators, None, source, dest) for source, dest in calls
+    ]
+    return (time.perf_counter() - start) / len(calls), chosen
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark nearest_available dispatch with the elevator index.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("-f", "--floors", type=int, default=50)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("-n", "--calls", type=int, default=2000)
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'elevators':>9} {'list':>10} {'indexed':>10} {'speedup':>8}")
+    for size in args.sizes:
+        random.seed(args.seed)
+        elevators = scattered_elevators(size, args.floors, args.capacity)
+        calls = [
+            (random.randint(1, args.floors), random.randint(1, args.floors))
+            for _ in range(args.calls)
+        ]
+        list_time, list_chosen = time_dispatch(list(elevators), calls)
+        index_time, index_chosen = time_dispatch(IndexedElevators(elevators), calls)
+        assert list_chosen == index_chosen
+        print(
+            f"{size:>9} {list_time * 1e6:>8.1f}us {index_time * 1e6:>8.1f}us "
+            f"{list_time / index_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
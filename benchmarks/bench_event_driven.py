@@ -0,0 +1,65 @@
+"""Benchmark event-driven time advance against tick-by-tick simulation.
+
+Generates a long, low-traffic request set (e.g., overnight hours) and runs
+the same building through both modes, checking outputs match exactly.
+
+    python -m benchmarks.bench_event_driven --duration 86400 --arrivingevery 120
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import Building, nearest_available
+
+
+def timed_run(requests, floors, elevators, capacity, event_driven):
+    building = Building(floors, elevators, capacity, nearest_available)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        building.run_simulation(requests, event_driven=event_driven)
+    return time.perf_counter() - start, building
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark event-driven vs tick-by-tick simulation.",
+    )
+    parser.add_argument("-f", "--floors", type=int, default=50)
+    parser.add_argument("-e", "--elevators", type=int, default=8)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("-d", "--duration", type=int, default=86400)
+    parser.add_argument("--arrivingevery", type=float, default=120.0)
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    hall_calls = generate_hall_calls(args.duration, args.floors, args.arrivingevery)
+    requests = generate_requests(hall_calls)
+    print(
+        f"{len(requests)} requests over {args.duration} ticks, "
+        f"{args.floors} floors, {args.elevators} elevators"
+    )
+
+    tick_time, ticked = timed_run(
+        requests, args.floors, args.elevators, args.capacity, False
+    )
+    event_time, evented = timed_run(
+        requests, args.floors, args.elevators, args.capacity, True
+    )
+
+    assert dict(ticked.state_log) == dict(evented.state_log), "state logs differ"
+    assert ticked.wait_times == evented.wait_times, "wait times differ"
+    assert ticked.travel_times == evented.travel_times, "travel times differ"
+
+    ticks = len(ticked.state_log)
+    print(f"Tick-by-tick: {tick_time:.3f}s ({ticks / tick_time:,.0f} ticks/s)")
+    print(f"Event-driven: {event_time:.3f}s ({ticks / event_time:,.0f} ticks/s)")
+    print(f"Speedup: {tick_time / event_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark vectorized, chunked hall-call generation against the loop.
+
+Generates the same traffic with `generate_hall_calls` (then
+`write_requests_to_csv`) and with `generate_hall_call_chunks` streamed to
+CSV and to a binary requests file, reporting wall time and peak traced
+memory for each.
+
+    python -m benchmarks.bench_generation --duration 1000000 --floors 50
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from orrery.request_generator import (
+    generate_hall_call_chunks,
+    generate_hall_calls,
+    generate_requests,
+    write_chunks_to_binary,
+    write_chunks_to_csv,
+    write_requests_to_csv,
+)
+
+
+def measure(function):
+    """Return (wall time, peak traced memory) of one call, timed untraced."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark vectorized hall-call generation against the loop.",
+    )
+    parser.add_argument("-d", "--duration", type=int, default=1_000_000)
+    parser.add_argument("-f", "--floors", type=int, default=50)
+    parser.add_argument("--arrivingevery", type=float, default=1.0)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    def loop_csv():
+        random.seed(args.seed)
+        hall_calls = generate_hall_calls(args.duration, args.floors, args.arrivingevery)
+        write_requests_to_csv(generate_requests(hall_calls), filepath("loop.csv"))
+
+    def chunks():
+        return generate_hall_call_chunks(
+            args.duration, args.floors, args.arrivingevery, args.seed, args.chunk_size
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        def filepath(name):
+            return os.path.join(directory, name)
+
+        cases = [
+            ("loop to CSV", loop_csv),
+            ("chunks to CSV", lambda: write_chunks_to_csv(chunks(), filepath("c.csv"))),
+            (
+                "chunks to binary",
+                lambda: write_chunks_to_binary(chunks(), filepath("c.bin")),
+            ),
+        ]
+        print(f"{args.duration} time units, {args.floors} floors")
+        print(f"{'generator':>18} {'seconds':>9} {'peak MiB':>9}")
+        for name, function in cases:
+            elapsed, peak_memory = measure(function)
+            print(f"{name:>18} {elapsed:>9.2f} {peak_memory / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Stress benchmark for boarding from a crowded lobby at morning up-peak.
+
+Thousands of passengers call from floor 1 within a few ticks, so the
+lobby queue stays long while cars shuttle them upstairs.
+
+    python -m benchmarks.bench_lobby_queue --passengers 5000 --burst 10
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from orrery.simulator import Building, nearest_available
+
+
+def up_peak_requests(passengers, burst, floors):
+    """All calls from the lobby, spread evenly over the first burst ticks."""
+    return [
+        (i * burst // passengers, f"passenger{i}", 1, random.randint(2, floors))
+        for i in range(passengers)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark boarding from a crowded lobby queue.",
+    )
+    parser.add_argument("-p", "--passengers", type=int, default=5000)
+    parser.add_argument("--burst", type=int, default=10, help="Ticks of arrivals")
+    parser.add_argument("-f", "--floors", type=int, default=30)
+    parser.add_argument("-e", "--elevators", type=int, default=8)
+    parser.add_argument("-c", "--capacity", type=int, default=12)
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    requests = up_peak_requests(args.passengers, args.burst, args.floors)
+    building = Building(args.floors, args.elevators, args.capacity, nearest_available)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        building.run_simulation(requests)
+    elapsed = time.perf_counter() - start
+
+    ticks = len(building.state_log)
+    print(
+        f"{args.passengers} lobby calls over {args.burst} ticks, "
+        f"{args.elevators} elevators of capacity {args.capacity}"
+    )
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / elapsed:,.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark lockstep strategy comparison against one run per strategy.
+
+Times evaluating the same strategies on one requests CSV as separate
+runs, each loading the CSV and simulating on its own (as running the
+simulator once per strategy does, minus process startup), and as one
+`lockstep.compare_strategies` pass loading the CSV once.
+
+    python -m benchmarks.bench_lockstep --duration 20000 --floors 30 --elevators 8
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from orrery.lockstep import compare_strategies
+from orrery.request_generator import generate_hall_call_chunks, write_chunks_to_csv
+from orrery.simulator import (
+    STRATEGIES,
+    Building,
+    load_requests_from_csv,
+    make_strategy,
+)
+from orrery.stats import PassengerStats
+
+
+def separate_runs(args, filepath):
+    summaries = {}
+    for name in args.strategies:
+        random.seed(args.seed)
+        building = Building(
+            args.floors,
+            args.elevators,
+            args.capacity,
+            make_strategy(name),
+            stats=PassengerStats(),
+            keep_passenger_times=False,
+        )
+        building.run_simulation(load_requests_from_csv(filepath), report=False)
+        summaries[name] = building.summary_statistics()
+    return summaries
+
+
+def lockstep_run(args, filepath):
+    return compare_strategies(
+        args.floors,
+        args.elevators,
+        args.capacity,
+        args.strategies,
+        load_requests_from_csv(filepath),
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark lockstep strategy comparison against separate runs.",
+    )
+    parser.add_argument("-d", "--duration", type=int, default=20000)
+    parser.add_argument("-f", "--floors", type=int, default=30)
+    parser.add_argument("-e", "--elevators", type=int, default=8)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("--arrivingevery", type=float, default=1.0)
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGIES),
+        default=["random", "available", "nearest"],
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "requests.csv")
+        chunks = generate_hall_call_chunks(
+            args.duration, args.floors, args.arrivingevery, args.seed
+        )
+        write_chunks_to_csv(chunks, filepath)
+        print(f"{'evaluation':>10} {'seconds':>9}")
+        for name, function in (("separate", separate_runs), ("lockstep", lockstep_run)):
+            elapsed = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                summaries = function(args, filepath)
+                elapsed.append(time.perf_counter() - start)
+            print(f"{name:>10} {min(elapsed):>9.2f}")
+        for name, summary in summaries.items():
+            print(f"{name}: mean total {summary['mean_total']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
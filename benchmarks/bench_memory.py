@@ -0,0 +1,97 @@
+"""Benchmark memory per passenger of compact passenger times.
+
+Feeds the same generated hall calls to a default `Building`, with ID
+strings as read from a requests CSV and dicts of passenger times, and to
+a compact one (`Building(..., compact=True)`), with integer IDs and
+passenger times in typed arrays. Reports traced bytes per passenger
+held in flight (requested, not yet served) and per passenger served
+(times kept after the run). Elevator states go to a binary trace on
+/dev/null, so the state log doesn't count.
+
+    python -m benchmarks.bench_memory --in-flight 500000 --duration 200000
+"""
+
+import argparse
+import os
+import tracemalloc
+
+from orrery.request_generator import generate_hall_call_chunks, stream_requests
+from orrery.simulator import STRATEGIES, Building, make_strategy
+from orrery.state_trace import StateTraceWriter
+
+
+def generated_requests(args, duration, string_ids):
+    chunks = generate_hall_call_chunks(
+        duration, args.floors, args.arrivingevery, args.seed
+    )
+    for time, pid, source, dest in stream_requests(chunks):
+        yield time, f"passenger{pid}" if string_ids else pid, source, dest
+
+
+def traced_bytes_per_passenger(args, compact, served):
+    """Return traced bytes per passenger still held after feeding calls.
+
+    Requests are generated lazily inside the trace, so ID strings only
+    count while the building keeps them.
+    """
+    tracemalloc.start()
+    building = Building(
+        args.floors,
+        args.elevators,
+        args.capacity,
+        make_strategy(args.strategy),
+        StateTraceWriter(os.devnull),
+        compact=compact,
+    )
+    if served:
+        requests = generated_requests(args, args.duration, not compact)
+        building.run_simulation(requests, event_driven=True, report=False)
+        passengers = len(building.travel_times)
+    else:
+        # Only requesting, never simulating, leaves every call in flight
+        requests = generated_requests(args, args.in_flight, not compact)
+        for request in requests:
+            building.process_request(*request)
+        passengers = len(building.wait_times)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained / passengers, passengers
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark memory per passenger of compact passenger times.",
+    )
+    parser.add_argument(
+        "--in-flight",
+        type=int,
+        default=500_000,
+        help="Duration of hall calls to leave in flight",
+    )
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=int,
+        default=200_000,
+        help="Duration of hall calls to simulate to the end",
+    )
+    parser.add_argument("-f", "--floors", type=int, default=50)
+    parser.add_argument("-e", "--elevators", type=int, default=16)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("-s", "--strategy", choices=list(STRATEGIES), default="nearest")
+    parser.add_argument("--arrivingevery", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'representation':>16} {'passengers':>11} {'bytes/passenger':>16}")
+    for served in (False, True):
+        print("served" if served else "in flight")
+        for name, compact in (("dicts", False), ("compact", True)):
+            per_passenger, passengers = traced_bytes_per_passenger(
+                args, compact, served
+            )
+            print(f"{name:>16} {passengers:>11} {per_passenger:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
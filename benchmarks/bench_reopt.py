@@ -0,0 +1,80 @@
+"""Benchmark the anytime reoptimizer against best insertion.
+
+Runs the same traffic through `best_insertion` and a `Reoptimizer` with
+the given time budget, reporting service, decision latency, and for the
+reoptimizer the share of decisions proven optimal and the mean gap.
+
+    python -m benchmarks.bench_reopt --floors 20 --elevators 8 --budget 0.05
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from orrery.reopt import Reoptimizer
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import Building, best_insertion
+from orrery.stats import PassengerStats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the anytime reoptimizer against best insertion.",
+    )
+    parser.add_argument("-f", "--floors", type=int, default=20)
+    parser.add_argument("-e", "--elevators", type=int, default=8)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("-d", "--duration", type=int, default=1800)
+    parser.add_argument("--arrivingevery", type=float, default=1.0)
+    parser.add_argument("--budget", type=float, default=0.05, help="Seconds")
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    hall_calls = generate_hall_calls(args.duration, args.floors, args.arrivingevery)
+    requests = generate_requests(hall_calls)
+    print(
+        f"{len(requests)} requests, {args.floors} floors, "
+        f"{args.elevators} elevators of capacity {args.capacity}, "
+        f"{args.budget}s budget"
+    )
+
+    reoptimizer = Reoptimizer(time_budget=args.budget)
+    solutions = []
+
+    def reopt(elevators, passenger_id, source_floor, dest_floor):
+        elevator = reoptimizer(elevators, passenger_id, source_floor, dest_floor)
+        solutions.append(reoptimizer.last_solution)
+        return elevator
+
+    for name, strategy in (("bestinsert", best_insertion), ("reopt", reopt)):
+        latencies = []
+
+        def timed(elevators, passenger_id, source_floor, dest_floor):
+            start = time.perf_counter()
+            elevator = strategy(elevators, passenger_id, source_floor, dest_floor)
+            latencies.append(time.perf_counter() - start)
+            return elevator
+
+        building = Building(
+            args.floors, args.elevators, args.capacity, timed, stats=PassengerStats()
+        )
+        building.run_simulation(requests, report=False)
+        summary = building.summary_statistics()
+        print(
+            f"{name:>10}: mean wait {summary['mean_wait']:.2f}, "
+            f"mean time to destination {summary['mean_total']:.2f}, "
+            f"decision mean {statistics.fmean(latencies) * 1e3:.2f}ms "
+            f"max {max(latencies) * 1e3:.2f}ms"
+        )
+    solved = [solution for solution in solutions if solution is not None]
+    proven = sum(solution.proven for solution in solved)
+    print(
+        f"{'':>10}  {proven / len(solved):.1%} of decisions proven optimal, "
+        f"mean gap {statistics.fmean(s.gap for s in solved):.2%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark the vectorized engine against the object-per-car `Building`.
+
+Traffic scales with group size so each car sees a similar load. Both
+engines run the same requests and must produce identical results.
+
+    python -m benchmarks.bench_vectorized --sizes 10 100 1000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import Building, nearest_available
+from orrery.vectorized import VectorBuilding
+
+
+def timed_run(engine, requests, floors, elevators, capacity):
+    building = engine(floors, elevators, capacity, nearest_available)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        building.run_simulation(requests)
+    return time.perf_counter() - start, building
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark vectorized vs object-per-car simulation.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("-f", "--floors", type=int, default=50)
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("-d", "--duration", type=int, default=1000)
+    parser.add_argument(
+        "--calls-per-car",
+        type=float,
+        default=0.02,
+        help="Mean hall calls per car per tick",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"{'elevators':>9} {'requests':>9} {'ticks':>6} {'Building':>9} "
+        f"{'Vector':>9} {'speedup':>8}"
+    )
+    for elevators in args.sizes:
+        random.seed(args.seed)
+        arriving_every = 1.0 / (args.calls_per_car * elevators)
+        hall_calls = generate_hall_calls(args.duration, args.floors, arriving_every)
+        requests = generate_requests(hall_calls)
+
+        object_time, building = timed_run(
+            Building, requests, args.floors, elevators, args.capacity
+        )
+        vector_time, vector_building = timed_run(
+            VectorBuilding, requests, args.floors, elevators, args.capacity
+        )
+        assert building.wait_times == vector_building.wait_times
+        assert building.travel_times == vector_building.travel_times
+        assert dict(building.state_log) == vector_building.state_log
+
+        print(
+            f"{elevators:>9} {len(requests):>9} {len(building.state_log):>6} "
+            f"{object_time:>8.2f}s {vector_time:>8.2f}s "
+            f"{object_time / vector_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Scaling benchmark suite with a stored regression baseline.
+
+Times request generation, CSV loading, and `Building.run_simulation` for
+each strategy over a grid of floors, elevators, and request counts, with
+requests generated from a fixed seed. Records median wall time (with its
+spread over repeats), ticks/sec, peak traced memory, and per-request
+dispatch latency to JSON, and fails when wall time, ticks/sec, or memory
+regress past a threshold against a stored baseline. The threshold widens
+by the measured noise of each timing, so noisy cases don't flag
+unchanged code. Dispatch latencies of a few microseconds are too noisy
+to gate on, so they are recorded only.
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.25
+
+Baselines are machine-specific; save one on the machine that compares.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import product
+
+from orrery.request_generator import (
+    generate_hall_calls,
+    generate_requests,
+    write_requests_to_csv,
+)
+from orrery.simulator import (
+    STRATEGIES,
+    Building,
+    load_requests_from_csv,
+    make_strategy,
+)
+
+# Direction in which each metric gets worse: 1 if higher is worse
+REGRESSION_METRICS = {
+    "wall_time": 1,
+    "ticks_per_sec": -1,
+    "peak_memory": 1,
+}
+# Timing metrics, scaled by calibration and widened by measured noise
+TIMED_METRICS = ["wall_time", "ticks_per_sec"]
+NOISE_SIGMAS = 3  # Extra allowance per standard deviation of timing noise
+# Reoptimization is bounded by its time budget, so is opt-in here
+DEFAULT_STRATEGIES = ["random", "available", "nearest", "bestinsert"]
+CALLS_PER_CAR = 0.05  # Mean hall calls per car per tick
+
+
+def calibrate(repeat=9):
+    """Time a fixed pure-Python workload, to normalize for machine speed.
+
+    Returns the median, as for the timings it normalizes.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(300_000):
+            total += i % 7
+        sorted(range(100_000), key=lambda x: -x)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def seeded_requests(floors, elevators, count, seed):
+    """Return exactly count requests from a fixed seed (or all generated)."""
+    random.seed(seed)
+    arriving_every = 1.0 / (CALLS_PER_CAR * elevators)
+    hall_calls = generate_hall_calls(2 * count * arriving_every, floors, arriving_every)
+    return generate_requests(hall_calls)[:count]
+
+
+def relative_noise(times):
+    """Return the spread of times relative to their median.
+
+    Estimated as a standard deviation from the median absolute deviation,
+    which a few outliers (e.g., a busy moment) don't inflate.
+    """
+    median = statistics.median(times)
+    deviation = statistics.median(abs(t - median) for t in times)
+    return 1.4826 * deviation / median if median > 0 else 0.0
+
+
+def measure(function, repeat, seed):
+    """Return median wall time, its relative noise, peak memory, and result.
+
+    Every run reseeds random first, so random strategies repeat the same
+    work. As with timeit, garbage collection is off while timing. The
+    result is that of the last run. Memory is traced in a separate run
+    after the timed ones, as tracing slows execution down, once earlier
+    garbage is collected.
+    """
+    times = []
+    for _ in range(repeat):
+        random.seed(seed)
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = function()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    random.seed(seed)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), relative_noise(times), peak_memory, result
+
+
+def bench_generation(floors, elevators, count, seed, repeat):
+    wall_time, noise, peak_memory, _ = measure(
+        lambda: seeded_requests(floors, elevators, count, seed), repeat, seed
+    )
+    return {"wall_time": wall_time, "noise": noise, "peak_memory": peak_memory}
+
+
+def bench_loading(requests, seed, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "requests.csv")
+        write_requests_to_csv(requests, filepath)
+        wall_time, noise, peak_memory, _ = measure(
+            lambda: load_requests_from_csv(filepath), repeat, seed
+        )
+    return {"wall_time": wall_time, "noise": noise, "peak_memory": peak_memory}
+
+
+def bench_simulation(requests, floors, elevators, capacity, strategy, seed, repeat):
+    latencies = []
+
+    def timed(elevators, passenger_id, source_floor, dest_floor):
+        start = time.perf_counter()
+        elevator = strategy(elevators, passenger_id, source_floor, dest_floor)
+        latencies.append(time.perf_counter() - start)
+        return elevator
+
+    def run():
+        latencies.clear()
+        building = Building(floors, elevators, capacity, timed)
+        building.run_simulation(requests, report=False)
+        return len(building.state_log), list(latencies)
+
+    wall_time, noise, peak_memory, (ticks, run_latencies) = measure(run, repeat, seed)
+    return {
+        "wall_time": wall_time,
+        "noise": noise,
+        "ticks": ticks,
+        "ticks_per_sec": ticks / wall_time,
+        "peak_memory": peak_memory,
+        "dispatch_mean": statistics.fmean(run_latencies),
+        "dispatch_p95": statistics.quantiles(run_latencies, n=20, method="inclusive")[
+            -1
+        ],
+        "dispatch_max": max(run_latencies),
+    }
+
+
+def run_suite(floors, elevators, counts, strategies, capacity, seed, repeat):
+    """Return {case name: {metric: value}} over the whole grid."""
+    results = {}
+    for num_floors, num_elevators, count in product(floors, elevators, counts):
+        grid_point = f"f{num_floors}-e{num_elevators}-r{count}"
+        requests = seeded_requests(num_floors, num_elevators, count, seed)
+        results[f"generate_hall_calls/{grid_point}"] = bench_generation(
+            num_floors, num_elevators, count, seed, repeat
+        )
+        results[f"load_requests_from_csv/{grid_point}"] = bench_loading(
+            requests, seed, repeat
+        )
+        for name in strategies:
+            results[f"run_simulation/{name}/{grid_point}"] = bench_simulation(
+                requests,
+                num_floors,
+                num_elevators,
+                capacity,
+                make_strategy(name),
+                seed,
+                repeat,
+            )
+        print(f"Finished {grid_point}", file=sys.stderr)
+    return results
+
+
+def find_regressions(results, baseline, threshold, speed=1.0):
+    """Return (case, metric, baseline, current, change) past threshold.
+
+    Baseline timings are scaled by speed, the ratio of current to baseline
+    calibration time, so a uniformly slower (e.g., busy) machine doesn't
+    read as a regression. Timings may also change by NOISE_SIGMAS times
+    the larger of their baseline and current noise on top of threshold.
+    """
+    regressions = []
+    for case, metrics in results.items():
+        for metric, worse in REGRESSION_METRICS.items():
+            if metric not in metrics or metric not in baseline.get(case, {}):
+                continue
+            before, after = baseline[case][metric], metrics[metric]
+            if before <= 0:
+                continue
+            allowed = threshold
+            if metric in TIMED_METRICS:
+                before = before * speed if worse > 0 else before / speed
+                noise = max(baseline[case].get("noise", 0), metrics.get("noise", 0))
+                allowed += NOISE_SIGMAS * noise
+            change = (after - before) / before
+            if worse * change > allowed:
+                regressions.append((case, metric, before, after, change))
+    return regressions
+
+
+def print_results(results):
+    for case, metrics in results.items():
+        summary = ", ".join(
+            f"{metric} {value:.4g}" for metric, value in metrics.items()
+        )
+        print(f"{case}: {summary}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the scaling benchmark suite against a baseline.",
+    )
+    parser.add_argument("-f", "--floors", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("-e", "--elevators", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("-r", "--requests", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGIES),
+        default=DEFAULT_STRATEGIES,
+    )
+    parser.add_argument("-c", "--capacity", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=7, help="Median of N timings")
+    parser.add_argument("--save", type=str, help="Write results as new baseline")
+    parser.add_argument("--baseline", type=str, help="Baseline JSON to compare")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression per metric (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    results = run_suite(
+        args.floors,
+        args.elevators,
+        args.requests,
+        args.strategies,
+        args.capacity,
+        args.seed,
+        args.repeat,
+    )
+    print_results(results)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "calibration": calibration,
+                    "results": results,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        speed = calibration / baseline["calibration"]
+        regressions = find_regressions(
+            results, baseline["results"], args.threshold, speed
+        )
+        for case, metric, before, after, change in regressions:
+            print(
+                f"REGRESSION {case} {metric}: {before:.4g} -> {after:.4g} "
+                f"({change:+.0%})"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions past {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Run the simulator: ``python -m orrery`` takes the same arguments as
+``python -m orrery.simulator``.
+
+The CLI lives here rather than under orrery.simulator's ``__main__`` guard
+so that snapshots pickle the building's classes and strategies as
+orrery.simulator's, which orrery.snapshots can load, instead of __main__'s.
+"""
+
+from orrery.simulator import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Deadline-enforced dispatch with a cheap fallback strategy.
+
+The README requires each assignment within one second of its request,
+but a strategy call runs to completion however long it takes. A
+`DeadlineDispatcher` wraps a strategy, holding each decision to a
+wall-clock budget:
+
+- Anytime strategies (with a time_budget, e.g., reopt.Reoptimizer) get
+  their search capped to a share of the budget, so they usually stop in
+  time with the best assignment found so far.
+- Any primary decision still running at the budget is interrupted (by a
+  SIGALRM timer, on the main thread of Unix systems; elsewhere it runs to
+  completion). Either way, a primary decision over budget is discarded:
+  the cars' routes are restored as they were, and the fallback (e.g.,
+  nearest available) assigns the request instead.
+- After an overrun, the next cooldown decisions go straight to the
+  fallback before the primary strategy is tried again.
+
+With a primary strategy that plans routes (see routes.plans_routes),
+fallback assignments are marked as outside the assigned car's route
+(`Elevator.unrouted`). Cars otherwise follow their routes before any
+other targets, so those passengers would wait behind every routed one;
+instead, a car with unrouted passengers moves by its movement rule over
+all its targets until they are delivered.
+
+Per-decision latencies, overruns, and fallbacks are reported with the
+run's statistics.
+
+    python -m orrery.simulator -f 50 -e 16 -c 8 --generate 20000 --seed 1 \
+        -s reopt --decision-budget 0.002 --fallback nearest
+"""
+
+import math
+import signal
+import threading
+import time
+
+from orrery.profiling import DECISION_DEADLINE, LatencyHistogram
+from orrery.routes import plans_routes
+
+ANYTIME_SHARE = 0.5  # Of the budget, for anytime searches to stop within
+MIN_TIMER = 1e-6  # Seconds; a zero interval would disarm the timer
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def strategy_name(strategy):
+    return getattr(strategy, "__name__", type(strategy).__name__)
+
+
+class DeadlineDispatcher:
+    """Strategy holding each decision of another to a wall-clock budget.
+
+    Call it like any strategy function; it's picklable if both
+    strategies are, so dispatching buildings can be snapshot.
+
+    Args:
+        strategy: Primary strategy, possibly slow
+        fallback: Cheap strategy deciding when the primary overruns
+        budget (float): Wall-clock seconds per decision
+        cooldown (int): Decisions left to the fallback after an overrun
+    """
+
+    def __init__(self, strategy, fallback, budget=DECISION_DEADLINE, cooldown=100):
+        self.strategy = strategy
+        self.fallback = fallback
+        self.budget = budget
+        self.cooldown = cooldown
+        self.anytime = hasattr(strategy, "time_budget")
+        self.plans_routes = plans_routes(strategy)
+        self.latencies = LatencyHistogram()
+        self.overruns = 0  # Primary decisions over budget, discarded
+        self.fallbacks = 0  # Decisions made by the fallback
+        self.late = 0  # Decisions over budget, fallback included
+        self.tripped = 0  # Decisions left to the fallback
+        self.armed = False  # Whether the timer may interrupt the primary
+
+    def __call__(self, elevators, passenger_id, source_floor, dest_floor):
+        start = time.perf_counter()
+        primary = not self.tripped
+        if primary:
+            try:
+                elevator = self.call_primary(
+                    elevators, passenger_id, source_floor, dest_floor
+                )
+            except DeadlineExceeded:
+                self.overruns += 1
+                self.tripped = self.cooldown
+                primary = False
+        else:
+            self.tripped -= 1
+        if not primary:
+            self.fallbacks += 1
+            elevator = self.fallback(elevators, passenger_id, source_floor, dest_floor)
+            if elevator and self.plans_routes:
+                elevator.unrouted.add(passenger_id)
+        latency = time.perf_counter() - start
+        self.latencies.add(latency)
+        if latency > self.budget:
+            self.late += 1
+        return elevator
+
+    def call_primary(self, elevators, passenger_id, source_floor, dest_floor):
+        """Return the primary's assignment, raising DeadlineExceeded if late.
+
+        Routes are saved first, so a decision cut short or over budget
+        leaves them exactly as they were.
+        """
+        strategy = self.strategy
+        start = time.perf_counter()
+        saved = []
+        if self.plans_routes:
+            saved = [(e.route, list(e.route.stops)) for e in elevators]
+        if self.anytime:
+            # Capped for this call only, as the strategy may be shared
+            time_budget = strategy.time_budget
+            strategy.time_budget = min(time_budget, self.budget * ANYTIME_SHARE)
+        interrupt = (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+        if interrupt:
+            previous_handler = signal.signal(signal.SIGALRM, self.interrupt)
+        try:
+            try:
+                if interrupt:
+                    self.armed = True
+                    signal.setitimer(signal.ITIMER_REAL, max(self.budget, MIN_TIMER))
+                elevator = strategy(elevators, passenger_id, source_floor, dest_floor)
+            finally:
+                # A signal handled after disarming no longer interrupts
+                self.armed = False
+                if interrupt:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            if time.perf_counter() - start > self.budget:
+                raise DeadlineExceeded()
+        except DeadlineExceeded:
+            for route, stops in saved:
+                route.replace(stops)
+            raise
+        finally:
+            if interrupt:
+                signal.signal(signal.SIGALRM, previous_handler)
+            if self.anytime:
+                strategy.time_budget = time_budget
+        return elevator
+
+    def interrupt(self, signum, frame):
+        if self.armed:
+            raise DeadlineExceeded()
+
+    def summary(self):
+        """Return decision latency, overrun, and fallback KPIs as a flat dict."""
+        latencies = self.latencies
+        decisions = latencies.count
+        return {
+            "decisions": decisions,
+            "decision_budget": self.budget,
+            "mean_decision": latencies.total / decisions if decisions else math.nan,
+            "p95_decision": latencies.quantile(0.95),
+            "max_decision": latencies.max,
+            "late_decisions": self.late,
+            "overruns": self.overruns,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": self.fallbacks / decisions if decisions else math.nan,
+        }
+
+    def print_report(self):
+        summary = self.summary()
+        decisions = summary["decisions"]
+        if not decisions:
+            return
+        print(
+            f"Decisions - {decisions} within {self.budget}s budget: "
+            f"{1 - self.late / decisions:.2%}, "
+            f"p95 < {summary['p95_decision'] * 1e3:.3f}ms, "
+            f"max {summary['max_decision'] * 1e3:.3f}ms"
+        )
+        print(
+            f"Overruns of {strategy_name(self.strategy)}: {self.overruns}, "
+            f"fallbacks to {strategy_name(self.fallback)}: {self.fallbacks} "
+            f"({summary['fallback_rate']:.2%})"
+        )
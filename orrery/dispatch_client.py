@@ -0,0 +1,177 @@
+"""Load-test client for `orrery.dispatch_server`.
+
+Replays a requests CSV against a running dispatch server at a speedup
+of N× real time (one tick of request time per 1/N seconds), spreading
+calls over several concurrent connections, and reports assignment
+latency percentiles. Given several speedups, it replays at each in turn
+and reports the highest call rate sustained: every call answered within
+the latency limit, without falling behind the replay schedule by more
+than that limit.
+
+    python -m orrery.dispatch_server -f 20 -e 8 -c 8 --tick 0.01 &
+    python -m orrery.dispatch_client -r requests_20_seed42.csv --speeds 10 100 1000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import time
+from collections import namedtuple
+
+from orrery.simulator import load_requests_from_csv
+
+ReplayReport = namedtuple(
+    "ReplayReport",
+    ["speed", "calls", "errors", "seconds", "rate", "p50", "p95", "p99", "max", "lag"],
+)
+
+
+async def open_connection(host, port, path):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def replay(
+    requests, speed, connections=4, host="127.0.0.1", port=8765, path=None, prefix=""
+):
+    """Replay requests at speed× real time and return a ReplayReport.
+
+    Calls go round-robin over the connections, each sent when its request
+    time comes up. Passenger IDs get prefix, to stay unique across runs.
+    Lag is how far behind schedule the latest call was sent.
+    """
+    streams = [await open_connection(host, port, path) for _ in range(connections)]
+    sent = {}  # Maps passenger ID to send time
+    latencies = []
+    errors = 0
+
+    async def receive(reader, expected):
+        nonlocal errors
+        for _ in range(expected):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            if "error" in response:
+                errors += 1
+
+    counts = [
+        len(range(index, len(requests), connections)) for index in range(connections)
+    ]
+    receivers = [
+        asyncio.create_task(receive(reader, count))
+        for (reader, _), count in zip(streams, counts)
+    ]
+    start = time.perf_counter()
+    first_time = requests[0][0] if requests else 0
+    lag = 0.0
+    for index, (request_time, pid, source, dest) in enumerate(requests):
+        due = start + (request_time - first_time) / speed
+        # Yields to receivers even when behind schedule
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        now = time.perf_counter()
+        lag = max(lag, now - due)
+        pid = f"{prefix}{pid}"
+        sent[pid] = now
+        _, writer = streams[index % connections]
+        call = {"id": pid, "source": source, "dest": dest}
+        writer.write(json.dumps(call).encode() + b"\n")
+        await writer.drain()
+    await asyncio.gather(*receivers)
+    seconds = time.perf_counter() - start
+    for _, writer in streams:
+        writer.close()
+        await writer.wait_closed()
+
+    if len(latencies) > 1:
+        # Inclusive, so percentiles stay within the latencies measured
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        quantiles = (latencies or [math.nan]) * 99
+    return ReplayReport(
+        speed,
+        len(latencies),
+        errors,
+        seconds,
+        len(latencies) / seconds,
+        quantiles[49],
+        quantiles[94],
+        quantiles[98],
+        max(latencies, default=math.nan),
+        lag,
+    )
+
+
+async def run(requests, speeds, connections, host, port, path, limit):
+    """Replay at each speed, returning reports and best sustained rate."""
+    reports = []
+    sustained = None
+    for run_index, speed in enumerate(speeds):
+        report = await replay(
+            requests, speed, connections, host, port, path, prefix=f"r{run_index}-"
+        )
+        reports.append(report)
+        if report.max <= limit and report.lag <= limit and not report.errors:
+            if sustained is None or report.rate > sustained:
+                sustained = report.rate
+    return reports, sustained
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test a dispatch server by replaying a requests CSV.",
+    )
+    parser.add_argument(
+        "-r", "--requests", type=str, required=True, help="Path to requests CSV"
+    )
+    parser.add_argument(
+        "--speeds",
+        type=float,
+        nargs="+",
+        default=[1.0],
+        help="Replay speedups (N× real time)",
+    )
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", type=str, metavar="PATH", help="Unix socket path")
+    parser.add_argument(
+        "--limit",
+        type=float,
+        default=1.0,
+        help="Latency limit in seconds (README real-time compliance)",
+    )
+    args = parser.parse_args()
+
+    requests = load_requests_from_csv(args.requests)
+    reports, sustained = asyncio.run(
+        run(
+            requests,
+            args.speeds,
+            args.connections,
+            args.host,
+            args.port,
+            args.unix,
+            args.limit,
+        )
+    )
+    print(
+        f"{'speed':>8} {'calls':>7} {'errors':>6} {'calls/s':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'lag ms':>8}"
+    )
+    for report in reports:
+        print(
+            f"{report.speed:>7g}x {report.calls:>7} {report.errors:>6} "
+            f"{report.rate:>9.1f} {report.p50 * 1e3:>8.3f} {report.p95 * 1e3:>8.3f} "
+            f"{report.p99 * 1e3:>8.3f} {report.max * 1e3:>8.3f} "
+            f"{report.lag * 1e3:>8.3f}"
+        )
+    if sustained is None:
+        print(f"No speed sustained within {args.limit}s")
+    else:
+        print(f"Maximum sustained call rate: {sustained:.1f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Real-time dispatch service around a live `Building`.
+
+Hall call consoles (or `orrery.dispatch_client`) connect over a local TCP
+or Unix socket and send one JSON hall call per line:
+
+    {"id": "passenger1", "source": 3, "dest": 12}
+
+and get the assigned car back on the same connection, immediately:
+
+    {"id": "passenger1", "elevator": 2, "time": 41}
+
+The ID is optional; the server numbers calls without one. Calls from
+all connections are dispatched as they arrive, at the building's current
+tick, while a clock task advances simulated time one tick every tick
+seconds of wall time. Everything runs on one event loop, so the building
+is never touched concurrently.
+
+    python -m orrery.dispatch_server -f 20 -e 8 -c 8 --port 8765 --tick 1.0
+"""
+
+import argparse
+import asyncio
+import json
+
+from orrery.deadline import DeadlineDispatcher
+from orrery.simulator import MOVEMENTS, STRATEGIES, Building, make_strategy
+from orrery.stats import PassengerStats
+
+
+class LatestStates(dict):
+    """State log keeping only the latest tick of elevator floors.
+
+    A live service runs indefinitely, so it can't keep every tick.
+    """
+
+    def __setitem__(self, time, elevator_states):
+        self.clear()
+        super().__setitem__(time, elevator_states)
+
+
+class DispatchServer:
+    """Serve hall calls against a building advancing in real time.
+
+    Args:
+        building (Building): Building to dispatch and simulate
+        tick (float): Wall-clock seconds per simulated tick
+    """
+
+    def __init__(self, building, tick=1.0):
+        self.building = building
+        self.tick = tick
+        self.time = 0  # Next tick to simulate; calls now are made at it
+        self.calls = 0
+        self.numbered = 0  # Latest ID given to a call without one
+        self.server = None
+        self.clock = None
+
+    def dispatch(self, call):
+        """Assign a decoded hall call, returning the response dict."""
+        try:
+            source, dest = int(call["source"]), int(call["dest"])
+        except (KeyError, TypeError, ValueError):
+            return {"error": "Hall call needs integer source and dest"}
+        pid = call.get("id")
+        if pid is None:
+            pid = self.number_call()
+        response = {"id": pid}
+        floors = self.building.num_floors
+        if not (1 <= source <= floors and 1 <= dest <= floors) or source == dest:
+            return {**response, "error": f"Floors must differ, within 1 to {floors}"}
+        if pid in self.building.wait_times:
+            return {**response, "error": "Duplicate passenger ID"}
+        elevator = self.building.process_request(self.time, pid, source, dest)
+        if not elevator:
+            return {**response, "error": "No elevator available"}
+        self.calls += 1
+        return {**response, "elevator": elevator.id, "time": self.time}
+
+    def number_call(self):
+        """Return the next ID not in use, for a call sent without one.
+
+        Counted apart from calls, skipping IDs of passengers in flight, so
+        numbered calls never take an ID a client sent; a client sending
+        an ID in flight gets a duplicate ID error.
+        """
+        self.numbered += 1
+        while self.numbered in self.building.wait_times:
+            self.numbered += 1
+        return self.numbered
+
+    async def handle(self, reader, writer):
+        """Answer each hall call line of one connection, in order."""
+        try:
+            while line := await reader.readline():
+                try:
+                    call = json.loads(line)
+                except json.JSONDecodeError:
+                    response = {"error": "Hall call must be one JSON line"}
+                else:
+                    if isinstance(call, dict):
+                        response = self.dispatch(call)
+                    else:
+                        response = {"error": "Hall call must be a JSON object"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def run_clock(self):
+        """Simulate one tick per tick seconds, catching up if behind."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        self.building.log_elevator_states(self.time)
+        while True:
+            next_tick += self.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self.building.simulate_time_step(self.time)
+            self.time += 1
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """Listen on a Unix socket at path, else on TCP host and port."""
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        self.clock = asyncio.create_task(self.run_clock())
+        return self.server
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.clock.cancel()
+        try:
+            await self.clock
+        except asyncio.CancelledError:
+            pass
+
+    async def serve_forever(self, host="127.0.0.1", port=8765, path=None):
+        server = await self.start(host, port, path)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Dispatching on {addresses}, {self.tick}s per tick")
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve real-time elevator dispatch over a local socket.",
+    )
+    parser.add_argument("-f", "--floors", type=int, required=True)
+    parser.add_argument("-e", "--elevators", type=int, required=True)
+    parser.add_argument("-c", "--capacity", type=int, required=True)
+    parser.add_argument("-s", "--strategy", choices=list(STRATEGIES), default="nearest")
+    parser.add_argument("-m", "--movement", choices=MOVEMENTS, default="nearest")
+    parser.add_argument(
+        "--decision-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Wall-clock budget per assignment, falling back after overruns",
+    )
+    parser.add_argument("--fallback", choices=list(STRATEGIES), default="nearest")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", type=str, metavar="PATH", help="Unix socket path")
+    parser.add_argument(
+        "--tick", type=float, default=1.0, help="Wall-clock seconds per tick"
+    )
+    args = parser.parse_args()
+
+    strategy = make_strategy(args.strategy)
+    if args.decision_budget is not None:
+        strategy = DeadlineDispatcher(
+            strategy, make_strategy(args.fallback), args.decision_budget
+        )
+    # Keeps memory bounded however long the service runs
+    building = Building(
+        args.floors,
+        args.elevators,
+        args.capacity,
+        strategy,
+        state_log=LatestStates(),
+        stats=PassengerStats(),
+        keep_passenger_times=False,
+        movement=args.movement,
+    )
+    server = DispatchServer(building, args.tick)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    print(f"Dispatched {server.calls} calls over {server.time} ticks")
+    if building.stats.passengers:
+        building.stats.print_report()
+    if args.decision_budget is not None:
+        strategy.print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Position and load index over an elevator group.
+
+Dispatch strategies such as `nearest_available` sort and scan every car
+for every request, which adds up for campus-scale groups with hundreds
+of cars. `ElevatorIndex` buckets cars by floor and by load and is kept
+up to date as cars move and (un)load, so strategies can look up the
+nearest car, or the k-th car by load, in logarithmic time.
+
+`IndexedElevators` is the list of elevators `Building` hands to its
+strategy, with the index attached as `.positions`. Strategies that know
+about the index use it; any other strategy still sees a plain list.
+"""
+
+from bisect import bisect_left, insort
+
+from orrery.targets import TargetFloors
+
+
+class ElevatorIndex:
+    """Elevators bucketed by current floor and by passenger load.
+
+    Each occupied floor keeps its cars sorted by (load, ID), and each
+    load level keeps its car IDs sorted, so ties break the same way as
+    the linear strategies over a list sorted by load.
+    """
+
+    def __init__(self, elevators=()):
+        self.elevators = {}  # Maps elevator ID to elevator
+        self.keys = {}  # Maps elevator ID to indexed (floor, load)
+        self.floors = TargetFloors()  # Floors with at least one car
+        self.at_floor = {}  # Maps floor to sorted (load, ID) of cars there
+        self.with_load = {}  # Maps load to sorted IDs of cars with that load
+        for elevator in elevators:
+            self.add(elevator)
+
+    def add(self, elevator):
+        self.elevators[elevator.id] = elevator
+        self.insert(elevator.id, elevator.current_floor, len(elevator.passengers))
+
+    def insert(self, elevator_id, floor, load):
+        self.keys[elevator_id] = (floor, load)
+        self.floors.add(floor)
+        insort(self.at_floor.setdefault(floor, []), (load, elevator_id))
+        insort(self.with_load.setdefault(load, []), elevator_id)
+
+    def discard(self, elevator_id):
+        floor, load = self.keys.pop(elevator_id)
+        self.floors.remove(floor)
+        remove_sorted(self.at_floor, floor, (load, elevator_id))
+        remove_sorted(self.with_load, load, elevator_id)
+
+    def update(self, elevator):
+        """Re-index elevator if its floor or load changed."""
+        key = (elevator.current_floor, len(elevator.passengers))
+        if self.keys[elevator.id] != key:
+            self.discard(elevator.id)
+            self.insert(elevator.id, *key)
+
+    def nearest(self, floor, max_load=None):
+        """Return closest car to floor, breaking ties by load then ID.
+
+        Cars loaded beyond max_load, if given, are skipped. Walks
+        outwards over occupied floors only, nearest first.
+        """
+        up = floor if floor in self.floors else self.floors.nearest_above(floor)
+        down = self.floors.nearest_below(floor)
+        while up is not None or down is not None:
+            distance = min(abs(f - floor) for f in (up, down) if f is not None)
+            best = None
+            for candidate in (down, up):
+                if candidate is None or abs(candidate - floor) != distance:
+                    continue
+                load, elevator_id = self.at_floor[candidate][0]
+                if max_load is not None and load > max_load:
+                    continue
+                if best is None or (load, elevator_id) < best:
+                    best = (load, elevator_id)
+            if best is not None:
+                return self.elevators[best[1]]
+            if up is not None and up - floor == distance:
+                up = self.floors.nearest_above(up)
+            if down is not None and floor - down == distance:
+                down = self.floors.nearest_below(down)
+        return None
+
+    def by_load(self, rank):
+        """Return car at rank in (load, ID) order, i.e., sorted by load."""
+        for load in sorted(self.with_load):
+            elevator_ids = self.with_load[load]
+            if rank < len(elevator_ids):
+                return self.elevators[elevator_ids[rank]]
+            rank -= len(elevator_ids)
+        raise IndexError("Elevator rank out of range")
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def remove_sorted(buckets, key, item):
+    """Remove item from the sorted list buckets[key], dropping it if empty."""
+    bucket = buckets[key]
+    del bucket[bisect_left(bucket, item)]
+    if not bucket:
+        del buckets[key]
+
+
+class IndexedElevators(list):
+    """List of elevators carrying an `ElevatorIndex` as `.positions`.
+
+    Elevators are linked back to the index, so they re-index themselves
+    whenever they move or passengers board or alight.
+    """
+
+    def __init__(self, elevators=()):
+        super().__init__(elevators)
+        self.positions = ElevatorIndex(self)
+        for elevator in self:
+            elevator.positions = self.positions
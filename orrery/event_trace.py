@@ -0,0 +1,193 @@
+"""Structured event traces of a simulation run.
+
+Debug logging formats a message for every move, boarding, and unload,
+costing time even when discarded. An `EventTrace` instead records each
+event as a few fixed-width integers (tick, elevator, event type,
+passenger, floor) into preallocated typed arrays used as a ring buffer,
+keeping the latest capacity events. It is off unless passed to
+`Building(..., event_trace=...)`, so a disabled trace costs one `is
+not None` check per hook.
+
+`EventTrace.save` writes the buffer, oldest event first, to a compact
+binary file, and the decoder renders it as human-readable lines:
+
+    python -m orrery.simulator -f 20 -e 4 -c 8 -r requests_20_seed42.csv \
+        --event-trace events.bin
+    python -m orrery.event_trace events.bin --elevator 2
+"""
+
+import argparse
+from array import array
+
+import numpy as np
+
+ASSIGN, REJECT, BOARD, UNLOAD, MOVE = range(5)
+NAMED = 0x80  # Event flag: the passenger is a code of a saved name
+NO_ELEVATOR = 0  # Elevator of rejected requests
+NO_PASSENGER = -1  # Passenger of moves
+
+MAGIC = b"ORREVENT"
+VERSION = 2
+NAME_LENGTH = np.dtype("<u4")  # Prefix of each saved name's UTF-8 bytes
+HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u2"),
+        ("count", "<i8"),  # Events in the file
+        ("dropped", "<i8"),  # Older events overwritten in the ring buffer
+        ("num_names", "<i8"),  # Passenger names after the events, if any
+    ]
+)
+EVENT = np.dtype(
+    [
+        ("time", "<i8"),
+        ("passenger", "<i8"),
+        ("elevator", "<i4"),
+        ("floor", "<i4"),
+        ("event", "u1"),
+    ]
+)
+
+
+class EventTrace:
+    """Ring buffer of the latest capacity simulation events.
+
+    Integer passenger IDs are stored as is. Other IDs (e.g., strings
+    from a requests CSV) are interned to codes whose names are saved
+    with the trace, which grows with passengers; stream requests with
+    integer IDs to keep memory fixed. Events of interned IDs are flagged
+    NAMED, so traces may mix both kinds.
+    """
+
+    def __init__(self, capacity=1 << 20):
+        self.capacity = capacity
+        self.times = array("q", bytes(8 * capacity))
+        self.passengers = array("q", bytes(8 * capacity))
+        self.elevators = array("i", bytes(4 * capacity))
+        self.floors = array("i", bytes(4 * capacity))
+        self.events = array("B", bytes(capacity))
+        self.recorded = 0  # Events ever recorded, including overwritten ones
+        self.codes = {}  # Maps non-integer passenger ID to its code
+        self.names = []
+
+    def record(self, time, elevator_id, event, passenger_id, floor):
+        if not isinstance(passenger_id, int):
+            code = self.codes.get(passenger_id)
+            if code is None:
+                code = self.codes[passenger_id] = len(self.names)
+                self.names.append(passenger_id)
+            passenger_id = code
+            event |= NAMED
+        index = self.recorded % self.capacity
+        self.times[index] = time
+        self.passengers[index] = passenger_id
+        self.elevators[index] = elevator_id
+        self.floors[index] = floor
+        self.events[index] = event
+        self.recorded += 1
+
+    def __len__(self):
+        return min(self.recorded, self.capacity)
+
+    def to_array(self):
+        """Return the buffered events as an EVENT array, oldest first."""
+        count = len(self)
+        start = self.recorded % self.capacity if self.recorded > count else 0
+        order = (start + np.arange(count)) % self.capacity
+        events = np.empty(count, dtype=EVENT)
+        events["time"] = np.frombuffer(self.times, dtype=np.int64)[order]
+        events["passenger"] = np.frombuffer(self.passengers, dtype=np.int64)[order]
+        events["elevator"] = np.frombuffer(self.elevators, dtype=np.intc)[order]
+        events["floor"] = np.frombuffer(self.floors, dtype=np.intc)[order]
+        events["event"] = np.frombuffer(self.events, dtype=np.uint8)[order]
+        return events
+
+    def save(self, filepath):
+        """Write the buffered events, then any passenger names, to filepath.
+
+        Names are written as UTF-8, each prefixed by its length in bytes,
+        so they may hold any character.
+        """
+        events = self.to_array()
+        header = np.zeros((), dtype=HEADER)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["count"] = len(events)
+        header["dropped"] = self.recorded - len(events)
+        header["num_names"] = len(self.names)
+        with open(filepath, "wb") as file:
+            file.write(header.tobytes())
+            file.write(events.tobytes())
+            for name in self.names:
+                encoded = str(name).encode()
+                file.write(np.array(len(encoded), dtype=NAME_LENGTH).tobytes())
+                file.write(encoded)
+
+
+def read_events(filepath):
+    """Return (events array, dropped count, passenger names or None)."""
+    header = np.fromfile(filepath, dtype=HEADER, count=1)
+    if len(header) == 0 or header["magic"][0] != MAGIC:
+        raise ValueError(f"{filepath} is not an Orrery event trace")
+    if header["version"][0] != VERSION:
+        raise ValueError(f"Unsupported event trace version {header['version'][0]}")
+    count = int(header["count"][0])
+    events = np.fromfile(filepath, dtype=EVENT, count=count, offset=HEADER.itemsize)
+    names = None
+    if header["num_names"][0]:
+        with open(filepath, "rb") as file:
+            file.seek(HEADER.itemsize + count * EVENT.itemsize)
+            names = []
+            for _ in range(int(header["num_names"][0])):
+                (length,) = np.frombuffer(file.read(NAME_LENGTH.itemsize), NAME_LENGTH)
+                names.append(file.read(int(length)).decode())
+    return events, int(header["dropped"][0]), names
+
+
+def describe(event, passenger):
+    """Render one event as a line like the sandbox debug log's."""
+    elevator, floor = event["elevator"], event["floor"]
+    kind = event["event"] & (NAMED - 1)
+    if kind == ASSIGN:
+        message = f"Elevator {elevator} assigned to passenger {passenger} at floor"
+    elif kind == REJECT:
+        message = f"No elevator available for passenger {passenger} at floor"
+    elif kind == BOARD:
+        message = f"Passenger {passenger} boards elevator {elevator} at floor"
+    elif kind == UNLOAD:
+        message = f"Passenger {passenger} unloads from elevator {elevator} at floor"
+    else:
+        message = f"Elevator {elevator} moves to floor"
+    return f"{event['time']} : {message} {floor}"
+
+
+def decode(filepath, elevator_id=None, passenger=None):
+    """Yield human-readable lines for the events of a saved trace."""
+    events, dropped, names = read_events(filepath)
+    if dropped:
+        yield f"({dropped} earlier events overwritten)"
+    if elevator_id is not None:
+        events = events[events["elevator"] == elevator_id]
+    for event in events:
+        pid = int(event["passenger"])
+        if event["event"] & NAMED:
+            pid = names[pid]
+        if passenger is not None and str(pid) != passenger:
+            continue
+        yield describe(event, pid)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decode a binary event trace into readable lines.",
+    )
+    parser.add_argument("trace", type=str, help="Path to event trace")
+    parser.add_argument("--elevator", type=int, help="Only this elevator's events")
+    parser.add_argument("--passenger", type=str, help="Only this passenger's events")
+    args = parser.parse_args()
+    for line in decode(args.trace, args.elevator, args.passenger):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Champion/challenger evaluation of several strategies in one pass.
+
+Rather than one simulator run per strategy, each re-reading the
+requests, `run_lockstep` reads the request stream once and feeds every
+request to one `Building` per strategy, advancing all of them on a
+shared clock. Each building still behaves exactly as in its own run:
+deterministic strategies give identical states and statistics. Random
+strategies all draw from one seeded random stream, so they match their
+own runs in distribution rather than draw for draw.
+
+The first strategy is the champion; it keeps the title unless a
+challenger has a lower mean total time (wait plus travel, the README's
+primary objective).
+
+    python -m orrery.lockstep -f 20 -e 4 -c 8 -r requests_20_seed42.csv \
+        -s nearest random available bestinsert
+"""
+
+import argparse
+import random
+
+from orrery.simulator import (
+    MOVEMENTS,
+    STRATEGIES,
+    Building,
+    load_requests_from_csv,
+    make_strategy,
+    stream_requests_from_binary,
+)
+from orrery.stats import PassengerStats
+
+KPIS = [
+    "passengers",
+    "mean_total",
+    "mean_wait",
+    "p95_wait",
+    "max_wait",
+    "mean_travel",
+    "wait_under_60",
+    "wait_under_30",
+    "ticks",
+]
+
+
+def is_busy(building):
+    return any(e.passengers for e in building.elevators) or len(building.occupancy)
+
+
+def run_lockstep(buildings, requests, event_driven=False):
+    """Run every building on the same requests, pulling each once.
+
+    Each building keeps its own clock, since event-driven runs skip
+    different quiet stretches and buildings finish at different times,
+    but none runs past the next request. Requests are dispatched to all
+    buildings at once when the slowest clock reaches them, each tick's
+    arrivals together, so buildings with a batch strategy assign them
+    jointly as in their own runs.
+    """
+    requests = iter(requests)
+    clocks = {}
+    for building in buildings:
+        clocks[building] = 0
+        building.log_elevator_states(0)
+    pending = next(requests, None)
+    while clocks:
+        current_time = min(clocks.values())
+        # As in run_simulation, whether to go on is decided before dispatch
+        running = []
+        for building, clock in list(clocks.items()):
+            if clock != current_time:
+                continue
+            if pending is None and not is_busy(building):
+                building.current_time = clock
+                del clocks[building]
+            else:
+                running.append(building)
+        arrivals = []
+        while pending is not None and pending[0] == current_time:
+            arrivals.append(pending)
+            pending = next(requests, None)
+        if arrivals:
+            for building in running:
+                building.process_arrivals(arrivals)
+                building.requests_processed += len(arrivals)
+        for building in running:
+            if event_driven:
+                horizon = None if pending is None else pending[0] - current_time
+                quiet = building.quiet_ticks(horizon)
+                if quiet > 0:
+                    building.advance_quiet_ticks(current_time, quiet)
+                    clocks[building] = current_time + quiet
+                    continue
+            building.simulate_time_step(current_time)
+            clocks[building] = current_time + 1
+
+
+def compare_strategies(
+    floors,
+    elevators,
+    capacity,
+    strategies,
+    requests,
+    movement="nearest",
+    event_driven=False,
+    seed=None,
+):
+    """Return {strategy name: KPI summary} from one lockstep pass."""
+    random.seed(seed)
+    buildings = {
+        name: Building(
+            floors,
+            elevators,
+            capacity,
+            make_strategy(name),
+            stats=PassengerStats(),
+            keep_passenger_times=False,
+            movement=movement,
+        )
+        for name in strategies
+    }
+    run_lockstep(list(buildings.values()), requests, event_driven)
+    return {name: building.summary_statistics() for name, building in buildings.items()}
+
+
+def pick_champion(summaries):
+    """Return the first strategy unless another has lower mean total time."""
+    champion = next(iter(summaries))
+    for name, summary in summaries.items():
+        if summary["mean_total"] < summaries[champion]["mean_total"]:
+            champion = name
+    return champion
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare strategies side by side in one simulation pass.",
+    )
+    parser.add_argument("-f", "--floors", type=int, required=True)
+    parser.add_argument("-e", "--elevators", type=int, required=True)
+    parser.add_argument("-c", "--capacity", type=int, required=True)
+    parser.add_argument(
+        "-r",
+        "--requests",
+        type=str,
+        required=True,
+        help="Path to requests CSV, or binary requests file ending in .bin",
+    )
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGIES),
+        default=["nearest", "random", "available"],
+        help="Champion first, then challengers",
+    )
+    parser.add_argument("-m", "--movement", choices=MOVEMENTS, default="nearest")
+    parser.add_argument("--event-driven", action="store_true")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for random draws")
+    args = parser.parse_args()
+
+    if args.requests.endswith(".bin"):
+        requests = stream_requests_from_binary(args.requests)
+    else:
+        requests = load_requests_from_csv(args.requests)
+    summaries = compare_strategies(
+        args.floors,
+        args.elevators,
+        args.capacity,
+        args.strategies,
+        requests,
+        args.movement,
+        args.event_driven,
+        args.seed,
+    )
+    print(f"{'':>14}" + "".join(f"{name:>12}" for name in summaries))
+    for kpi in KPIS:
+        values = [summary[kpi] for summary in summaries.values()]
+        cells = "".join(
+            f"{value:>12.2f}" if isinstance(value, float) else f"{value:>12}"
+            for value in values
+        )
+        print(f"{kpi:>14}{cells}")
+    incumbent = args.strategies[0]
+    champion = pick_champion(summaries)
+    if champion == incumbent:
+        print(f"Champion: {champion} (retained)")
+    else:
+        mean_totals = [summaries[name]["mean_total"] for name in (champion, incumbent)]
+        gain = 1 - mean_totals[0] / mean_totals[1]
+        print(
+            f"Champion: {champion}, {gain:.1%} lower mean total time than {incumbent}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Monte Carlo runs over seeds, strategies, and building configurations.
+
+Each job generates its own requests in-process from a seed, simulates
+them, and sends back only a compact KPI summary (never the state log),
+so fanning out over a process pool keeps every core busy without
+pickling large results back to the parent.
+
+    python -m orrery.montecarlo --seeds 30 --floors 20 --elevators 4 8 \
+        --capacity 8 --duration 3600 --arrivingevery 5
+"""
+
+import argparse
+import math
+import os
+import statistics
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from orrery.request_generator import generate_hall_calls, generate_requests, set_seed
+from orrery.simulator import STRATEGIES, Building, make_strategy
+
+BuildingConfig = namedtuple("BuildingConfig", ["floors", "elevators", "capacity"])
+MonteCarloJob = namedtuple(
+    "MonteCarloJob", ["seed", "strategy", "config", "duration", "arriving_every"]
+)
+
+SUMMARY_KPIS = ["mean_wait", "max_wait", "mean_travel", "max_travel", "ticks"]
+
+
+def plan_jobs(seeds, strategies, configs, duration, arriving_every):
+    """Cross seeds, strategy names, and building configs into jobs."""
+    return [
+        MonteCarloJob(seed, strategy, config, duration, arriving_every)
+        for config, strategy, seed in product(configs, strategies, seeds)
+    ]
+
+
+def run_job(job):
+    """Simulate one job and return its KPI summary.
+
+    Requests are generated from the job seed before the simulation, so
+    random strategies draw from the same seeded stream on every run.
+    """
+    set_seed(job.seed)
+    hall_calls = generate_hall_calls(
+        job.duration, job.config.floors, job.arriving_every
+    )
+    requests = generate_requests(hall_calls)
+    building = Building(*job.config, make_strategy(job.strategy))
+    building.run_simulation(requests, report=False)
+    return job, building.summary_statistics()
+
+
+def run_jobs(jobs, max_workers=None):
+    """Run jobs across a process pool and yield (job, summary) pairs."""
+    max_workers = max_workers or os.cpu_count()
+    # Several chunks per worker amortize IPC while balancing uneven jobs
+    chunksize = max(1, len(jobs) // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(run_job, jobs, chunksize=chunksize)
+
+
+def confidence_interval(values, confidence=0.95):
+    """Return mean and normal-approximation confidence half-width.
+
+    NaN values (e.g., waits of a run without passengers) are left out;
+    with none left, both are NaN.
+    """
+    values = [value for value in values if not math.isnan(value)]
+    if not values:
+        return math.nan, math.nan
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, math.nan
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    return mean, z * statistics.stdev(values) / math.sqrt(len(values))
+
+
+def aggregate(results, kpis=SUMMARY_KPIS, confidence=0.95):
+    """Aggregate summaries into mean and CI per (config, strategy).
+
+    Runs without passengers have no waits or travel times, so they are
+    left out of those KPIs and counted under "empty_runs".
+
+    Returns:
+        Dict[Tuple[BuildingConfig, str], Dict[str, Tuple[float, float]]]:
+        KPI mean and confidence half-width, plus run counts under "runs"
+        and "empty_runs"
+    """
+    grouped = defaultdict(list)
+    for job, summary in results:
+        grouped[(job.config, job.strategy)].append(summary)
+    aggregated = {}
+    for key, summaries in grouped.items():
+        aggregated[key] = {
+            kpi: confidence_interval([s[kpi] for s in summaries], confidence)
+            for kpi in kpis
+        }
+        aggregated[key]["runs"] = len(summaries)
+        aggregated[key]["empty_runs"] = sum(s["passengers"] == 0 for s in summaries)
+    return aggregated
+
+
+def print_aggregate(aggregated, kpis=SUMMARY_KPIS, confidence=0.95):
+    print(f"KPI means with {confidence:.0%} confidence intervals")
+    for (config, strategy), kpi_stats in sorted(aggregated.items()):
+        runs = f"{kpi_stats['runs']} runs"
+        if kpi_stats["empty_runs"]:
+            runs += f", {kpi_stats['empty_runs']} without passengers excluded"
+        print(
+            f"{config.floors} floors, {config.elevators} elevators, "
+            f"capacity {config.capacity}, {strategy} ({runs})"
+        )
+        for kpi in kpis:
+            mean, half_width = kpi_stats[kpi]
+            print(f"    {kpi:<12} {mean:10.2f} ± {half_width:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run Monte Carlo Orrery simulations across processes.",
+    )
+    parser.add_argument("--seeds", type=int, default=30, help="Number of seeds")
+    parser.add_argument("--first-seed", type=int, default=1, help="Starting seed")
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGIES),
+        default=list(STRATEGIES),
+        help="Elevator assignment strategies",
+    )
+    parser.add_argument("-f", "--floors", type=int, nargs="+", required=True)
+    parser.add_argument("-e", "--elevators", type=int, nargs="+", required=True)
+    parser.add_argument("-c", "--capacity", type=int, nargs="+", required=True)
+    parser.add_argument("-d", "--duration", type=int, required=True)
+    parser.add_argument("--arrivingevery", type=float, default=1.0)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all)")
+    args = parser.parse_args()
+
+    configs = [
+        BuildingConfig(*config)
+        for config in product(args.floors, args.elevators, args.capacity)
+    ]
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    jobs = plan_jobs(seeds, args.strategies, configs, args.duration, args.arrivingevery)
+    results = run_jobs(jobs, args.workers)
+    aggregated = aggregate(results, confidence=args.confidence)
+    print_aggregate(aggregated, confidence=args.confidence)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Opt-in per-phase timing of the simulation hot path.
+
+`PhaseProfile` times each phase of `Building.simulate_time_step`
+(logging states, unloading, scanning waiting queues, loading, moving),
+the quiet-tick skipping of event-driven runs, every strategy call in
+`Building.process_request`, and every batch assigned by
+`Building.process_batch`. Decision latencies (per call, or per batch of
+calls assigned jointly) also go into a log-scale histogram, checked
+against the README's real-time compliance requirement (assignment within
+one second of request).
+
+Instrumenting swaps the building's and elevators' methods for timed
+wrappers on those instances only, so a building without a profile runs
+the plain methods and pays nothing.
+
+    building = Building(10, 4, 8, nearest_available, profile=PhaseProfile())
+    building.run_simulation(requests)  # Prints the phase table at the end
+"""
+
+import json
+import math
+import time
+from array import array
+from functools import wraps
+
+# Phase name per Elevator method and Building method instrumented
+ELEVATOR_PHASES = {
+    "unload_passengers": "unload_passengers",
+    "load_passenger": "load_passenger",
+    "move": "move",
+}
+BUILDING_PHASES = {
+    "simulate_time_step": "simulate_time_step",
+    "log_elevator_states": "log_elevator_states",
+    "quiet_ticks": "quiet_ticks",
+    "advance_quiet_ticks": "advance_quiet_ticks",
+}
+# simulate_time_step includes these; the rest of it is bookkeeping
+STEP_PHASES = [
+    "log_elevator_states",
+    "unload_passengers",
+    "occupancy_scan",
+    "load_passenger",
+    "move",
+]
+DECISION_DEADLINE = 1.0  # Seconds, per README real-time compliance
+
+
+class LatencyHistogram:
+    """Streaming histogram of latencies in log2-spaced bins.
+
+    Bin i counts latencies in [2^(i-1), 2^i) microseconds, from under
+    1µs (bin 0) up to an overflow bin from about 17 minutes.
+    """
+
+    def __init__(self, num_bins=31):
+        self.counts = array("q", [0] * (num_bins + 1))
+        self.num_bins = num_bins
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        microseconds = int(seconds * 1e6)
+        self.counts[min(microseconds.bit_length(), self.num_bins)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @staticmethod
+    def upper_bound(index):
+        """Upper bound of bin index in seconds."""
+        return (1 << index) / 1e6
+
+    def quantile(self, q):
+        """Return upper bound of the bin holding the q-quantile (0 < q ≤ 1)."""
+        if not self.count:
+            return math.nan
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bin_count in enumerate(self.counts):
+            seen += bin_count
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def bins(self):
+        """Return (upper bound in seconds, count) for non-empty bins."""
+        return [
+            (self.upper_bound(index) if index < self.num_bins else math.inf, count)
+            for index, count in enumerate(self.counts)
+            if count
+        ]
+
+
+class PhaseProfile:
+    """Cumulative wall time and call counts per simulation phase.
+
+    Args:
+        output (str): Path to write the profile as JSON after each run
+        deadline (float): Strategy decision deadline in seconds
+    """
+
+    def __init__(self, output=None, deadline=DECISION_DEADLINE):
+        self.output = output
+        self.deadline = deadline
+        self.times = {}  # Maps phase to cumulative seconds
+        self.calls = {}  # Maps phase to number of calls
+        self.decisions = LatencyHistogram()
+        self.late = 0  # Decisions over the deadline
+        self.started = None
+        self.elapsed = 0.0
+
+    def timed(self, phase, method):
+        """Wrap method to add its wall time and call to phase."""
+        times, calls = self.times, self.calls
+        times.setdefault(phase, 0.0)
+        calls.setdefault(phase, 0)
+        perf_counter = time.perf_counter
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                times[phase] += perf_counter() - start
+                calls[phase] += 1
+
+        return wrapper
+
+    def timed_decisions(self, phase, decide):
+        """Wrap decide to add its wall time to phase, each call a decision."""
+        times, calls, decisions = self.times, self.calls, self.decisions
+        deadline = self.deadline
+        times.setdefault(phase, 0.0)
+        calls.setdefault(phase, 0)
+        perf_counter = time.perf_counter
+
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                return decide(*args)
+            finally:
+                latency = perf_counter() - start
+                times[phase] += latency
+                calls[phase] += 1
+                decisions.add(latency)
+                if latency > deadline:
+                    self.late += 1
+
+        wrapper.__wrapped__ = decide  # For inspect.unwrap
+        return wrapper
+
+    def timed_strategy(self, strategy):
+        """Wrap strategy to also record each decision's latency."""
+        return self.timed_decisions("strategy", strategy)
+
+    def instrument(self, building):
+        """Replace building's hot-path methods with timed wrappers."""
+        for name, phase in BUILDING_PHASES.items():
+            setattr(building, name, self.timed(phase, getattr(building, name)))
+        for elevator in building.elevators:
+            for name, phase in ELEVATOR_PHASES.items():
+                setattr(elevator, name, self.timed(phase, getattr(elevator, name)))
+        occupancy = building.occupancy
+        occupancy.waiting_for = self.timed("occupancy_scan", occupancy.waiting_for)
+        building.strategy = self.timed_strategy(building.strategy)
+        # Batches assigned jointly are decided in one call each
+        building.process_batch = self.timed_decisions("batch", building.process_batch)
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def stop(self):
+        if self.started is not None:
+            self.elapsed += time.perf_counter() - self.started
+            self.started = None
+
+    def phases(self):
+        """Return {phase: (calls, seconds)}, with step bookkeeping as "other"."""
+        phases = {
+            phase: (self.calls[phase], self.times[phase])
+            for phase in self.times
+            if self.calls[phase]
+        }
+        if "simulate_time_step" in phases:
+            calls, step_time = phases.pop("simulate_time_step")
+            inner = sum(phases.get(phase, (0, 0.0))[1] for phase in STEP_PHASES)
+            phases["step_other"] = (calls, max(step_time - inner, 0.0))
+        return phases
+
+    def summary(self):
+        """Return the profile as a JSON-serializable dict."""
+        decisions = self.decisions
+        return {
+            "elapsed": self.elapsed,
+            "phases": {
+                phase: {"calls": calls, "seconds": seconds}
+                for phase, (calls, seconds) in self.phases().items()
+            },
+            "decisions": {
+                "count": decisions.count,
+                "mean": decisions.total / decisions.count if decisions.count else None,
+                "p50": decisions.quantile(0.5) if decisions.count else None,
+                "p95": decisions.quantile(0.95) if decisions.count else None,
+                "max": decisions.max,
+                "deadline": self.deadline,
+                "late": self.late,
+                # Upper bound in seconds (None for overflow) to count
+                "histogram": [
+                    [None if bound == math.inf else bound, count]
+                    for bound, count in decisions.bins()
+                ],
+            },
+        }
+
+    def print_report(self):
+        """Print time per phase and the strategy latency histogram."""
+        phases = sorted(self.phases().items(), key=lambda item: -item[1][1])
+        print(f"{'phase':<20} {'calls':>10} {'total s':>9} {'share':>6} {'mean µs':>9}")
+        for phase, (calls, seconds) in phases:
+            share = seconds / self.elapsed if self.elapsed else math.nan
+            print(
+                f"{phase:<20} {calls:>10} {seconds:>9.3f} {share:>6.1%} "
+                f"{seconds / calls * 1e6:>9.2f}"
+            )
+        print(f"{'run_simulation':<20} {'':>10} {self.elapsed:>9.3f}")
+        decisions = self.decisions
+        if not decisions.count:
+            return
+        print("Decision latency:")
+        for bound, count in decisions.bins():
+            label = "overflow" if bound == math.inf else f"< {bound * 1e6:.0f}µs"
+            print(f"  {label:>14} {count:>10}")
+        compliance = 1 - self.late / decisions.count
+        print(
+            f"  {compliance:.2%} of {decisions.count} decisions within "
+            f"{self.deadline}s, max {decisions.max * 1e3:.3f}ms"
+        )
+
+    def write_json(self, filepath):
+        with open(filepath, "w") as file:
+            json.dump(self.summary(), file, indent=2)
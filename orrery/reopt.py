@@ -0,0 +1,281 @@
+"""Anytime branch-and-bound reoptimization of elevator routes.
+
+When a request arrives, `Reoptimizer` solves the static dispatch problem
+for the current state: which car to assign the request to, and in which
+order that car should visit all of its stops (pickups, drop-offs of
+passengers aboard or still waiting, plus the new request's two stops),
+minimizing the sum of stop arrival times as in `routes`. Each car's
+sequencing problem is searched by depth-first branch and bound under
+precedence (pickup before drop-off) and capacity constraints.
+
+The search is anytime: it starts from the best insertion of the request
+into the cars' current routes (warm start), then improves on it car by
+car, most promising first, until proven optimal or the wall-clock budget
+runs out. Each decision reports the optimality gap left. Proven subroute
+optima and lower bounds are memoized by (floor, remaining stops, load,
+capacity), which fully determines a subproblem, so consecutive requests
+reuse the search state of earlier ones as cars work through their stops.
+
+Runs on pure Python; it needs no external solver.
+"""
+
+import math
+import time
+from collections import namedtuple
+from itertools import islice
+from operator import itemgetter
+
+from orrery.routes import Stop, best_insertion
+
+Solution = namedtuple(
+    "Solution", ["elevator", "stops", "cost", "lower_bound", "gap", "nodes", "proven"]
+)
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def search_key(stop):
+    """Stop as a plain (floor, dropoff, pid) tuple, ordered for tie-breaking.
+
+    Subproblems are keyed by sorted tuples of these rather than sets of
+    stops, so the memo is made of plain tuples that the cyclic garbage
+    collector stops tracking, and never has to traverse.
+    """
+    return stop.floor, stop.dropoff, stop.pid
+
+
+def search_order(key):
+    floor, dropoff, pid = key
+    return floor, dropoff, str(pid)
+
+
+class Reoptimizer:
+    """Dispatch strategy reoptimizing routes by anytime branch and bound.
+
+    Call it like any strategy function. The latest decision's Solution
+    (with its optimality gap) is kept as last_solution.
+
+    Args:
+        time_budget (float): Wall-clock seconds per decision
+        max_memo (int): Memoized subproblems kept between decisions, per
+            memo, dropping the oldest
+    """
+
+    plans_routes = True
+
+    def __init__(self, time_budget=0.05, max_memo=200_000):
+        self.time_budget = time_budget
+        self.max_memo = max_memo
+        self.exact = {}  # Maps subproblem to (optimal cost, stop keys)
+        self.lower = {}  # Maps subproblem to lower bound on its cost
+        self.last_solution = None
+        self.deadline = math.inf
+        self.nodes = 0
+
+    def __call__(self, elevators, passenger_id, source_floor, dest_floor):
+        solution = self.solve(elevators, passenger_id, source_floor, dest_floor)
+        if solution is None:
+            # No car has room anywhere along its route
+            return best_insertion(elevators, passenger_id, source_floor, dest_floor)
+        solution.elevator.route.replace(solution.stops)
+        self.last_solution = solution
+        return solution.elevator
+
+    def solve(self, elevators, passenger_id, source_floor, dest_floor):
+        """Return best Solution found within the time budget, if any.
+
+        Cost and lower bound are for the sum of all cars' route costs.
+        """
+        self.trim_memo()
+        self.deadline = time.perf_counter() + self.time_budget
+        self.nodes = 0
+        new_stops = [
+            Stop(source_floor, passenger_id, False),
+            Stop(dest_floor, passenger_id, True),
+        ]
+
+        # Warm start from best insertion into each car's current route
+        current_costs = {}
+        candidates = []
+        for elevator in elevators:
+            route = elevator.route
+            current_costs[elevator] = route.cost(elevator.current_floor)
+            insertion = route.best_insertion(
+                elevator.current_floor,
+                len(elevator.passengers),
+                elevator.max_passengers,
+                source_floor,
+                dest_floor,
+            )
+            if insertion is not None:
+                candidates.append((insertion, elevator))
+        if not candidates:
+            return None
+        candidates.sort(key=lambda candidate: candidate[0].cost)
+        insertion, best_elevator = candidates[0]
+        best_stops = list(best_elevator.route)
+        best_stops.insert(insertion.dropoff_index, new_stops[1])
+        best_stops.insert(insertion.pickup_index, new_stops[0])
+        best_marginal = insertion.cost
+
+        # Lower bound on each car's marginal cost, tightened as searched
+        marginal_bounds = {
+            elevator: self.floor_bound(
+                elevator.current_floor, elevator.route.stops + new_stops
+            )
+            - current_costs[elevator]
+            for _, elevator in candidates
+        }
+        proven = True
+        for _, elevator in candidates:
+            if marginal_bounds[elevator] >= best_marginal:
+                continue
+            current_cost = current_costs[elevator]
+            stops = sorted(
+                map(search_key, elevator.route.stops + new_stops), key=search_order
+            )
+            cost, sequence, bound, finished = self.search_car(
+                elevator, tuple(stops), current_cost + best_marginal
+            )
+            marginal_bounds[elevator] = max(
+                marginal_bounds[elevator], bound - current_cost
+            )
+            if sequence is not None and cost - current_cost < best_marginal:
+                best_marginal = cost - current_cost
+                best_elevator = elevator
+                best_stops = [
+                    Stop(floor, pid, dropoff) for floor, dropoff, pid in sequence
+                ]
+            if not finished:
+                proven = False
+                break
+
+        total = sum(current_costs.values()) + best_marginal
+        lower_bound = sum(current_costs.values()) + min(
+            best_marginal, min(marginal_bounds.values())
+        )
+        gap = 0.0 if proven else (total - lower_bound) / max(total, 1)
+        return Solution(
+            best_elevator, best_stops, total, lower_bound, gap, self.nodes, proven
+        )
+
+    def trim_memo(self):
+        """Evict the oldest memoized subproblems beyond max_memo.
+
+        Called before each decision, so each memo holds at most max_memo
+        entries between decisions. Evicting as the memo grows, rather than
+        clearing it all at once, keeps the cost of freeing entries within
+        each decision small.
+        """
+        for memo in (self.exact, self.lower):
+            excess = len(memo) - self.max_memo
+            if excess > 0:
+                for key in list(islice(memo, excess)):
+                    del memo[key]
+
+    def search_car(self, elevator, stops, limit):
+        """Branch and bound over one car's stop order from its floor.
+
+        Returns (cost, stops, lower bound, finished). Stops are the best
+        order found costing below limit, or None. Unless the budget ran
+        out (finished is False), the bound is the optimum or ≥ limit.
+        """
+        floor = elevator.current_floor
+        load = len(elevator.passengers)
+        capacity = elevator.max_passengers
+        exact = self.exact.get((floor, stops, load, capacity))
+        if exact is not None:
+            return exact[0], exact[1], exact[0], True
+        best, best_stops = math.inf, None
+        bound = math.inf  # Lower bound over children searched so far
+        children = self.children(floor, stops, load, capacity)
+        for index, (step, stop, remaining, child_load) in enumerate(children):
+            try:
+                cost, sequence = self.complete(
+                    stop[0], remaining, child_load, capacity, min(limit, best) - step
+                )
+            except BudgetExceeded:
+                # Unsearched children are only bounded by their distances
+                for step, stop, remaining, _ in children[index:]:
+                    bound = min(bound, step + self.floor_bound(stop[0], remaining))
+                return best, best_stops, min(bound, best), False
+            if sequence is None:
+                bound = min(bound, step + cost)
+            elif step + cost < best:
+                best, best_stops = step + cost, (stop,) + sequence
+        if best < limit:
+            self.exact[(floor, stops, load, capacity)] = (best, best_stops)
+            return best, best_stops, best, True
+        return math.inf, None, min(best, bound), True
+
+    def complete(self, floor, remaining, load, capacity, limit):
+        """Return cheapest completion of remaining stops from floor.
+
+        Costs are arrival times relative to now. Returns (cost, stops)
+        if the optimum is below limit, else (lower bound ≥ limit, None).
+        """
+        if not remaining:
+            return 0, ()
+        key = (floor, remaining, load, capacity)
+        exact = self.exact.get(key)
+        if exact is not None:
+            return exact
+        bound = max(self.lower.get(key, 0), self.floor_bound(floor, remaining))
+        if bound >= limit:
+            return bound, None
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise BudgetExceeded()
+        best, best_stops = math.inf, None
+        failed_bound = math.inf
+        for step, stop, rest, child_load in self.children(
+            floor, remaining, load, capacity
+        ):
+            cost, sequence = self.complete(
+                stop[0], rest, child_load, capacity, min(limit, best) - step
+            )
+            if sequence is None:
+                failed_bound = min(failed_bound, step + cost)
+            elif step + cost < best:
+                best, best_stops = step + cost, (stop,) + sequence
+        if best < limit:
+            self.exact[key] = (best, best_stops)
+            return best, best_stops
+        bound = max(bound, min(best, failed_bound))
+        self.lower[key] = bound
+        return bound, None
+
+    @staticmethod
+    def children(floor, remaining, load, capacity):
+        """Return feasible next stops, cheapest first.
+
+        Each child is (step cost, stop, stops left after it, load after
+        it). Travelling to the next stop delays every remaining stop, so
+        the step cost is the distance times the number of stops left.
+        Ties keep the sorted order of stops, so memoized optima (and
+        hence simulations) don't depend on the order of earlier searches.
+        """
+        waiting = {pid for _, dropoff, pid in remaining if not dropoff}
+        children = []
+        for index, stop in enumerate(remaining):
+            stop_floor, dropoff, pid = stop
+            if dropoff:
+                if pid in waiting:
+                    continue  # Pickup first
+                child_load = load - 1
+            elif load >= capacity:
+                continue
+            else:
+                child_load = load + 1
+            step = len(remaining) * abs(floor - stop_floor)
+            rest = remaining[:index] + remaining[index + 1 :]
+            children.append((step, index, stop, rest, child_load))
+        children.sort(key=itemgetter(0, 1))
+        return [(step, stop, rest, load) for step, _, stop, rest, load in children]
+
+    @staticmethod
+    def floor_bound(floor, stops):
+        """Lower bound: every stop is at least its distance away."""
+        return sum(abs(floor - stop[0]) for stop in stops)
@@ -2,10 +2,21 @@ import argparse
 import csv
 import logging
 import math
+import os
 from collections import namedtuple
 from random import expovariate, sample, seed
 
+import numpy as np
+
 HallCall = namedtuple('HallCall', ['passenger_id', 'time', 'origin', 'destination'])
+# Block of hall calls as arrays, passenger IDs numbered from first_id
+HallCallChunk = namedtuple('HallCallChunk', ['first_id', 'times', 'origins', 'destinations'])
+
+# Binary request files: header, then fixed-width records in time order
+REQUESTS_MAGIC = b'ORRCALLS'
+REQUESTS_VERSION = 1
+REQUESTS_HEADER = np.dtype([('magic', 'S8'), ('version', '<u2'), ('count', '<i8')])
+REQUEST_RECORD = np.dtype([('time', '<i8'), ('pid', '<i8'), ('source', '<i4'), ('dest', '<i4')])
 
 
 def call_floors(floors):
@@ -60,6 +71,96 @@ def generate_hall_calls(duration, floors, arriving_every=1.0):
     return hall_calls
 
 
+def generate_hall_call_chunks(duration, floors, arriving_every=1.0, seed=None, chunk_size=65536,
+                              start_time=0.0, first_id=1):
+    """Lazily generate hall calls in vectorized blocks of chunk_size.
+
+    Same process as generate_hall_calls (exponential interarrival times
+    with mean arriving_every, floored; origin and destination uniform
+    over distinct floor pairs), but each block's gaps and floors are
+    drawn at once with NumPy. Blocks come out in time order, so memory
+    stays bounded by chunk_size however long the duration. Reproducible
+    for a given seed, though not the same draws as generate_hall_calls.
+
+    Calls arrive from start_time up to duration. Seed may also be a NumPy
+    Generator, to continue drawing from it.
+
+    Yields:
+        HallCallChunk: first passenger ID number and int64 arrays
+    """
+    rng = np.random.default_rng(seed)
+    elapsed = start_time
+    while True:
+        arrivals = elapsed + np.cumsum(rng.exponential(arriving_every, chunk_size))
+        size = int(np.searchsorted(arrivals, duration))  # Arrivals < duration
+        origins = rng.integers(1, floors + 1, size)
+        # Draw from the other floors-1 floors, skipping over the origin
+        destinations = rng.integers(1, floors, size)
+        destinations += destinations >= origins
+        if size:
+            yield HallCallChunk(first_id, np.floor(arrivals[:size]).astype(np.int64), origins, destinations)
+        if size < chunk_size:
+            return
+        elapsed = arrivals[-1]
+        first_id += size
+
+
+def parse_schedule(text):
+    """Parse a "START:EVERY" schedule entry, e.g., "28800:5"."""
+    start, arriving_every = text.split(':')
+    return int(start), float(arriving_every)
+
+
+def generate_scheduled_chunks(duration, floors, schedule, seed=None, chunk_size=65536, period=None):
+    """Lazily generate hall calls with a time-varying arrival rate.
+
+    The schedule is a list of (start time, arriving_every) pairs sorted by
+    start time, each mean time between calls holding until the next
+    start (e.g., [(0, 30), (28800, 5), (36000, 30)] for a morning peak).
+    With a period (e.g., 86400), the schedule repeats every period.
+    Interarrival times are memoryless, so restarting the Poisson process
+    at each change of rate gives exactly a piecewise-constant rate.
+
+    Yields:
+        HallCallChunk: as generate_hall_call_chunks
+    """
+    starts = [start for start, _ in schedule]
+    if not starts or starts[0] != 0 or starts != sorted(set(starts)):
+        raise ValueError('Schedule must start at time 0, in increasing start times')
+    if period is not None and starts[-1] >= period:
+        raise ValueError(f'Schedule starts must fall within the period {period}')
+    rng = np.random.default_rng(seed)
+    first_id = 1
+    offset = 0
+    while offset < duration:
+        for index, (start, arriving_every) in enumerate(schedule):
+            if index + 1 < len(schedule):
+                end = schedule[index + 1][0]
+            else:
+                end = period if period is not None else duration
+            start, end = offset + start, min(offset + end, duration)
+            if start >= end:
+                continue
+            for chunk in generate_hall_call_chunks(end, floors, arriving_every, rng, chunk_size, start, first_id):
+                yield chunk
+                first_id += len(chunk.times)
+        if period is None:
+            return
+        offset += period
+
+
+def stream_requests(chunks):
+    """Lazily yield request tuples from hall call chunks, in time order.
+
+    Passenger IDs are their integer numbers. Each chunk is only drawn
+    once the previous one is used up, so feeding this straight into
+    Building.run_simulation never materializes the request list.
+    """
+    for chunk in chunks:
+        ids = range(chunk.first_id, chunk.first_id + len(chunk.times))
+        yield from zip(chunk.times.tolist(), ids, chunk.origins.tolist(), chunk.destinations.tolist())
+
+
 def generate_requests(hall_calls):
     """Turn unordered hall calls into sorted list of request value tuples."""
     requests = [(call.time, call.passenger_id, call.origin, call.destination) for call in hall_calls]
@@ -77,6 +178,62 @@ def write_requests_to_csv(requests, filename, seed=None):
             writer.writerow([time, pid, source, dest])
 
 
+def write_chunks_to_csv(chunks, filename):
+    """Stream hall call chunks to a requests CSV, as write_requests_to_csv."""
+    count = 0
+    with open(filename, 'w', newline='') as file:
+        file.write('time,id,source,dest\r\n')
+        for chunk in chunks:
+            ids = range(chunk.first_id, chunk.first_id + len(chunk.times))
+            file.writelines(
+                f'{time},passenger{pid},{source},{dest}\r\n'
+                for time, pid, source, dest in zip(
+                    chunk.times.tolist(), ids, chunk.origins.tolist(), chunk.destinations.tolist()
+                )
+            )
+            count += len(chunk.times)
+    return count
+
+
+def write_chunks_to_binary(chunks, filename):
+    """Stream hall call chunks to a binary requests file.
+
+    Records are (time, passenger ID number, source, dest) in time order;
+    see read_requests_binary. The count in the header is patched last.
+    """
+    header = np.zeros((), dtype=REQUESTS_HEADER)
+    header['magic'] = REQUESTS_MAGIC
+    header['version'] = REQUESTS_VERSION
+    with open(filename, 'wb') as file:
+        file.write(header.tobytes())
+        for chunk in chunks:
+            records = np.empty(len(chunk.times), dtype=REQUEST_RECORD)
+            records['time'] = chunk.times
+            records['pid'] = np.arange(chunk.first_id, chunk.first_id + len(records))
+            records['source'] = chunk.origins
+            records['dest'] = chunk.destinations
+            file.write(records.tobytes())
+            header['count'] += len(records)
+        file.seek(0)
+        file.write(header.tobytes())
+    return int(header['count'])
+
+
+def read_requests_binary(filename):
+    """Memory-map a binary requests file as an array of REQUEST_RECORD."""
+    header = np.fromfile(filename, dtype=REQUESTS_HEADER, count=1)
+    if len(header) == 0 or header[0]['magic'] != REQUESTS_MAGIC:
+        raise ValueError(f'{filename} is not a binary requests file')
+    if header[0]['version'] != REQUESTS_VERSION:
+        raise ValueError(f'Unsupported requests file version {header[0]["version"]}')
+    count = int(header[0]['count'])
+    if os.path.getsize(filename) < REQUESTS_HEADER.itemsize + count * REQUEST_RECORD.itemsize:
+        raise ValueError(f'{filename} is truncated: header counts {count} requests')
+    if count == 0:
+        return np.empty(0, dtype=REQUEST_RECORD)
+    return np.memmap(filename, dtype=REQUEST_RECORD, mode='r', offset=REQUESTS_HEADER.itemsize, shape=(count,))
+
+
 def set_seed(seed_int=None):
     """Set seed using random integer from 0 to 100 and return int."""
     seed_int = math.randint(0, 100) if seed_int == None else seed_int
@@ -94,21 +251,37 @@ if __name__ == "__main__":
     parser.add_argument("-s", "--seed", type=int, help="Random seed for determinism")
     parser.add_argument("--arrivingevery", default=1.0, type=float, help="Rate parameter for exponential interarrival times")
     parser.add_argument("--filename", type=str, default='requests.csv', help="Path to output CSV")
+    parser.add_argument("--vectorized", action="store_true", help="Generate in NumPy blocks, streamed to file")
+    parser.add_argument("--binary", action="store_true", help="Write a binary requests file (implies --vectorized)")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="Hall calls per vectorized block")
     args = parser.parse_args()
 
-    try:
-        hall_calls = generate_hall_calls(args.duration, args.floors, args.arrivingevery)
-        requests = generate_requests(hall_calls)
-        if args.seed:
-            set_seed(args.seed)
-            seed_string = f'_seed{args.seed}'
+    if args.vectorized or args.binary:
+        chunks = generate_hall_call_chunks(
+            args.duration, args.floors, args.arrivingevery, args.seed, args.chunk_size
+        )
+        seed_string = f'_seed{args.seed}' if args.seed is not None else ''
+        if args.binary:
+            filename = f'requests_{args.floors}{seed_string}.bin'
+            count = write_chunks_to_binary(chunks, filename)
         else:
-            seed_string = ''
-        filename = f'requests_{args.floors}{seed_string}.csv'
-        write_requests_to_csv(requests, filename, args.seed)
-        print(f"Wrote requests to {filename}.")
-    # [ ] TODO: bare except
-    except:
-        logging.error('Error generating random requests.')
+            filename = f'requests_{args.floors}{seed_string}.csv'
+            count = write_chunks_to_csv(chunks, filename)
+        print(f"Wrote {count} requests to {filename}.")
+    else:
+        try:
+            hall_calls = generate_hall_calls(args.duration, args.floors, args.arrivingevery)
+            requests = generate_requests(hall_calls)
+            if args.seed:
+                set_seed(args.seed)
+                seed_string = f'_seed{args.seed}'
+            else:
+                seed_string = ''
+            filename = f'requests_{args.floors}{seed_string}.csv'
+            write_requests_to_csv(requests, filename, args.seed)
+            print(f"Wrote requests to {filename}.")
+        # [ ] TODO: bare except
+        except:
+            logging.error('Error generating random requests.')
 
     logging.info('Exiting request generation.')
@@ -0,0 +1,175 @@
+"""Content-addressed on-disk cache of simulation results.
+
+Each result is keyed by a hash of everything that determines it: the
+building config, the strategy's identity and version (a hash of the
+source of its module, the simulator, and the orrery modules they import
+from), and the contents of the request file. Re-running an unchanged
+point is then a file read, while editing a strategy, the simulator, or
+the requests misses the cache.
+
+Entries are a KPI summary as JSON plus, optionally, the binary state
+trace compressed with gzip. The cache is size-bounded: entries are
+touched on every hit and the least recently used are evicted first.
+"""
+
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+CACHE_VERSION = 1
+TRACE_SUFFIX = ".trace.gz"
+
+
+def file_digest(filepath, chunk_size=1 << 20):
+    """Return SHA-256 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_modules(module_names):
+    """Return names of modules plus the orrery modules they import from."""
+    names = set(module_names)
+    for module_name in module_names:
+        for value in vars(sys.modules[module_name]).values():
+            defined_in = getattr(value, "__module__", None)
+            if isinstance(defined_in, str) and defined_in.startswith("orrery."):
+                names.add(defined_in)
+    return sorted(names)
+
+
+def strategy_version(strategy):
+    """Return identity and version of a strategy function or object.
+
+    The version hashes the source of the module defining the strategy,
+    of the simulator, and of the orrery modules either imports from, so
+    editing any of them invalidates cached results.
+    """
+    function = strategy if inspect.isroutine(strategy) else type(strategy)
+    digest = hashlib.sha256()
+    for module_name in source_modules([function.__module__, "orrery.simulator"]):
+        digest.update(inspect.getsource(sys.modules[module_name]).encode())
+    return f"{function.__module__}.{function.__qualname__}", digest.hexdigest()
+
+
+def cache_key(config, strategy, requests_digest):
+    """Return the cache key for a config dict, strategy, and requests.
+
+    Config holds every other input to the run (e.g., floors, elevators,
+    capacity, movement, seed), as JSON-serializable values.
+    """
+    identity, version = strategy_version(strategy)
+    payload = {
+        "cache_version": CACHE_VERSION,
+        "config": config,
+        "strategy": identity,
+        "strategy_version": version,
+        "requests": requests_digest,
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """Directory of cached results with LRU eviction past max_bytes.
+
+    Args:
+        directory (str): Cache directory, created if missing
+        max_bytes (int): Total size of entries to keep
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def summary_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def trace_path(self, key):
+        return os.path.join(self.directory, key + TRACE_SUFFIX)
+
+    def __contains__(self, key):
+        return os.path.exists(self.summary_path(key))
+
+    def get(self, key):
+        """Return cached summary, marking the entry recently used, or None."""
+        path = self.summary_path(key)
+        try:
+            with open(path) as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return entry["summary"]
+
+    def put(self, key, summary, config=None, trace=None):
+        """Store summary (and a state trace file, compressed) under key.
+
+        Files are written under temporary names and renamed into place,
+        so a crash never leaves a partial entry. Evicts afterwards.
+        """
+        if trace is not None:
+            with open(trace, "rb") as source, tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=".tmp", delete=False
+            ) as target:
+                with gzip.GzipFile(fileobj=target, mode="wb") as compressed:
+                    shutil.copyfileobj(source, compressed)
+            os.replace(target.name, self.trace_path(key))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            json.dump({"config": config, "summary": summary}, file, indent=2)
+        os.replace(file.name, self.summary_path(key))
+        self.evict()
+
+    def extract_trace(self, key, filepath):
+        """Decompress the cached state trace of key to filepath.
+
+        Returns False if the entry has no trace. Read it with
+        state_trace.StateTrace.
+        """
+        try:
+            with gzip.open(self.trace_path(key), "rb") as source:
+                with open(filepath, "wb") as target:
+                    shutil.copyfileobj(source, target)
+        except FileNotFoundError:
+            return False
+        os.utime(self.summary_path(key))
+        return True
+
+    def entries(self):
+        """Return [(last used, total bytes, key)] for every entry."""
+        sizes, used = {}, {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                key = entry.name[: -len(".json")]
+                used[key] = entry.stat().st_mtime
+            elif entry.name.endswith(TRACE_SUFFIX):
+                key = entry.name[: -len(TRACE_SUFFIX)]
+            else:
+                continue
+            sizes[key] = sizes.get(key, 0) + entry.stat().st_size
+        # Traces without a summary are leftovers; evict those first
+        return [(used.get(key, 0), size, key) for key, size in sizes.items()]
+
+    def evict(self):
+        """Delete least recently used entries until within max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (self.summary_path(key), self.trace_path(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
@@ -0,0 +1,196 @@
+"""Planned elevator routes and the REOPT-BESTINSERT strategy.
+
+An elevator with a planned route visits its stops in order instead of
+heading for whichever target is nearest. `best_insertion` plans routes:
+for each new request, it tries inserting the pickup and drop-off stops
+at every pair of positions in every car's route, and assigns the request
+to the cheapest feasible insertion (see REOPT-BESTINSERT in the README).
+
+The cost of a route is the sum of the arrival times at its stops, i.e.,
+the remaining waits of passengers to pick up plus the remaining times to
+destination of everyone assigned. A car moves one floor per tick and
+serves a stop on arrival, so arrival times are floors travelled.
+"""
+
+import math
+from collections import namedtuple
+
+Stop = namedtuple("Stop", ["floor", "pid", "dropoff"])
+Insertion = namedtuple("Insertion", ["cost", "pickup_index", "dropoff_index"])
+
+
+class Route:
+    """Ordered stops of one elevator, with cached cumulative costs.
+
+    Distances between consecutive stops and the load change at each stop
+    only depend on the stops, so they are cached until the route changes.
+    The leg from the car to the first stop is the only part that changes
+    as the car moves, and is added on the fly.
+    """
+
+    def __init__(self):
+        self.stops = []
+        self.offsets = None  # Cached distance from first stop to each stop
+        self.load_changes = None  # Cached net boardings after each stop
+
+    def insert(self, pickup_index, dropoff_index, pid, source_floor, dest_floor):
+        """Insert pickup and drop-off stops before the given stop indices."""
+        self.stops.insert(dropoff_index, Stop(dest_floor, pid, True))
+        self.stops.insert(pickup_index, Stop(source_floor, pid, False))
+        self.offsets = None
+
+    def replace(self, stops):
+        """Replace the planned stops, e.g., with a reoptimized order."""
+        self.stops = list(stops)
+        self.offsets = None
+
+    def remove(self, pid, dropoff):
+        """Remove the pickup or drop-off stop of passenger, if planned."""
+        for index, stop in enumerate(self.stops):
+            if stop.pid == pid and stop.dropoff == dropoff:
+                del self.stops[index]
+                self.offsets = None
+                return
+
+    def cached_costs(self):
+        """Return (offsets, load changes) per stop, rebuilding if stale."""
+        if self.offsets is None:
+            offsets, load_changes = [], []
+            offset, load_change, previous = 0, 0, None
+            for stop in self.stops:
+                if previous is not None:
+                    offset += abs(stop.floor - previous)
+                load_change += -1 if stop.dropoff else 1
+                offsets.append(offset)
+                load_changes.append(load_change)
+                previous = stop.floor
+            self.offsets, self.load_changes = offsets, load_changes
+        return self.offsets, self.load_changes
+
+    def cost(self, current_floor):
+        """Sum of arrival times at every stop from current_floor."""
+        if not self.stops:
+            return 0
+        offsets, _ = self.cached_costs()
+        return len(offsets) * abs(self.stops[0].floor - current_floor) + sum(offsets)
+
+    def best_insertion(self, current_floor, load, capacity, source_floor, dest_floor):
+        """Return cheapest feasible Insertion of a request, or None if full.
+
+        Pickup goes after stop i and drop-off after stop j (i ≤ j), with
+        i = 0 meaning before the first stop. Stops after each inserted
+        stop are delayed by its detour, and the car must have room for
+        one more passenger from the pickup up to the drop-off.
+        """
+        stops = self.stops
+        n = len(stops)
+        offsets, load_changes = self.cached_costs()
+        first_leg = abs(stops[0].floor - current_floor) if stops else 0
+        # Position k is the car (k = 0) or stop k, with arrival and load after
+        floors = [current_floor] + [stop.floor for stop in stops]
+        arrivals = [0] + [first_leg + offset for offset in offsets]
+        loads = [load] + [load + change for change in load_changes]
+        legs = [abs(floors[k + 1] - floors[k]) for k in range(n)] + [0]
+
+        best = None
+        for i in range(n + 1):
+            if loads[i] >= capacity:
+                continue
+            to_pickup = abs(floors[i] - source_floor)
+            pickup_arrival = arrivals[i] + to_pickup
+            # Drop-off right after pickup, before stop i + 1
+            detour = to_pickup + abs(source_floor - dest_floor)
+            if i < n:
+                detour += abs(dest_floor - floors[i + 1]) - legs[i]
+            cost = (
+                pickup_arrival
+                + pickup_arrival
+                + abs(source_floor - dest_floor)
+                + detour * (n - i)
+            )
+            if best is None or cost < best.cost:
+                best = Insertion(cost, i, i)
+            if i == n:
+                continue
+            # Drop-off after a later stop j, carrying one more in between
+            pickup_detour = to_pickup + abs(source_floor - floors[i + 1]) - legs[i]
+            for j in range(i + 1, n + 1):
+                if loads[j] >= capacity:
+                    break
+                to_dropoff = abs(floors[j] - dest_floor)
+                dropoff_detour = to_dropoff
+                if j < n:
+                    dropoff_detour += abs(dest_floor - floors[j + 1]) - legs[j]
+                cost = (
+                    pickup_arrival
+                    + arrivals[j]
+                    + pickup_detour
+                    + to_dropoff
+                    + pickup_detour * (j - i)
+                    + (pickup_detour + dropoff_detour) * (n - j)
+                )
+                if cost < best.cost:
+                    best = Insertion(cost, i, j)
+        return best
+
+    def next_floor(self, current_floor, passengers, full):
+        """Return floor of first stop to head for, if any.
+
+        A full car skips pickups, heading for the first drop-off of a
+        passenger aboard instead.
+        """
+        for stop in self.stops:
+            if stop.floor == current_floor:
+                continue
+            if full and not (stop.dropoff and stop.pid in passengers):
+                continue
+            return stop.floor
+        return None
+
+    def __len__(self):
+        return len(self.stops)
+
+    def __iter__(self):
+        return iter(self.stops)
+
+
+def best_insertion(elevators, passenger_id, source_floor, dest_floor):
+    """REOPT-BESTINSERT: assign to the car with the cheapest route insertion.
+
+    Inserts the request's stops into the chosen car's planned route. If
+    no car has room anywhere along its route, appends the request to the
+    route of the car that is cheapest to serve it after all other stops.
+    """
+    best, best_elevator = None, None
+    for elevator in elevators:
+        insertion = elevator.route.best_insertion(
+            elevator.current_floor,
+            len(elevator.passengers),
+            elevator.max_passengers,
+            source_floor,
+            dest_floor,
+        )
+        if insertion is not None and (best is None or insertion.cost < best.cost):
+            best, best_elevator = insertion, elevator
+    if best_elevator is None:
+        best_cost = math.inf
+        for elevator in elevators:
+            route = elevator.route
+            last_floor = route.stops[-1].floor if route else elevator.current_floor
+            cost = route.cost(elevator.current_floor) + abs(last_floor - source_floor)
+            if cost < best_cost:
+                best_cost, best_elevator = cost, elevator
+        end = len(best_elevator.route)
+        best = Insertion(best_cost, end, end)
+    best_elevator.route.insert(
+        best.pickup_index, best.dropoff_index, passenger_id, source_floor, dest_floor
+    )
+    return best_elevator
+
+
+best_insertion.plans_routes = True  # Assigns by planning routes (see plans_routes)
+
+
+def plans_routes(strategy):
+    """Return whether strategy assigns requests by planning routes."""
+    return getattr(strategy, "plans_routes", False)
@@ -0,0 +1,257 @@
+"""Sharded simulation of sites with several independent elevator banks.
+
+A large site often splits its cars into banks, each serving one zone
+of floors from the lobby, which share nothing but the stream of hall
+calls. A `ZoneRouter` splits that stream by zone, and each bank's
+`Building` runs in its own worker process, so one site's simulation
+scales across cores.
+
+The parent reads requests once and hands each shard its calls one time
+window at a time. Shards advance through the same windows, at most
+lookahead windows apart, so memory stays bounded however long the run.
+At the end, their passenger statistics are merged, and their state
+traces are merged into one trace with elevators numbered across banks.
+
+    python -m orrery.sharded -r requests_40_seed42.csv -b 20:4 40:4 -c 8 \
+        -s nearest --trace elevator_states.trace
+"""
+
+import argparse
+import os
+import tempfile
+from bisect import bisect_left
+from collections import namedtuple
+from multiprocessing import Pipe, Process
+
+from orrery.simulator import (
+    MOVEMENTS,
+    STRATEGIES,
+    Building,
+    make_strategy,
+    stream_requests_from_csv,
+)
+from orrery.state_trace import StateTraceWriter, merge_traces
+from orrery.stats import PassengerStats
+
+Bank = namedtuple("Bank", ["top_floor", "elevators"])
+ShardResult = namedtuple("ShardResult", ["bank", "stats", "ticks"])
+
+
+def parse_bank(text):
+    """Parse a bank given as TOP_FLOOR:ELEVATORS (e.g., 20:4)."""
+    try:
+        top_floor, elevators = text.split(":")
+        return Bank(int(top_floor), int(elevators))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected TOP_FLOOR:ELEVATORS, got {text}")
+
+
+class ZoneRouter:
+    """Route each hall call to the bank whose zone holds its upper floor.
+
+    Bank i serves the lobby and floors above the previous bank's top
+    floor up to its own, so lobby calls go by their other floor. Trips
+    between two zones go to the higher zone's bank, whose cars run
+    express past the lower zones (rather than transferring at the lobby).
+    """
+
+    def __init__(self, banks):
+        self.top_floors = [bank.top_floor for bank in banks]
+        if self.top_floors != sorted(set(self.top_floors)):
+            raise ValueError("Bank top floors must be strictly increasing")
+
+    def __call__(self, request):
+        _, _, source, dest = request
+        bank = bisect_left(self.top_floors, max(source, dest))
+        if bank == len(self.top_floors):
+            raise ValueError(f"No bank serves floor {max(source, dest)}")
+        return bank
+
+
+def shard_requests(connection):
+    """Yield requests window by window as the parent sends them.
+
+    Asking for the next window acknowledges the previous one, i.e. the
+    shard has processed every call in it. Ends at the parent's None.
+    """
+    window = 0
+    while (batch := connection.recv()) is not None:
+        yield from batch
+        connection.send(window)
+        window += 1
+
+
+def run_shard(index, bank, capacity, strategy, movement, event_driven, trace, conn):
+    """Simulate one bank in a worker, sending its ShardResult at the end."""
+    state_log = None if trace is None else StateTraceWriter(trace)
+    building = Building(
+        bank.top_floor,
+        bank.elevators,
+        capacity,
+        make_strategy(strategy),
+        state_log,
+        stats=PassengerStats(),
+        keep_passenger_times=False,
+        movement=movement,
+    )
+    building.run_simulation(shard_requests(conn), event_driven, report=False)
+    if state_log is not None:
+        state_log.close()
+    conn.send(ShardResult(index, building.stats, len(building.state_log)))
+    conn.close()
+
+
+def run_sharded(
+    banks,
+    requests,
+    capacity,
+    strategy="nearest",
+    movement="nearest",
+    router=None,
+    window=1000,
+    lookahead=2,
+    event_driven=False,
+    trace=None,
+):
+    """Simulate each bank in its own process, fed from one request stream.
+
+    Args:
+        banks (List[Bank]): Banks, in order of their zones
+        requests: Time-sorted requests, e.g. a lazy stream
+        router (Callable): Maps a request to its bank's index
+            (default: ZoneRouter of banks)
+        window (int): Ticks of requests handed to shards at a time
+        lookahead (int): Windows a shard may be handed ahead of the
+            slowest shard
+        trace (str): Path to write the merged binary state trace to
+
+    Returns:
+        Tuple[PassengerStats, List[ShardResult]]: merged and per bank
+    """
+    router = ZoneRouter(banks) if router is None else router
+    trace_directory = None
+    if trace is not None:
+        trace_directory = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(trace)))
+    connections, workers, traces = [], [], []
+    for index, bank in enumerate(banks):
+        parent, child = Pipe()
+        shard_trace = None
+        if trace_directory is not None:
+            shard_trace = os.path.join(trace_directory, f"bank_{index}.trace")
+            traces.append(shard_trace)
+        worker = Process(
+            target=run_shard,
+            args=(index, bank, capacity, strategy, movement, event_driven),
+            kwargs={"trace": shard_trace, "conn": child},
+        )
+        worker.start()
+        child.close()
+        connections.append(parent)
+        workers.append(worker)
+
+    sent = 0  # Windows handed to every shard
+
+    def send_window(batches):
+        nonlocal sent
+        if sent >= lookahead:
+            for connection in connections:
+                connection.recv()  # Acknowledges window sent - lookahead
+        for connection, batch in zip(connections, batches):
+            connection.send(batch)
+        sent += 1
+
+    try:
+        batches = [[] for _ in banks]
+        for request in requests:
+            while request[0] >= (sent + 1) * window:
+                send_window(batches)
+                batches = [[] for _ in banks]
+            batches[router(request)].append(request)
+        send_window(batches)
+        # Signal every shard before collecting, so their tails run in parallel
+        for connection in connections:
+            connection.send(None)
+        results = []
+        for connection in connections:
+            # Skip acknowledgements still in flight
+            while not isinstance(result := connection.recv(), ShardResult):
+                pass
+            results.append(result)
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    stats = PassengerStats()
+    for result in results:
+        stats.merge(result.stats)
+    if trace is not None:
+        offsets = [sum(bank.elevators for bank in banks[:i]) for i in range(len(banks))]
+        elevator_ids = [
+            offset + i
+            for bank, offset in zip(banks, offsets)
+            for i in range(1, bank.elevators + 1)
+        ]
+        merge_traces(traces, trace, elevator_ids)
+        for shard_trace in traces:
+            os.remove(shard_trace)
+        os.rmdir(trace_directory)
+    return stats, results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate a site's elevator banks in parallel processes.",
+    )
+    parser.add_argument(
+        "-r", "--requests", type=str, required=True, help="Path to requests CSV"
+    )
+    parser.add_argument(
+        "-b",
+        "--banks",
+        type=parse_bank,
+        nargs="+",
+        required=True,
+        metavar="TOP_FLOOR:ELEVATORS",
+        help="Each bank's top floor and elevators, by increasing zone",
+    )
+    parser.add_argument("-c", "--capacity", type=int, required=True)
+    parser.add_argument("-s", "--strategy", choices=list(STRATEGIES), default="nearest")
+    parser.add_argument("-m", "--movement", choices=MOVEMENTS, default="nearest")
+    parser.add_argument(
+        "--window", type=int, default=1000, help="Ticks of requests sent at a time"
+    )
+    parser.add_argument(
+        "--lookahead", type=int, default=2, help="Windows shards may run ahead"
+    )
+    parser.add_argument("--event-driven", action="store_true")
+    parser.add_argument("--trace", type=str, help="Path to merged binary state trace")
+    args = parser.parse_args()
+
+    stats, results = run_sharded(
+        args.banks,
+        stream_requests_from_csv(args.requests),
+        args.capacity,
+        args.strategy,
+        args.movement,
+        window=args.window,
+        lookahead=args.lookahead,
+        event_driven=args.event_driven,
+        trace=args.trace,
+    )
+    for result in results:
+        bank = args.banks[result.bank]
+        summary = result.stats.summary()
+        print(
+            f"Bank {result.bank + 1} (to floor {bank.top_floor}, "
+            f"{bank.elevators} elevators): {summary['passengers']} passengers, "
+            f"mean wait {summary['mean_wait']:.2f}, ticks {result.ticks}"
+        )
+    print(f"Site: {stats.passengers} passengers")
+    stats.print_report()
+
+
+if __name__ == "__main__":
+    main()
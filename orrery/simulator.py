@@ -1,73 +1,191 @@
 import argparse
 import csv
+import heapq
+import inspect
 import logging
+import math
+import os
+import pickle
+import random
+import runpy
+from array import array
 from collections import defaultdict, deque, namedtuple
-from itertools import filterfalse
-from random import choice
+from collections.abc import MutableMapping
+from itertools import islice
+from operator import itemgetter
+from random import choice, randrange
+
+from orrery.deadline import DeadlineDispatcher
+from orrery.elevator_index import IndexedElevators
+from orrery.event_trace import (
+    ASSIGN,
+    BOARD,
+    MOVE,
+    NO_ELEVATOR,
+    NO_PASSENGER,
+    REJECT,
+    UNLOAD,
+    EventTrace,
+)
+from orrery.matching import BatchMatcher
+from orrery.profiling import PhaseProfile
+from orrery.reopt import Reoptimizer
+from orrery.request_generator import (
+    generate_hall_call_chunks,
+    generate_scheduled_chunks,
+    parse_schedule,
+    read_requests_binary,
+    stream_requests,
+)
+from orrery.routes import Route, best_insertion
+from orrery.state_trace import StateTraceWriter
+from orrery.states import CompactStateLog
+from orrery.stats import PassengerStats
+from orrery.targets import TargetFloors
 
 LOG_FILE = "log.info"
 
-logging.basicConfig(
-    format="%(asctime)s : %(levelname)s : %(message)s",
-    level=logging.INFO,
-    filename=LOG_FILE,
-)
 
+Passenger = namedtuple("Passenger", ["pid", "dest", "elevator_id"])
+MISSING = -1  # Marks passengers without a time in PassengerTimes
+
+# Elevator movement rules: go to the nearest target, or keep going in the
+# current direction while there are targets ahead (i.e., LOOK)
+MOVEMENTS = ["nearest", "look"]
+
+
+class WaitingQueues:
+    """Waiting passengers indexed by floor and assigned elevator.
+
+    Each (floor, elevator ID) pair has its own FIFO queue, so enqueueing
+    and boarding are O(1) per passenger, and an elevator never has to
+    look at passengers waiting for other elevators.
+    """
+
+    def __init__(self):
+        self.queues = {}  # Maps (floor, elevator ID) to deque of passengers
+        self.count = 0
+
+    def append(self, floor, passenger):
+        key = (floor, passenger.elevator_id)
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = deque()
+        queue.append(passenger)
+        self.count += 1
+
+    def waiting_for(self, floor, elevator_id):
+        """Return queue of passengers on floor assigned to elevator, if any."""
+        return self.queues.get((floor, elevator_id))
 
-Passenger = namedtuple("Passenger", ["pid", "dest"])
+    def popleft(self, floor, elevator_id):
+        key = (floor, elevator_id)
+        queue = self.queues[key]
+        passenger = queue.popleft()
+        if not queue:
+            del self.queues[key]
+        self.count -= 1
+        return passenger
+
+    def __contains__(self, key):
+        """Check for passengers waiting at (floor, elevator ID)."""
+        return key in self.queues
+
+    def __len__(self):
+        return self.count
 
 
 class Elevator:
-    def __init__(self, elevator_id, max_passengers):
+    def __init__(self, elevator_id, max_passengers, movement="nearest"):
+        if movement not in MOVEMENTS:
+            raise ValueError(f"Unknown movement {movement}")
         self.id = elevator_id
         self.max_passengers = max_passengers
+        self.movement = movement
         self.current_floor = 1  # All elevators start at floor 1
         self.passengers = {}  # Maps passenger ID to destination floor
         self.board_time = {}  # Tracks when passengers boarded
-        self.target_floors = []  # Scheduled floors
+        self.target_floors = TargetFloors()  # Scheduled pickups and drop-offs
+        self.dropoff_floors = TargetFloors()  # Destinations of passengers aboard
+        self.route = Route()  # Planned stops in order, if strategy plans routes
+        # Passengers assigned outside a planned route (e.g., by a fallback)
+        self.unrouted = set()
         self.direction = 0  # 0 for idle, 1 for up, -1 for down
+        self.positions = None  # Group's elevator_index.ElevatorIndex, if any
 
     def move(self):
         """Move towards closest floor in targets or idles w/o targets.
 
-        Currently goes to relative closest target floor. This helps
+        By default goes to relative closest target floor. This helps
         construct the shortest paths possible for direct travel time,
         but this does not guarantee the shortest waits possible.
-        It currently does not account for reverse journey control.
+        With "look" movement, it instead keeps going in its direction
+        of travel while any targets lie ahead, only then reversing.
+        Planned routes (see routes.best_insertion) take precedence, unless
+        the car has passengers assigned outside its route to serve first.
         """
-        if self.target_floors:
-            floors_elsewhere = list(
-                filterfalse(lambda x: x == self.current_floor, self.target_floors)
-            )
-            next_floor = min(
-                floors_elsewhere, key=lambda x: abs(x - self.current_floor)
+        next_floor = self.next_floor()
+        if next_floor is None:
+            self.direction = 0
+            return
+        if self.current_floor < next_floor:
+            self.direction = 1
+        elif self.current_floor > next_floor:
+            self.direction = -1
+        self.current_floor += self.direction
+        if self.positions is not None:
+            self.positions.update(self)
+
+    def next_floor(self):
+        """Return closest actionable target floor elsewhere, if any.
+
+        A full elevator cannot pick anyone up, so only drop-off floors
+        count. Otherwise, it would keep chasing pickups it can't serve.
+        Ties between floors equally far above and below go to the one
+        in the current direction of travel, else to the lower floor.
+        """
+        full = len(self.passengers) >= self.max_passengers
+        if self.route and not self.unrouted:
+            next_floor = self.route.next_floor(
+                self.current_floor, self.passengers, full
             )
-            if self.current_floor < next_floor:
-                self.direction = 1
-            elif self.current_floor > next_floor:
-                self.direction = -1
-            self.current_floor += self.direction
+            if next_floor is not None:
+                return next_floor
+        if full:
+            floors = self.dropoff_floors
         else:
-            self.direction = 0
+            floors = self.target_floors
+        above = floors.nearest_above(self.current_floor)
+        below = floors.nearest_below(self.current_floor)
+        if above is None or below is None:
+            return below if above is None else above
+        if self.movement == "look" and self.direction:
+            return above if self.direction > 0 else below
+        return min(above, below, key=self.distance_key)
+
+    def distance_key(self, floor):
+        """Sort key for target floors by distance with tie-breaking."""
+        offset = floor - self.current_floor
+        return abs(offset), offset * self.direction < 0, floor
 
     def load_passenger(self, passenger_id, dest_floor, current_time):
         """Load waiting passenger if current occupied capacity allows.
 
-        This is a relaxation of assumptions in favor of in-built capacity
-        maximization. However, this is quirky and could lead to system
-        saturation. Optimization opportunities exist and further
-        benchmarking is needed to assess eliminating this relaxation.
+        Boarding swaps the passenger's pickup floor in the targets for
+        their destination floor, so targets only ever hold floors where
+        the elevator has someone to pick up or drop off.
         """
         if len(self.passengers) < self.max_passengers:
-            if dest_floor in self.target_floors:
-                self.passengers[passenger_id] = dest_floor  # Passenger boards elevator
-                self.board_time[passenger_id] = current_time  # Log boarding time
-                (
-                    self.target_floors.remove(self.current_floor)
-                    if self.current_floor in self.target_floors
-                    else None
-                )
-                return True
+            self.passengers[passenger_id] = dest_floor  # Passenger boards elevator
+            self.board_time[passenger_id] = current_time  # Log boarding time
+            self.target_floors.remove(self.current_floor)
+            self.target_floors.add(dest_floor)
+            self.dropoff_floors.add(dest_floor)
+            if self.route:
+                self.route.remove(passenger_id, dropoff=False)
+            if self.positions is not None:
+                self.positions.update(self)
+            return True
         return False
 
     def unload_passengers(self, current_time):
@@ -76,96 +194,367 @@ class Elevator:
             pid for pid, floor in self.passengers.items() if floor == self.current_floor
         ]
         if to_remove:
-            (
-                self.target_floors.remove(self.current_floor)
-                if self.current_floor in self.target_floors
-                else None
-            )
             passengers_unloaded = {pid: self.board_time[pid] for pid in to_remove}
             for pid in to_remove:
+                self.target_floors.remove(self.current_floor)
+                self.dropoff_floors.remove(self.current_floor)
+                if self.route:
+                    self.route.remove(pid, dropoff=True)
+                if self.unrouted:
+                    self.unrouted.discard(pid)
                 del self.passengers[pid]
                 del self.board_time[pid]
+            if self.positions is not None:
+                self.positions.update(self)
             return passengers_unloaded
         return False
 
 
 class Building:
     def __init__(
-        self, num_floors, num_elevators, max_passengers_per_elevator, strategy_function
+        self,
+        num_floors,
+        num_elevators,
+        max_passengers_per_elevator,
+        strategy_function,
+        state_log=None,
+        stats=None,
+        keep_passenger_times=True,
+        movement="nearest",
+        profile=None,
+        compact=False,
+        event_trace=None,
+        batch_strategy=None,
     ):
+        if not keep_passenger_times and stats is None:
+            raise ValueError("Dropping passenger times requires streaming stats")
         self.num_floors = num_floors
         self.strategy = strategy_function
-        # Just use index of number of elevators range to ID each elevator
-        self.elevators = [
-            Elevator(i, max_passengers_per_elevator)
+        # Just use index of number of elevators range to ID each elevator,
+        # indexed by floor and load for strategies (elevator_index)
+        self.elevators = IndexedElevators(
+            Elevator(i, max_passengers_per_elevator, movement)
             for i in range(1, num_elevators + 1)
-        ]
-        self.state_log = defaultdict()  # Tracks elevator states over time
-        self.wait_times = {}  # Maps passenger ID to their wait time
-        self.travel_times = {}  # Maps passenger ID to their travel time
-        self.occupancy = defaultdict(list)  # Tracks passengers waiting on each floor
+        )
+        # Tracks elevator states over time (e.g., states.CompactStateLog)
+        self.state_log = defaultdict() if state_log is None else state_log
+        # Map passenger ID to their wait time and travel time; with compact,
+        # IDs must be dense integers (e.g., from PassengerIds) and times
+        # live in typed arrays
+        self.wait_times = PassengerTimes() if compact else {}
+        self.travel_times = PassengerTimes() if compact else {}
+        # Streaming percentiles (e.g., stats.PassengerStats); without kept
+        # passenger times, wait_times only holds in-flight request times
+        self.stats = stats
+        self.keep_passenger_times = keep_passenger_times
+        self.occupancy = WaitingQueues()  # Tracks passengers waiting on each floor
+        self.current_time = None  # Next tick to simulate, once started
+        self.requests_processed = 0
+        # (Requests given, live iterator, next request) while paused
+        self.paused_requests = None
+        # Per-phase timings (profiling.PhaseProfile), off unless given
+        self.profile = profile
+        if profile is not None:
+            profile.instrument(self)
+        # Structured event records (event_trace.EventTrace), off unless given
+        self.event_trace = event_trace
+        # Assigns each tick's requests jointly (e.g., matching.BatchMatcher)
+        # in run_simulation instead of the strategy one by one
+        self.batch_strategy = batch_strategy
 
     def process_request(self, time, passenger_id, source_floor, dest_floor):
         """Assign requests chronologically according to chosen strategy.
 
         "Skate": Random choice, random available, nearest available only
+
+        Passengers wait on their source floor for their assigned elevator
+        (i.e., perfect compliance), which schedules their source floor.
+        Returns the assigned elevator, or False if none was.
         """
-        self.wait_times[passenger_id] = time  # Store time request entered system
         elevator = self.strategy(self.elevators, passenger_id, source_floor, dest_floor)
-        if elevator:
-            elevator.target_floors.extend([source_floor, dest_floor])
-            return True
+        return self.assign(time, passenger_id, source_floor, dest_floor, elevator)
+
+    def process_arrivals(self, requests):
+        """Assign requests arriving in the same tick, jointly if batching."""
+        if self.batch_strategy is not None:
+            self.process_batch(requests)
+            return
+        for time, passenger_id, source_floor, dest_floor in requests:
+            self.process_request(time, passenger_id, source_floor, dest_floor)
+
+    def process_batch(self, requests):
+        """Assign requests arriving in the same tick jointly by batch strategy."""
+        elevators = self.batch_strategy(self, requests)
+        for (time, pid, source, dest), elevator in zip(requests, elevators):
+            self.assign(time, pid, source, dest, elevator)
+
+    def assign(self, time, passenger_id, source_floor, dest_floor, elevator):
+        """Queue the passenger for elevator, returning it (False if None)."""
+        if self.event_trace is not None:
+            self.event_trace.record(
+                time,
+                elevator.id if elevator else NO_ELEVATOR,
+                ASSIGN if elevator else REJECT,
+                passenger_id,
+                source_floor,
+            )
         if not elevator:
             return False
+        self.wait_times[passenger_id] = time  # Store time request entered system
+        self.occupancy.append(
+            source_floor, Passenger(passenger_id, dest_floor, elevator.id)
+        )  # Track waiting passengers per floor
+        elevator.target_floors.add(source_floor)
+        return elevator
 
     def simulate_time_step(self, current_time):
         """First unload any passengers, then load passengers, then move."""
         self.log_elevator_states(current_time)
+        trace = self.event_trace
         for elevator in self.elevators:
             unloaded_passengers = elevator.unload_passengers(current_time)
             if unloaded_passengers:
                 for pid, board_time in unloaded_passengers.items():
-                    self.travel_times[pid] = (
-                        current_time - board_time
-                    )  # Store travel time
-                    self.wait_times[pid] = (
-                        board_time - self.wait_times[pid]
-                    )  # Store wait time
-            for passenger in self.occupancy[elevator.current_floor]:
-                if elevator.load_passenger(passenger.pid, passenger.dest, current_time):
-                    self.occupancy[elevator.current_floor].remove(passenger)
+                    if trace is not None:
+                        trace.record(
+                            current_time,
+                            elevator.id,
+                            UNLOAD,
+                            pid,
+                            elevator.current_floor,
+                        )
+                    travel_time = current_time - board_time
+                    wait_time = board_time - self.wait_times[pid]
+                    if self.stats is not None:
+                        self.stats.record(wait_time, travel_time)
+                    if self.keep_passenger_times:
+                        self.travel_times[pid] = travel_time  # Store travel time
+                        self.wait_times[pid] = wait_time  # Store wait time
+                    else:
+                        del self.wait_times[pid]
+            floor = elevator.current_floor
+            waiting = self.occupancy.waiting_for(floor, elevator.id)
+            while waiting:
+                passenger = waiting[0]
+                if not elevator.load_passenger(
+                    passenger.pid, passenger.dest, current_time
+                ):
+                    break  # Elevator is full
+                if trace is not None:
+                    trace.record(current_time, elevator.id, BOARD, passenger.pid, floor)
+                self.occupancy.popleft(floor, elevator.id)
             elevator.move()
+            if trace is not None and elevator.current_floor != floor:
+                trace.record(
+                    current_time,
+                    elevator.id,
+                    MOVE,
+                    NO_PASSENGER,
+                    elevator.current_floor,
+                )
 
     def log_elevator_states(self, current_time):
         elevator_states = {e.id: e.current_floor for e in self.elevators}
         self.state_log[current_time] = elevator_states
 
-    def run_simulation(self, requests):
-        """Process sorted requests by time (i.e., chronologically)."""
-        requests = deque(requests)  # Requests are pre-sorted at load
-        current_time = 0
-        self.log_elevator_states(current_time)
-        # dev note: prefer explicit requests length > 0 over truthiness
+    def has_floor_activity(self, elevator, floor):
+        """Check whether elevator would unload or load at floor."""
+        if any(dest == floor for dest in elevator.passengers.values()):
+            return True
+        if len(elevator.passengers) < elevator.max_passengers:
+            return (floor, elevator.id) in self.occupancy
+        return False
+
+    def quiet_ticks(self, horizon=None):
+        """Count upcoming ticks where elevators only travel or idle.
+
+        During a quiet tick nobody boards or alights, so every elevator
+        keeps heading for the same closest target floor (or keeps idling)
+        and its position is fully determined. The count stops at the
+        first arrival at a target floor or at any floor with passengers
+        to unload or load, capped by horizon (i.e., next request arrival).
+        Returns 0 when nothing bounds the stretch.
+        """
+        quiet = math.inf if horizon is None else horizon
+        for elevator in self.elevators:
+            next_floor = elevator.next_floor()
+            if next_floor is None:
+                if self.has_floor_activity(elevator, elevator.current_floor):
+                    return 0
+                continue
+            step = 1 if next_floor > elevator.current_floor else -1
+            floors_en_route = range(elevator.current_floor, next_floor, step)
+            for ticks, floor in enumerate(floors_en_route):
+                if ticks >= quiet:
+                    break
+                if self.has_floor_activity(elevator, floor):
+                    quiet = ticks
+                    break
+            else:
+                quiet = min(quiet, len(floors_en_route))
+        return 0 if quiet == math.inf else quiet
+
+    def advance_quiet_ticks(self, current_time, ticks):
+        """Log and move all elevators through quiet ticks in bulk."""
+        directions = {}
+        for elevator in self.elevators:
+            next_floor = elevator.next_floor()
+            if next_floor is None:
+                directions[elevator] = 0
+            elif next_floor > elevator.current_floor:
+                directions[elevator] = 1
+            else:
+                directions[elevator] = -1
+        for offset in range(ticks):
+            self.state_log[current_time + offset] = {
+                e.id: e.current_floor + direction * offset
+                for e, direction in directions.items()
+            }
+            if self.event_trace is not None:
+                for e, direction in directions.items():
+                    if direction:
+                        self.event_trace.record(
+                            current_time + offset,
+                            e.id,
+                            MOVE,
+                            NO_PASSENGER,
+                            e.current_floor + direction * (offset + 1),
+                        )
+        for elevator, direction in directions.items():
+            elevator.current_floor += direction * ticks
+            elevator.direction = direction
+            if elevator.positions is not None:
+                elevator.positions.update(elevator)
+
+    def run_simulation(self, requests, event_driven=False, report=True, until=None):
+        """Process sorted requests by time (i.e., chronologically).
+
+        Requests may be any iterable, including a lazy stream, and are
+        only pulled as simulated time reaches them.
+
+        With event_driven, stretches of quiet ticks between request
+        arrivals and elevator arrivals at floors with work to do are
+        skipped over in bulk. The state log is filled in for every
+        skipped tick, so outputs match the tick-by-tick run exactly.
+        Statistics (and any phase profile) are printed at the end unless
+        report is False; a profile with an output path is also saved.
+
+        With until, pauses before simulating tick until and returns
+        False (e.g., to take a snapshot). Calling again with the same
+        requests resumes exactly as if never paused: the same requests
+        object picks up where it was left, while other requests from the
+        start (e.g., on a building restored from the snapshot) skip the
+        requests already processed. Returns True once all passengers are
+        served.
+        """
+        if self.profile is not None:
+            self.profile.start()
+        given = requests
+        if self.current_time is None:
+            current_time = 0
+            self.log_elevator_states(current_time)
+            # Requests are pre-sorted, so pull them lazily one ahead
+            requests = iter(requests)
+            pending = next(requests, None)
+        elif self.paused_requests is not None and self.paused_requests[0] is given:
+            current_time = self.current_time
+            _, requests, pending = self.paused_requests
+        else:
+            current_time = self.current_time
+            requests = islice(iter(requests), self.requests_processed, None)
+            pending = next(requests, None)
+        self.paused_requests = None
+        processed = self.requests_processed
+        until = math.inf if until is None else until
+        paused = False
+        # dev note: prefer explicit pending is not None over truthiness
         # So long as there are requests or passengers in elevators or on floors:
         while (
-            len(requests) > 0
+            pending is not None
             or any(e.passengers for e in self.elevators)
-            or any(self.occupancy.values())
+            or len(self.occupancy) > 0
         ):
-            while requests and requests[0][0] == current_time:
-                time, pid, source, dest = requests.popleft()
-                pending_request = requests.popleft()
-                time, pid, source, dest = pending_request
-                self.occupancy[source].append(
-                    Passenger(pid, dest)
-                )  # Track waiting passengers per floor
-                self.process_request(time, pid, source, dest)
+            if current_time >= until:
+                paused = True
+                break
+            if pending is not None and pending[0] == current_time:
+                arrivals = []
+                while pending is not None and pending[0] == current_time:
+                    arrivals.append(pending)
+                    pending = next(requests, None)
+                self.process_arrivals(arrivals)
+                processed += len(arrivals)
+            if event_driven:
+                horizon = until if pending is None else min(pending[0], until)
+                horizon = None if horizon == math.inf else horizon - current_time
+                quiet = self.quiet_ticks(horizon)
+                if quiet > 0:
+                    self.advance_quiet_ticks(current_time, quiet)
+                    current_time += quiet
+                    continue
             self.simulate_time_step(current_time)
             current_time += 1
-        self.output_statistics()
+        self.current_time = current_time
+        self.requests_processed = processed
+        if self.profile is not None:
+            self.profile.stop()
+        if paused:
+            self.paused_requests = (given, requests, pending)
+            return False
+        if self.profile is not None and self.profile.output:
+            self.profile.write_json(self.profile.output)
+        if report:
+            self.output_statistics()
+            dispatcher = self.deadline_dispatcher()
+            if dispatcher is not None:
+                dispatcher.print_report()
+            if self.batch_strategy is not None:
+                self.batch_strategy.print_report()
+            if self.profile is not None:
+                self.profile.print_report()
+        return True
+
+    def __getstate__(self):
+        # Live request iterators don't pickle; restored buildings skip
+        # the requests processed instead
+        state = self.__dict__.copy()
+        state["paused_requests"] = None
+        return state
+
+    def snapshot(self):
+        """Return the building's full state as compact bytes.
+
+        Covers elevators (positions, passengers, board times, targets,
+        routes), waiting passengers, passenger times or streaming stats,
+        the state log, the strategy (with any search state), progress
+        through the requests, and the random module's state, so a
+        restored building resumes exactly. Strategies must be picklable
+        (e.g., module-level functions), and profiled buildings can't be
+        snapshot. A CompactStateLog keeps snapshots of long runs small.
+        """
+        if self.profile is not None:
+            raise ValueError("Profiled buildings can't be snapshot")
+        return pickle.dumps((self, random.getstate()), pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def restore(snapshot):
+        """Return a building restored from snapshot bytes.
+
+        Restores the random module's state too, so random strategies
+        draw the same as in the uninterrupted run.
+        """
+        building, random_state = pickle.loads(snapshot)
+        random.setstate(random_state)
+        return building
 
     def output_statistics(self):
         """Calculate and print min, max, and mean wait and travel times."""
+        if self.stats is not None:
+            self.stats.print_report()
+            return
+        if not self.travel_times:
+            print("No passengers delivered: times n/a")
+            return
 
         min_wait = min(self.wait_times.values())
         max_wait = max(self.wait_times.values())
@@ -181,11 +570,46 @@ class Building:
             f"Travel Times - Min: {min_travel}, Max: {max_travel}, Mean: {mean_travel:.2f}"
         )
 
+    def deadline_dispatcher(self):
+        """Return the strategy if a deadline.DeadlineDispatcher, else None."""
+        strategy = inspect.unwrap(self.strategy)  # Past any profile wrapper
+        return strategy if isinstance(strategy, DeadlineDispatcher) else None
+
+    def summary_statistics(self):
+        """Return KPI summary of passenger times as a flat dict.
+
+        With a DeadlineDispatcher strategy or a batch strategy, includes
+        their decision KPIs.
+        """
+        dispatcher = self.deadline_dispatcher()
+        decisions = {} if dispatcher is None else dispatcher.summary()
+        if self.batch_strategy is not None:
+            decisions.update(self.batch_strategy.summary())
+        if self.stats is not None:
+            return {**self.stats.summary(), "ticks": len(self.state_log), **decisions}
+        waits = self.wait_times.values()
+        travels = self.travel_times.values()
+        # NaN times for runs without passengers, like streaming stats
+        return {
+            "passengers": len(self.travel_times),
+            "ticks": len(self.state_log),
+            "min_wait": min(waits, default=math.nan),
+            "max_wait": max(waits, default=math.nan),
+            "mean_wait": sum(waits) / len(waits) if waits else math.nan,
+            "min_travel": min(travels, default=math.nan),
+            "max_travel": max(travels, default=math.nan),
+            "mean_travel": sum(travels) / len(travels) if travels else math.nan,
+            **decisions,
+        }
+
     def output_elevator_states_to_csv(self, filename="elevator_states.csv"):
         """Output the recorded states of all elevators to a CSV file."""
         with open(filename, "w", newline="") as file:
             writer = csv.writer(file)
             writer.writerow(["time", "elevator_id", "current_floor"])
+            if hasattr(self.state_log, "rows"):
+                writer.writerows(self.state_log.rows())  # Expands lazily
+                return
             for time, states in sorted(self.state_log.items()):
                 for elevator_id, floor in states.items():
                     writer.writerow([time, elevator_id, floor])
@@ -196,6 +620,9 @@ def random_choice(elevators, passenger_id, source_floor, dest_floor):
 
 
 def nearest_available(elevators, passenger_id, source_floor, dest_floor):
+    positions = getattr(elevators, "positions", None)
+    if positions is not None:
+        return positions.nearest(source_floor)
     available = sorted(elevators, key=lambda e: len(e.passengers))
     nearest_available_elevator = min(
         available, key=lambda e: abs(e.current_floor - source_floor)
@@ -204,10 +631,34 @@ def nearest_available(elevators, passenger_id, source_floor, dest_floor):
 
 
 def random_available(elevators, passenger_id, source_floor, dest_floor):
+    positions = getattr(elevators, "positions", None)
+    if positions is not None:
+        # Same draw as choice() over elevators sorted by load
+        return positions.by_load(randrange(len(positions)))
     available = sorted(elevators, key=lambda e: len(e.passengers))
     return choice(available)
 
 
+# Strategy functions by name, or classes of strategies keeping search state
+STRATEGIES = {
+    "random": random_choice,
+    "available": random_available,
+    "nearest": nearest_available,
+    "bestinsert": best_insertion,
+    "reopt": Reoptimizer,
+}
+
+
+def make_strategy(name):
+    """Return the named strategy, as a new instance if it keeps state.
+
+    Each building gets its own stateful strategy (e.g., the reoptimizer's
+    memo), so runs sharing a process don't share search state.
+    """
+    strategy = STRATEGIES[name]
+    return strategy() if isinstance(strategy, type) else strategy
+
+
 def load_requests_from_csv(filepath):
     with open(filepath, newline="") as file:
         reader = csv.reader(file)
@@ -218,6 +669,165 @@ def load_requests_from_csv(filepath):
         )
 
 
+class PassengerIds:
+    """Intern passenger ID strings to dense integers in read order.
+
+    Each hall call is one passenger's one transit, so every ID is new
+    and interning is just counting. Names are kept for reverse lookup
+    only if asked, since that list grows with trace length.
+    """
+
+    def __init__(self, keep_names=False):
+        self.count = 0
+        self.names = [] if keep_names else None
+
+    def __call__(self, name):
+        self.count += 1
+        if self.names is not None:
+            self.names.append(name)
+        return self.count
+
+    def name(self, pid):
+        return self.names[pid - 1]
+
+
+def stream_requests_from_csv(filepath, passenger_ids=None):
+    """Lazily yield requests from a CSV already sorted by time.
+
+    Rows are parsed one at a time, so memory doesn't grow with file
+    length. Raises ValueError on the first out-of-order row rather than
+    sorting; use load_requests_from_csv for unsorted files.
+
+    Args:
+        filepath (str): path to requests CSV with header row
+        passenger_ids (PassengerIds): optional interner for passenger IDs
+
+    Yields:
+        Tuple[int, str | int, int, int]: time, ID, source, dest
+    """
+    with open(filepath, newline="") as file:
+        reader = csv.reader(file)
+        next(reader)  # Skip single row header
+        last_time = -math.inf
+        for row in reader:
+            time = int(row[0])
+            if time < last_time:
+                raise ValueError(
+                    f"{filepath} is not sorted by time at line {reader.line_num}"
+                )
+            last_time = time
+            pid = passenger_ids(row[1]) if passenger_ids else row[1]
+            yield time, pid, int(row[2]), int(row[3])
+
+
+def stream_requests_from_shards(filepaths, passenger_ids=None):
+    """Lazily k-way merge requests from several time-sorted CSV shards.
+
+    Requests with equal times keep shard order, then row order.
+    """
+    streams = [stream_requests_from_csv(path, passenger_ids) for path in filepaths]
+    return heapq.merge(*streams, key=itemgetter(0))
+
+
+def stream_requests_from_binary(filepath, chunk_size=65536):
+    """Lazily yield requests from a binary requests file.
+
+    Such files come from `request_generator --binary`, already sorted by
+    time and with integer passenger IDs. The file is memory-mapped and
+    converted chunk_size records at a time.
+    """
+    records = read_requests_binary(filepath)
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start : start + chunk_size]
+        yield from zip(
+            chunk["time"].tolist(),
+            chunk["pid"].tolist(),
+            chunk["source"].tolist(),
+            chunk["dest"].tolist(),
+        )
+
+
+class RequestColumns:
+    """Requests stored column-wise in compact typed arrays.
+
+    Needs integer passenger IDs (see PassengerIds). Each request costs
+    24 bytes (8-byte times and IDs, 4-byte floors) instead of a tuple, an
+    ID string, and four int objects.
+    Iterates as request tuples, so it can be passed to run_simulation.
+    """
+
+    def __init__(self, requests=()):
+        self.times = array("q")
+        self.pids = array("q")
+        self.sources = array("i")
+        self.dests = array("i")
+        self.extend(requests)
+
+    def extend(self, requests):
+        for time, pid, source, dest in requests:
+            self.times.append(time)
+            self.pids.append(pid)
+            self.sources.append(source)
+            self.dests.append(dest)
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        return zip(self.times, self.pids, self.sources, self.dests)
+
+
+class PassengerTimes(MutableMapping):
+    """Times keyed by dense integer passenger ID, in a typed array.
+
+    Stands in for the passenger time dicts of `Building` (see its
+    compact option), which outlive the passengers. Each costs 8 bytes
+    instead of a dict entry, an ID string, and an int object. IDs must
+    be integers from 1 up without large gaps (e.g., from PassengerIds),
+    and times 0 or more.
+    """
+
+    __slots__ = ("times", "count")
+
+    def __init__(self):
+        self.times = array("q")  # Indexed by passenger ID, MISSING if none
+        self.count = 0
+
+    def __getitem__(self, pid):
+        try:
+            time = self.times[pid] if pid >= 0 else MISSING
+        except (IndexError, TypeError):
+            raise KeyError(pid) from None
+        if time == MISSING:
+            raise KeyError(pid)
+        return time
+
+    def __setitem__(self, pid, time):
+        if pid < 0:
+            raise KeyError(pid)
+        if pid >= len(self.times):
+            # IDs arrive in order, so grow by an eighth like list does
+            size = max(pid + 1, len(self.times) + (len(self.times) >> 3) + 1024)
+            self.times.extend(array("q", [MISSING]) * (size - len(self.times)))
+        if self.times[pid] == MISSING:
+            self.count += 1
+        self.times[pid] = time
+
+    def __delitem__(self, pid):
+        self[pid]  # Raises KeyError if missing
+        self.times[pid] = MISSING
+        self.count -= 1
+
+    def __iter__(self):
+        return (pid for pid, time in enumerate(self.times) if time != MISSING)
+
+    def __len__(self):
+        return self.count
+
+    def values(self):
+        return [time for time in self.times if time != MISSING]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run Orrery elevator simulation.",
@@ -235,34 +845,264 @@ def main():
         "-s",
         "--strategy",
         type=str,
-        choices=[
-            "random",
-            "available",
-            "nearest",
-        ],
+        choices=list(STRATEGIES),
+        help="Elevator assignment strategy (default nearest)",
+    )
+    parser.add_argument(
+        "-m",
+        "--movement",
+        type=str,
+        choices=MOVEMENTS,
         default="nearest",
-        help="Elevator assignment strategy",
+        help="Elevator movement rule between target floors",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Assign each tick's calls jointly by min-cost matching, not by strategy",
+    )
+    parser.add_argument(
+        "--decision-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Wall-clock budget per assignment, falling back after overruns",
+    )
+    parser.add_argument(
+        "--fallback",
+        type=str,
+        choices=list(STRATEGIES),
+        default="nearest",
+        help="Strategy deciding after the main strategy overruns its budget",
+    )
+    parser.add_argument(
+        "--cooldown",
+        type=int,
+        default=100,
+        help="Assignments left to the fallback after each overrun",
+    )
+    parser.add_argument(
+        "-r",
+        "--requests",
+        type=str,
+        help="Path to requests CSV, or binary requests file ending in .bin",
+    )
+    parser.add_argument(
+        "--generate",
+        type=int,
+        metavar="DURATION",
+        help="Generate requests on the fly for DURATION instead of reading a file",
+    )
+    parser.add_argument(
+        "--arrivingevery",
+        type=float,
+        default=1.0,
+        help="Mean time between generated hall calls",
+    )
+    parser.add_argument(
+        "--schedule",
+        type=parse_schedule,
+        nargs="+",
+        metavar="START:EVERY",
+        help="Time-varying mean time between generated hall calls from each START",
+    )
+    parser.add_argument(
+        "--period",
+        type=int,
+        help="Repeat the arrival schedule every PERIOD (e.g., 86400 for daily)",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for generated requests")
+    parser.add_argument(
+        "--snapshot-every",
+        type=int,
+        metavar="TICKS",
+        help="Save a snapshot of the building every TICKS simulated ticks",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=str,
+        default="snapshots",
+        help="Directory for snapshot_<time>.pkl files",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="SNAPSHOT",
+        help="Resume from a snapshot file, with the same requests options",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream requests from CSV already sorted by time, with integer IDs",
+    )
+    parser.add_argument(
+        "--compact-states",
+        action="store_true",
+        help="Record only elevator floor changes instead of every tick",
+    )
+    parser.add_argument(
+        "--binary-states",
+        type=str,
+        metavar="PATH",
+        help="Write elevator states to a binary state trace instead of CSV",
+    )
+    parser.add_argument(
+        "--streaming-stats",
+        action="store_true",
+        help="Report percentiles and SLAs in constant memory per passenger",
+    )
+    parser.add_argument(
+        "--compact-passengers",
+        action="store_true",
+        help="Keep passenger times in typed arrays indexed by integer ID",
+    )
+    parser.add_argument(
+        "--event-driven",
+        action="store_true",
+        help="Skip quiet ticks between events instead of ticking every step",
+    )
+    parser.add_argument(
+        "--event-trace",
+        type=str,
+        metavar="PATH",
+        help="Record binary move, boarding, and unload events, saved to PATH",
+    )
+    parser.add_argument(
+        "--event-trace-size",
+        type=int,
+        default=1 << 20,
+        help="Latest events kept by --event-trace",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="PATH",
+        help="Time simulation phases and strategy decisions, saving them as JSON",
     )
-    parser.add_argument("-r", "--requests", type=str, help="Path to requests CSV")
     args = parser.parse_args()
+    # Configured here rather than at import, so importing never writes logs
+    logging.basicConfig(
+        format="%(asctime)s : %(levelname)s : %(message)s",
+        level=logging.INFO,
+        filename=LOG_FILE,
+    )
     logging.debug(f"Arguments parsed: {args}")
 
-    strategy_mapping = {
-        "random": random_choice,
-        "available": random_available,
-        "nearest": nearest_available,
-    }
+    if args.requests is None and args.generate is None:
+        parser.error("Give a requests file with -r or generate them with --generate")
+    if args.requests is not None and args.generate is not None:
+        parser.error("-r and --generate are mutually exclusive")
+    if args.batch and (args.strategy or args.decision_budget is not None):
+        parser.error("--batch assigns calls itself; drop --strategy and its options")
+    args.strategy = args.strategy or "nearest"
+    if args.period is not None and not args.schedule:
+        parser.error("--period repeats a --schedule, which is missing")
+    if args.binary_states and (args.snapshot_every or args.resume):
+        parser.error("Binary state traces can't be snapshot; use --compact-states")
+    if args.profile and (args.snapshot_every or args.resume):
+        parser.error("Profiled runs can't be snapshot or resumed; drop --profile")
+    if args.generate is not None and args.seed is None and args.snapshot_every:
+        parser.error("Resuming generated requests needs --seed")
+    integer_ids = (
+        args.generate is not None or args.stream or args.requests.endswith(".bin")
+    )
+    if args.compact_passengers and not integer_ids:
+        parser.error("--compact-passengers needs --stream, --generate, or .bin")
+
+    strategy_func = make_strategy(args.strategy)
+    if args.decision_budget is not None:
+        strategy_func = DeadlineDispatcher(
+            strategy_func,
+            make_strategy(args.fallback),
+            args.decision_budget,
+            args.cooldown,
+        )
 
-    strategy_func = strategy_mapping[args.strategy]
+    if args.binary_states:
+        state_log = StateTraceWriter(args.binary_states)
+    elif args.compact_states:
+        state_log = CompactStateLog()
+    else:
+        state_log = None
+    if args.resume:
+        with open(args.resume, "rb") as file:
+            building = Building.restore(file.read())
+    else:
+        building = Building(
+            args.floors,
+            args.elevators,
+            args.capacity,
+            strategy_func,
+            state_log,
+            stats=PassengerStats() if args.streaming_stats else None,
+            keep_passenger_times=not args.streaming_stats,
+            movement=args.movement,
+            profile=PhaseProfile(args.profile) if args.profile else None,
+            compact=args.compact_passengers,
+            batch_strategy=BatchMatcher() if args.batch else None,
+        )
 
-    building = Building(args.floors, args.elevators, args.capacity, strategy_func)
+    def open_requests():
+        """Return the requests from the start; resuming skips those done."""
+        if args.generate is not None:
+            if args.schedule:
+                chunks = generate_scheduled_chunks(
+                    args.generate,
+                    args.floors,
+                    args.schedule,
+                    args.seed,
+                    period=args.period,
+                )
+            else:
+                chunks = generate_hall_call_chunks(
+                    args.generate, args.floors, args.arrivingevery, args.seed
+                )
+            return stream_requests(chunks)
+        if args.requests.endswith(".bin"):
+            return stream_requests_from_binary(args.requests)
+        if args.stream:
+            return stream_requests_from_csv(args.requests, PassengerIds())
+        return load_requests_from_csv(args.requests)
 
-    requests = load_requests_from_csv(args.requests)
-    building.run_simulation(requests)
+    if args.generate is not None:
+        seed_string = "" if args.seed is None else f"_seed{args.seed}"
+        requests_name = f"generated_{args.floors}{seed_string}.csv"
+    elif args.requests.endswith(".bin"):
+        requests_name = args.requests[: -len(".bin")] + ".csv"
+    else:
+        requests_name = args.requests
+    if args.event_trace and building.event_trace is None:
+        # A resumed building keeps the trace it was snapshot with, if any
+        building.event_trace = EventTrace(args.event_trace_size)
+    try:
+        # Opened once: pausing for snapshots keeps reading where it was
+        requests = open_requests()
+        if args.snapshot_every:
+            os.makedirs(args.snapshot_dir, exist_ok=True)
+            until = (building.current_time or 0) + args.snapshot_every
+            while not building.run_simulation(
+                requests, event_driven=args.event_driven, until=until
+            ):
+                filepath = os.path.join(
+                    args.snapshot_dir, f"snapshot_{building.current_time}.pkl"
+                )
+                with open(filepath, "wb") as file:
+                    file.write(building.snapshot())
+                until += args.snapshot_every
+        else:
+            building.run_simulation(requests, event_driven=args.event_driven)
+    finally:
+        # Saved even if the run fails, to debug what led up to it
+        if args.event_trace:
+            building.event_trace.save(args.event_trace)
+    if args.binary_states:
+        state_log.close()
+        return
+    strategy_name = "batch" if args.batch else args.strategy
     building.output_elevator_states_to_csv(
-        f"elevator_states__{args.strategy}__{args.requests}"
+        f"elevator_states__{strategy_name}__{requests_name}"
     )
 
 
 if __name__ == "__main__":
-    main()
+    # Hand over to orrery.__main__, which runs main from the importable module
+    runpy.run_module("orrery", run_name="__main__")
@@ -0,0 +1,272 @@
+"""Binary columnar elevator state traces.
+
+Writing one CSV row per (time, elevator) is slow and bulky for long
+runs. A state trace instead stores a small fixed header followed by a
+(ticks, elevators) matrix of floors as raw fixed-width integers, written
+in bulk chunks during the run. Time is implicit: row i is tick
+start_time + i.
+
+`StateTraceWriter` stands in for `Building.state_log`, and `StateTrace`
+memory-maps a finished trace so time-window and per-elevator slices are
+zero-copy views. `StateTrace.to_csv` converts back to the CSV layout of
+`Building.output_elevator_states_to_csv`.
+
+    python -m orrery.state_trace elevator_states.trace elevator_states.csv
+"""
+
+import argparse
+import csv
+
+import numpy as np
+
+MAGIC = b"ORRSTATE"
+VERSION = 1
+HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u2"),
+        ("floor_dtype", "S2"),  # e.g., b"i2" for little-endian int16
+        ("num_elevators", "<u4"),
+        ("start_time", "<i8"),
+        ("num_ticks", "<i8"),  # Advisory, patched on close
+    ]
+)
+DATA_ALIGNMENT = 64
+START_FLOOR = 1  # Of every elevator (see simulator.Elevator)
+
+
+def data_offset(num_elevators):
+    """Byte offset of floor data after the header and elevator IDs."""
+    offset = HEADER.itemsize + 4 * num_elevators
+    return -(-offset // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+
+class StateTraceWriter:
+    """Write elevator floors per tick to a binary state trace.
+
+    Accepts the same `writer[time] = {elevator ID: floor}` assignments as
+    the dict log in `Building`, buffering chunk_ticks rows before each
+    write. Ticks must be consecutive; re-recording the latest tick
+    overwrites it. Call close() (or use as a context manager) to flush.
+    """
+
+    def __init__(self, filepath, floor_dtype="<i2", chunk_ticks=4096):
+        self.filepath = filepath
+        self.floor_dtype = np.dtype(floor_dtype)
+        self.chunk_ticks = chunk_ticks
+        self.file = open(filepath, "wb")
+        self.elevator_ids = None
+        self.start_time = None
+        self.end_time = None
+        self.buffer = None
+        self.buffered = 0  # Rows of buffer in use
+        self.written = 0  # Rows flushed to file
+
+    def __setitem__(self, time, elevator_states):
+        if self.elevator_ids is None:
+            self.start(time, list(elevator_states))
+        if time == self.end_time:
+            self.buffered -= 1  # Overwrite latest tick, always still buffered
+        elif time != self.end_time + 1:
+            raise ValueError(f"Tick {time} recorded after tick {self.end_time}")
+        elif self.buffered == self.chunk_ticks:
+            self.flush()
+        row = self.buffer[self.buffered]
+        for i, elevator_id in enumerate(self.elevator_ids):
+            row[i] = elevator_states[elevator_id]
+        self.buffered += 1
+        self.end_time = time
+
+    def start(self, time, elevator_ids):
+        self.elevator_ids = elevator_ids
+        self.start_time = time
+        self.end_time = time - 1
+        self.buffer = np.empty(
+            (self.chunk_ticks, len(elevator_ids)), dtype=self.floor_dtype
+        )
+        self.write_header()
+        ids = np.asarray(elevator_ids, dtype="<i4")
+        self.file.write(ids.tobytes())
+        self.file.write(b"\0" * (data_offset(len(ids)) - self.file.tell()))
+
+    def write_header(self):
+        header = np.zeros((), dtype=HEADER)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["floor_dtype"] = self.floor_dtype.str[1:].encode()
+        header["num_elevators"] = len(self.elevator_ids)
+        header["start_time"] = self.start_time
+        header["num_ticks"] = self.written + self.buffered
+        self.file.write(header.tobytes())
+
+    def flush(self):
+        self.file.write(self.buffer[: self.buffered].tobytes())
+        self.written += self.buffered
+        self.buffered = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.elevator_ids is not None:
+            self.flush()
+            self.file.seek(0)
+            self.write_header()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.written + self.buffered
+
+    def rows(self):
+        """Close the trace and lazily read it back as CSV rows."""
+        self.close()
+        return StateTrace(self.filepath).rows()
+
+
+class StateTrace:
+    """Memory-mapped reader for binary state traces.
+
+    `floors` is a read-only (ticks, elevators) memmap; window() and
+    elevator() return views into it without copying. The tick count is
+    taken from the file size, so a trace cut short (e.g., by a crash)
+    still reads up to its last complete row.
+    """
+
+    def __init__(self, filepath):
+        header = np.fromfile(filepath, dtype=HEADER, count=1)
+        if len(header) == 0 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{filepath} is not an Orrery state trace")
+        if header["version"][0] != VERSION:
+            version = header["version"][0]
+            raise ValueError(f"Unsupported state trace version {version}")
+        num_elevators = int(header["num_elevators"][0])
+        dtype = np.dtype("<" + header["floor_dtype"][0].decode())
+        offset = data_offset(num_elevators)
+        self.start_time = int(header["start_time"][0])
+        self.elevator_ids = np.fromfile(
+            filepath, dtype="<i4", count=num_elevators, offset=HEADER.itemsize
+        ).tolist()
+        self.columns = {e: i for i, e in enumerate(self.elevator_ids)}
+        with open(filepath, "rb") as file:
+            file_size = file.seek(0, 2)
+        row_bytes = dtype.itemsize * num_elevators
+        num_ticks = (file_size - offset) // row_bytes if row_bytes else 0
+        if num_ticks > 0:
+            self.floors = np.memmap(
+                filepath,
+                dtype=dtype,
+                mode="r",
+                offset=offset,
+                shape=(num_ticks, num_elevators),
+            )
+        else:
+            self.floors = np.empty((0, num_elevators), dtype=dtype)
+
+    def __len__(self):
+        return len(self.floors)
+
+    @property
+    def end_time(self):
+        return self.start_time + len(self.floors) - 1
+
+    @property
+    def times(self):
+        return np.arange(self.start_time, self.start_time + len(self.floors))
+
+    def window(self, start, stop):
+        """Floors of all elevators for ticks in [start, stop), zero-copy."""
+        return self.floors[
+            max(start - self.start_time, 0) : max(stop - self.start_time, 0)
+        ]
+
+    def elevator(self, elevator_id):
+        """Floors of one elevator across all ticks, zero-copy."""
+        return self.floors[:, self.columns[elevator_id]]
+
+    def floor_at(self, elevator_id, time):
+        if not self.start_time <= time <= self.end_time:
+            raise KeyError(time)
+        return int(self.floors[time - self.start_time, self.columns[elevator_id]])
+
+    def rows(self, chunk_ticks=4096):
+        """Lazily yield (time, elevator ID, floor) rows in CSV order."""
+        for times, elevator_ids, floors in self.row_chunks(chunk_ticks):
+            yield from zip(times, elevator_ids, floors)
+
+    def row_chunks(self, chunk_ticks=4096):
+        """Yield (times, elevator IDs, floors) row lists, chunk by chunk."""
+        ids = np.asarray(self.elevator_ids)
+        for first in range(0, len(self.floors), chunk_ticks):
+            chunk = self.floors[first : first + chunk_ticks]
+            ticks = self.start_time + first + np.arange(len(chunk))
+            times = np.repeat(ticks, len(ids))
+            yield (
+                times.tolist(),
+                np.tile(ids, len(chunk)).tolist(),
+                chunk.ravel().tolist(),
+            )
+
+    def to_csv(self, filename):
+        """Write the trace in the elevator states CSV layout."""
+        with open(filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["time", "elevator_id", "current_floor"])
+            for times, elevator_ids, floors in self.row_chunks():
+                writer.writerows(zip(times, elevator_ids, floors))
+
+
+def merge_traces(filepaths, output, elevator_ids=None, chunk_ticks=4096):
+    """Write the traces side by side as one trace of all their elevators.
+
+    Traces with ticks must share a start time. Those ending early are
+    padded with their last row (their elevators idle where they
+    stopped), and those without ticks with elevators at their start
+    floor. Elevator IDs are those of the traces in order unless given,
+    e.g. renumbered to stay unique across traces.
+    """
+    traces = [StateTrace(filepath) for filepath in filepaths]
+    start_times = {trace.start_time for trace in traces if len(trace)}
+    if len(start_times) > 1:
+        raise ValueError("Can only merge traces with the same start time")
+    start_time = start_times.pop() if start_times else traces[0].start_time
+    if elevator_ids is None:
+        elevator_ids = [e for trace in traces for e in trace.elevator_ids]
+    dtype = np.result_type(*(trace.floors.dtype for trace in traces))
+    num_ticks = max(len(trace) for trace in traces)
+    with StateTraceWriter(output, dtype.str, chunk_ticks) as writer:
+        writer.start(start_time, list(elevator_ids))
+        for first in range(0, num_ticks, chunk_ticks):
+            stop = min(first + chunk_ticks, num_ticks)
+            block = np.empty((stop - first, len(elevator_ids)), dtype=dtype)
+            column = 0
+            for trace in traces:
+                columns = slice(column, column + len(trace.elevator_ids))
+                rows = trace.floors[first:stop]
+                block[: len(rows), columns] = rows
+                block[len(rows) :, columns] = (
+                    trace.floors[-1] if len(trace) else START_FLOOR
+                )
+                column = columns.stop
+            writer.file.write(block.tobytes())
+            writer.written += len(block)
+            writer.end_time = writer.start_time + writer.written - 1
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a binary elevator state trace to CSV.",
+    )
+    parser.add_argument("trace", type=str, help="Path to binary state trace")
+    parser.add_argument("csv", type=str, help="Path to output CSV")
+    args = parser.parse_args()
+    StateTrace(args.trace).to_csv(args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compact elevator state logs.
+
+`Building.state_log` defaults to a dict holding every elevator's floor at
+every tick, which grows as ticks × elevators even while cars sit idle.
+`CompactStateLog` is a drop-in replacement that only stores the ticks at
+which each elevator changes floor, in typed array columns.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+
+class CompactStateLog(Mapping):
+    """Run-length encoded elevator floors over time.
+
+    Each elevator has a column of change times and a column of the floor
+    it holds from that time on, so a car idling for hours costs nothing.
+    Behaves as a read-only mapping of time to {elevator ID: floor}, plus
+    item assignment for recording the next tick, so it can stand in for
+    the dict log in `Building`.
+
+    Ticks must be recorded in order; re-recording the latest tick
+    overwrites it.
+    """
+
+    def __init__(self):
+        self.elevator_ids = []
+        self.change_times = {}  # Maps elevator ID to array of change times
+        self.change_floors = {}  # Maps elevator ID to array of floors held
+        self.start_time = None
+        self.end_time = None
+
+    def __setitem__(self, time, elevator_states):
+        if self.end_time is not None and time < self.end_time:
+            raise ValueError(f"Tick {time} recorded after tick {self.end_time}")
+        if self.start_time is None:
+            self.start_time = time
+        for elevator_id, floor in elevator_states.items():
+            times = self.change_times.get(elevator_id)
+            if times is None:
+                self.elevator_ids.append(elevator_id)
+                times = self.change_times[elevator_id] = array("q")
+                self.change_floors[elevator_id] = array("l")
+            floors = self.change_floors[elevator_id]
+            if times and times[-1] == time:
+                # Overwrite the latest tick, dropping a now redundant change
+                times.pop()
+                floors.pop()
+            if not floors or floors[-1] != floor:
+                times.append(time)
+                floors.append(floor)
+        self.end_time = time
+
+    def floor_at(self, elevator_id, time):
+        """Return floor of elevator at time via binary search."""
+        if time not in self:
+            raise KeyError(time)
+        times = self.change_times[elevator_id]
+        run = bisect_right(times, time) - 1
+        if run < 0:
+            raise KeyError(time)
+        return self.change_floors[elevator_id][run]
+
+    def __getitem__(self, time):
+        if time not in self:
+            raise KeyError(time)
+        return {
+            elevator_id: self.floor_at(elevator_id, time)
+            for elevator_id in self.elevator_ids
+        }
+
+    def __contains__(self, time):
+        return self.start_time is not None and self.start_time <= time <= self.end_time
+
+    def __len__(self):
+        if self.start_time is None:
+            return 0
+        return self.end_time - self.start_time + 1
+
+    def __iter__(self):
+        if self.start_time is None:
+            return iter(())
+        return iter(range(self.start_time, self.end_time + 1))
+
+    def items(self):
+        """Lazily expand runs into (time, {elevator ID: floor}) in order."""
+        elevator_ids = self.elevator_ids
+        for time, floors in self.iter_floors():
+            yield time, dict(zip(elevator_ids, floors))
+
+    def iter_floors(self):
+        """Lazily expand runs into (time, [floor per elevator]) in order.
+
+        Walks each elevator's runs with a cursor instead of searching,
+        so a full expansion is linear in ticks × elevators. The floors
+        list is reused between ticks; copy it to keep it.
+        """
+        cursors = [0] * len(self.elevator_ids)
+        columns = [
+            (self.change_times[e], self.change_floors[e]) for e in self.elevator_ids
+        ]
+        floors = [None] * len(self.elevator_ids)
+        for time in self:
+            for i, (times, held) in enumerate(columns):
+                cursor = cursors[i]
+                while cursor < len(times) and times[cursor] <= time:
+                    floors[i] = held[cursor]
+                    cursor += 1
+                cursors[i] = cursor
+            yield time, floors
+
+    def rows(self):
+        """Lazily yield (time, elevator ID, floor) rows as written to CSV."""
+        elevator_ids = self.elevator_ids
+        for time, floors in self.iter_floors():
+            for elevator_id, floor in zip(elevator_ids, floors):
+                yield time, elevator_id, floor
+
+    def changes(self):
+        """Return the number of stored runs across all elevators."""
+        return sum(len(times) for times in self.change_times.values())
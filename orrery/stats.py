@@ -0,0 +1,195 @@
+"""Bounded-memory streaming passenger statistics.
+
+Keeping every passenger's wait and travel time grows with the run. Times
+here are whole ticks, so fixed-width histogram bins give exact quantiles
+below a cap in constant memory; only the overflow beyond the cap is
+approximated (by the largest time seen).
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+# Met if at least share of the metric's times are below limit, or at most
+# limit if not strict
+ServiceLevel = namedtuple(
+    "ServiceLevel",
+    ["description", "metric", "limit", "share", "strict"],
+    defaults=[True],
+)
+
+# Excellent wait SLA from README product requirements (1 tick ≣ 1 second)
+WAIT_SLAS = [
+    ServiceLevel("98% of waits < 60", "wait", 60, 0.98),
+    ServiceLevel("75% of waits < 30", "wait", 30, 0.75),
+]
+TIME_TO_DESTINATION_LIMIT = 100
+# Satisfactory time-to-destination SLA: every passenger within the limit
+TIME_TO_DESTINATION_SLA = ServiceLevel(
+    f"100% of times to destination ≤ {TIME_TO_DESTINATION_LIMIT}",
+    "total",
+    TIME_TO_DESTINATION_LIMIT,
+    1.0,
+    strict=False,
+)
+SLAS = WAIT_SLAS + [TIME_TO_DESTINATION_SLA]
+
+PERCENTILES = [50, 75, 95, 98]
+
+
+class TimeHistogram:
+    """Streaming histogram of non-negative integer times.
+
+    Bins are bin_width ticks wide up to max_value, plus one overflow bin.
+    With the default unit width, quantiles and threshold shares are exact
+    for times below max_value.
+    """
+
+    def __init__(self, max_value=3600, bin_width=1):
+        self.bin_width = bin_width
+        self.num_bins = -(-max_value // bin_width)
+        self.counts = array("q", [0] * (self.num_bins + 1))
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.counts[min(value // self.bin_width, self.num_bins)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add the times of another histogram with the same bins."""
+        if (other.bin_width, other.num_bins) != (self.bin_width, self.num_bins):
+            raise ValueError("Can only merge histograms with the same bins")
+        for index, bin_count in enumerate(other.counts):
+            self.counts[index] += bin_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q):
+        """Return lower bound of the bin holding the q-quantile (0 < q ≤ 1).
+
+        Uses the nearest-rank definition. Quantiles landing in the
+        overflow bin are reported as the largest time seen.
+        """
+        if not self.count:
+            return math.nan
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bin_count in enumerate(self.counts):
+            seen += bin_count
+            if seen >= rank:
+                if index == self.num_bins:
+                    return self.max
+                return max(index * self.bin_width, self.min)
+        return self.max
+
+    def share_below(self, limit):
+        """Return share of times strictly below limit (limit on a bin edge)."""
+        if not self.count:
+            return math.nan
+        bins_below = min(limit // self.bin_width, self.num_bins)
+        return sum(self.counts[:bins_below]) / self.count
+
+    def share_at_most(self, limit):
+        return self.share_below(limit + 1)
+
+
+class PassengerStats:
+    """Streaming wait, travel, and time-to-destination statistics.
+
+    Updated once per passenger as they unload, so memory stays constant
+    however many passengers a run serves.
+    """
+
+    def __init__(self, max_value=3600, bin_width=1):
+        self.wait = TimeHistogram(max_value, bin_width)
+        self.travel = TimeHistogram(max_value, bin_width)
+        self.total = TimeHistogram(2 * max_value, bin_width)
+
+    def record(self, wait_time, travel_time):
+        self.wait.add(wait_time)
+        self.travel.add(travel_time)
+        self.total.add(wait_time + travel_time)
+
+    def merge(self, other):
+        """Add the passengers of another PassengerStats (e.g., a shard's)."""
+        for metric, histogram in self.histograms().items():
+            histogram.merge(other.histograms()[metric])
+
+    @property
+    def passengers(self):
+        return self.wait.count
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """Return {metric: {percentile: time}} for wait, travel, and total."""
+        return {
+            metric: {p: histogram.quantile(p / 100) for p in percentiles}
+            for metric, histogram in self.histograms().items()
+        }
+
+    def histograms(self):
+        return {"wait": self.wait, "travel": self.travel, "total": self.total}
+
+    def achieved(self, sla):
+        """Return share of passengers meeting the service level's limit."""
+        histogram = self.histograms()[sla.metric]
+        if sla.strict:
+            return histogram.share_below(sla.limit)
+        return histogram.share_at_most(sla.limit)
+
+    def sla_report(self):
+        """Return (description, achieved, target, passed) per service level.
+
+        Each SLA is judged by the share of passengers within its limit.
+        """
+        report = []
+        for sla in SLAS:
+            achieved = self.achieved(sla)
+            report.append((sla.description, achieved, sla.share, achieved >= sla.share))
+        return report
+
+    def summary(self):
+        """Return flat KPI dict, including percentiles and SLA shares.
+
+        Min and max times of a run without passengers are NaN, like means.
+        """
+        summary = {"passengers": self.passengers}
+        for metric, histogram in self.histograms().items():
+            summary[f"min_{metric}"] = histogram.min if histogram.count else math.nan
+            summary[f"max_{metric}"] = histogram.max if histogram.count else math.nan
+            summary[f"mean_{metric}"] = histogram.mean
+            for p in PERCENTILES:
+                summary[f"p{p}_{metric}"] = histogram.quantile(p / 100)
+        for sla in SLAS:
+            relation = "under" if sla.strict else "at_most"
+            summary[f"{sla.metric}_{relation}_{sla.limit}"] = self.achieved(sla)
+        return summary
+
+    def print_report(self):
+        if not self.passengers:
+            print("No passengers delivered: times and SLAs n/a")
+            return
+        for metric, histogram in self.histograms().items():
+            quantiles = ", ".join(
+                f"P{p}: {histogram.quantile(p / 100)}" for p in PERCENTILES
+            )
+            print(
+                f"{metric.title()} Times - Min: {histogram.min}, "
+                f"Max: {histogram.max}, Mean: {histogram.mean:.2f}, {quantiles}"
+            )
+        for description, achieved, target, passed in self.sla_report():
+            verdict = "PASS" if passed else "FAIL"
+            print(f"SLA {description}: {achieved:.2%} (target {target:.0%}) {verdict}")
@@ -0,0 +1,170 @@
+"""Parameter sweeps over building configs, backed by the result cache.
+
+Plans the grid of request files × floors × elevators × capacities ×
+strategies, looks every point up in a `result_cache.ResultCache`, and
+only simulates the points that miss, across worker processes. Results
+of the whole grid are then printed from the cache.
+
+    python -m orrery.sweep -r requests_20_seed42.csv -f 20 -e 4 8 -c 8 \
+        -s nearest bestinsert --cache-dir .orrery_cache
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from orrery.result_cache import ResultCache, cache_key, file_digest
+from orrery.simulator import (
+    MOVEMENTS,
+    STRATEGIES,
+    Building,
+    load_requests_from_csv,
+    make_strategy,
+)
+from orrery.state_trace import StateTraceWriter
+
+SweepPoint = namedtuple(
+    "SweepPoint",
+    ["requests", "floors", "elevators", "capacity", "strategy", "movement", "seed"],
+)
+
+
+def point_config(point):
+    """Config dict of everything but the strategy and request contents."""
+    return {
+        "floors": point.floors,
+        "elevators": point.elevators,
+        "capacity": point.capacity,
+        "strategy": point.strategy,
+        "movement": point.movement,
+        "seed": point.seed,
+    }
+
+
+def plan_points(requests, floors, elevators, capacities, strategies, movement, seed):
+    return [
+        SweepPoint(*point, movement, seed)
+        for point in product(requests, floors, elevators, capacities, strategies)
+    ]
+
+
+def point_keys(points):
+    """Return cache key per point, hashing each request file once."""
+    digests = {path: file_digest(path) for path in {p.requests for p in points}}
+    return [
+        cache_key(point_config(p), make_strategy(p.strategy), digests[p.requests])
+        for p in points
+    ]
+
+
+def run_point(point, trace_directory=None):
+    """Simulate one point, returning (summary, state trace path or None).
+
+    The random module is seeded per point, so random strategies are
+    reproducible and their cached results stay valid. The reoptimizer's
+    results depend on its time budget, so its cached results are those
+    of the machine that first ran the point.
+    """
+    random.seed(point.seed)
+    trace_path = None
+    state_log = None
+    if trace_directory is not None:
+        handle, trace_path = tempfile.mkstemp(dir=trace_directory, suffix=".trace")
+        os.close(handle)
+        state_log = StateTraceWriter(trace_path)
+    building = Building(
+        point.floors,
+        point.elevators,
+        point.capacity,
+        make_strategy(point.strategy),
+        state_log,
+        movement=point.movement,
+    )
+    building.run_simulation(load_requests_from_csv(point.requests), report=False)
+    if state_log is not None:
+        state_log.close()
+    return building.summary_statistics(), trace_path
+
+
+def run_sweep(points, cache, traces=False, max_workers=None):
+    """Return {point: summary}, simulating only points missing in cache."""
+    keys = point_keys(points)
+    missing = [(p, key) for p, key in zip(points, keys) if key not in cache]
+    print(f"{len(points) - len(missing)} of {len(points)} points cached")
+    if missing:
+        trace_directory = cache.directory if traces else None
+        max_workers = min(max_workers or os.cpu_count(), len(missing))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                run_point,
+                [p for p, _ in missing],
+                [trace_directory] * len(missing),
+            )
+            for (point, key), (summary, trace_path) in zip(missing, results):
+                cache.put(key, summary, point_config(point), trace_path)
+                if trace_path is not None:
+                    os.remove(trace_path)
+    # Eviction may have dropped earlier points of a sweep too big to cache
+    results = {}
+    for point, key in zip(points, keys):
+        summary = cache.get(key)
+        if summary is None:
+            summary, _ = run_point(point)
+        results[point] = summary
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep building configs, only simulating uncached points.",
+    )
+    parser.add_argument("-r", "--requests", type=str, nargs="+", required=True)
+    parser.add_argument("-f", "--floors", type=int, nargs="+", required=True)
+    parser.add_argument("-e", "--elevators", type=int, nargs="+", required=True)
+    parser.add_argument("-c", "--capacity", type=int, nargs="+", required=True)
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGIES),
+        default=["random", "available", "nearest", "bestinsert"],
+    )
+    parser.add_argument("-m", "--movement", choices=MOVEMENTS, default="nearest")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for each point")
+    parser.add_argument("--cache-dir", type=str, default=".orrery_cache")
+    parser.add_argument(
+        "--max-cache-mb", type=float, default=1024, help="Cache size bound in MB"
+    )
+    parser.add_argument(
+        "--traces", action="store_true", help="Also cache compressed state traces"
+    )
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir, int(args.max_cache_mb * 2**20))
+    points = plan_points(
+        args.requests,
+        args.floors,
+        args.elevators,
+        args.capacity,
+        args.strategies,
+        args.movement,
+        args.seed,
+    )
+    results = run_sweep(points, cache, args.traces, args.workers)
+    for point, summary in results.items():
+        print(
+            f"{point.requests} {point.floors} floors, {point.elevators} elevators, "
+            f"capacity {point.capacity}, {point.strategy}: "
+            f"mean wait {summary['mean_wait']:.2f}, "
+            f"max wait {summary['max_wait']}, "
+            f"mean travel {summary['mean_travel']:.2f}, ticks {summary['ticks']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
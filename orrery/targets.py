@@ -0,0 +1,73 @@
+"""Ordered multisets of elevator target floors.
+
+A busy car in a tall building can have many passengers heading to the
+same few floors. `TargetFloors` keeps each distinct floor once, in
+sorted order, with a count of how many pickups or drop-offs it holds,
+so the nearest target above or below a floor is a binary search away
+instead of a scan over every scheduled stop.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+
+class TargetFloors:
+    """Sorted multiset of floors with nearest-above/below lookups.
+
+    Adding or removing a floor already present only updates its count;
+    otherwise the sorted list of distinct floors is searched by bisection
+    (and shifted, which is bounded by the number of floors in the
+    building). Iterates in ascending order, repeating floors by count.
+    """
+
+    def __init__(self, floors=()):
+        self.floors = []  # Distinct floors in ascending order
+        self.counts = {}  # Maps floor to number of pickups or drop-offs
+        self.size = 0
+        for floor in floors:
+            self.add(floor)
+
+    def add(self, floor):
+        count = self.counts.get(floor, 0)
+        if not count:
+            insort(self.floors, floor)
+        self.counts[floor] = count + 1
+        self.size += 1
+
+    def remove(self, floor):
+        """Remove one occurrence of floor, raising ValueError if absent."""
+        count = self.counts.get(floor, 0)
+        if not count:
+            raise ValueError(f"Floor {floor} not in targets")
+        if count == 1:
+            del self.counts[floor]
+            del self.floors[bisect_left(self.floors, floor)]
+        else:
+            self.counts[floor] = count - 1
+        self.size -= 1
+
+    def count(self, floor):
+        return self.counts.get(floor, 0)
+
+    def nearest_above(self, floor):
+        """Return lowest target strictly above floor, if any."""
+        index = bisect_right(self.floors, floor)
+        return self.floors[index] if index < len(self.floors) else None
+
+    def nearest_below(self, floor):
+        """Return highest target strictly below floor, if any."""
+        index = bisect_left(self.floors, floor)
+        return self.floors[index - 1] if index > 0 else None
+
+    def __contains__(self, floor):
+        return floor in self.counts
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for floor in self.floors:
+            for _ in range(self.counts[floor]):
+                yield floor
+
+    def __repr__(self):
+        return f"TargetFloors({list(self)})"
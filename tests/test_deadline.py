@@ -0,0 +1,75 @@
+import time
+
+from orrery.deadline import DeadlineDispatcher
+from orrery.request_generator import generate_hall_call_chunks, stream_requests
+from orrery.routes import best_insertion
+from orrery.simulator import Building, nearest_available
+
+# inputs
+
+
+def stress_requests(duration=2000):
+    """Near saturation: 30 floors, 6 cars, a call every 0.7 ticks."""
+    return list(stream_requests(generate_hall_call_chunks(duration, 30, 0.7, 3)))
+
+
+# helper functions
+
+
+def run(strategy, requests):
+    building = Building(30, 6, 8, strategy)
+    building.run_simulation(requests, event_driven=True, report=False)
+    return building
+
+
+def slow_routing_strategy(elevators, passenger_id, source_floor, dest_floor):
+    """Plans a route, then overruns any budget."""
+    elevator = best_insertion(elevators, passenger_id, source_floor, dest_floor)
+    time.sleep(5)
+    return elevator
+
+
+slow_routing_strategy.plans_routes = True
+
+
+# outputs
+
+
+def test_overrunning_decision_is_interrupted_and_discarded():
+    building = Building(10, 3, 8, nearest_available)
+    building.process_request(0, "a", 1, 5)
+    dispatcher = DeadlineDispatcher(slow_routing_strategy, nearest_available, 0.05)
+    routes = [list(e.route) for e in building.elevators]
+    start = time.perf_counter()
+    elevator = dispatcher(building.elevators, "b", 4, 9)
+    assert time.perf_counter() - start < 1
+    assert elevator is nearest_available(building.elevators, "b", 4, 9)
+    assert [list(e.route) for e in building.elevators] == routes
+    assert elevator.unrouted == {"b"}
+    summary = dispatcher.summary()
+    assert summary["overruns"] == summary["fallbacks"] == 1
+    assert dispatcher.tripped == dispatcher.cooldown
+
+
+def test_all_overruns_match_fallback_alone():
+    requests = stress_requests()
+    dispatcher = DeadlineDispatcher(best_insertion, nearest_available, 0.0, 1)
+    dispatched = run(dispatcher, requests)
+    fallback = run(nearest_available, requests)
+    assert dispatched.wait_times == fallback.wait_times
+    assert dispatched.travel_times == fallback.travel_times
+    assert dispatched.strategy.fallbacks == len(requests)
+
+
+def test_every_passenger_delivered_within_bound():
+    requests = stress_requests()
+    for budget in (0.0, 0.0002, 0.001):
+        building = run(
+            DeadlineDispatcher(best_insertion, nearest_available, budget, 5), requests
+        )
+        summary = building.summary_statistics()
+        assert summary["passengers"] == len(requests)
+        # Nearest available alone peaks at 300 ticks on these calls
+        assert summary["max_wait"] <= 400
+        assert summary["max_travel"] <= 400
+        assert not any(e.unrouted or e.route for e in building.elevators)
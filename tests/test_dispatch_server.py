@@ -0,0 +1,58 @@
+import asyncio
+import math
+
+from orrery.dispatch_client import replay
+from orrery.dispatch_server import DispatchServer, LatestStates
+from orrery.simulator import Building, nearest_available
+from orrery.stats import PassengerStats
+
+# helper functions
+
+
+def make_server():
+    building = Building(
+        10,
+        2,
+        8,
+        nearest_available,
+        state_log=LatestStates(),
+        stats=PassengerStats(),
+        keep_passenger_times=False,
+    )
+    return DispatchServer(building, tick=0.001)
+
+
+async def replay_against(server, requests, path):
+    await server.start(path=path)
+    try:
+        return await replay(requests, 1000, connections=2, path=path)
+    finally:
+        await server.stop()
+
+
+# outputs
+
+
+def test_numbered_calls_skip_ids_in_use():
+    server = make_server()
+    assert server.dispatch({"id": 1, "source": 1, "dest": 5})["id"] == 1
+    assert server.dispatch({"source": 2, "dest": 5})["id"] == 2
+    assert "error" in server.dispatch({"id": 2, "source": 3, "dest": 5})
+    assert server.dispatch({"source": 3, "dest": 5})["id"] == 3
+
+
+def test_replay_percentiles_within_latencies(tmp_path):
+    requests = [(t // 3, f"p{t}", 1 + t % 9, 10 - t % 9) for t in range(60)]
+    requests = [r for r in requests if r[2] != r[3]]
+    path = str(tmp_path / "dispatch.sock")
+    report = asyncio.run(replay_against(make_server(), requests, path))
+    assert report.calls == len(requests)
+    assert not report.errors
+    assert report.p50 <= report.p95 <= report.p99 <= report.max
+
+
+def test_replay_of_no_requests(tmp_path):
+    path = str(tmp_path / "dispatch.sock")
+    report = asyncio.run(replay_against(make_server(), [], path))
+    assert report.calls == 0
+    assert math.isnan(report.p95) and math.isnan(report.max)
@@ -0,0 +1,83 @@
+import random
+
+from orrery.elevator_index import ElevatorIndex, IndexedElevators
+from orrery.simulator import Elevator, nearest_available
+
+# helper functions
+
+
+def random_elevators(rng, count, floors=10):
+    """Elevators on few floors with few loads, so ties are common."""
+    elevators = []
+    for elevator_id in range(1, count + 1):
+        elevator = Elevator(elevator_id, 8)
+        elevator.current_floor = rng.randint(1, floors)
+        for passenger in range(rng.randint(0, 2)):
+            elevator.passengers[f"p{elevator_id}_{passenger}"] = 1
+        elevators.append(elevator)
+    return elevators
+
+
+# outputs
+
+
+def test_empty_index_has_no_nearest():
+    assert ElevatorIndex().nearest(5) is None
+
+
+def test_ties_on_load_and_id():
+    elevators = random_elevators(random.Random(0), 3)
+    for elevator in elevators:
+        elevator.current_floor = 4
+        elevator.passengers.clear()
+    elevators[0].passengers["p"] = 7
+    index = ElevatorIndex(elevators)
+    assert index.nearest(4) is elevators[1]  # Lighter than 1, lower ID than 3
+    assert index.nearest(9, max_load=0) is elevators[1]
+    elevators[2].current_floor = 6
+    index.update(elevators[2])
+    assert index.nearest(5) is elevators[1]  # Floors 4 and 6 tie on distance
+
+
+def test_nearest_matches_linear_strategy():
+    rng = random.Random(11)
+    for _ in range(500):
+        elevators = random_elevators(rng, rng.randint(1, 6))
+        index = ElevatorIndex(elevators)
+        for floor in range(1, 11):
+            assert index.nearest(floor) is nearest_available(elevators, "p", floor, 1)
+
+
+def test_nearest_with_max_load_skips_loaded_cars():
+    rng = random.Random(12)
+    for _ in range(500):
+        elevators = random_elevators(rng, rng.randint(1, 6))
+        index = ElevatorIndex(elevators)
+        light = [elevator for elevator in elevators if len(elevator.passengers) <= 1]
+        for floor in range(1, 11):
+            expected = nearest_available(light, "p", floor, 1) if light else None
+            assert index.nearest(floor, max_load=1) is expected
+
+
+def test_index_follows_moves_and_boarding():
+    rng = random.Random(13)
+    elevators = IndexedElevators(random_elevators(rng, 5))
+    plain = list(elevators)
+    for time in range(300):
+        elevator = rng.choice(elevators)
+        if rng.random() < 0.5:
+            elevator.target_floors.add(rng.randint(1, 10))
+            elevator.move()
+        elif elevator.passengers:
+            elevator.passengers.popitem()
+            elevators.positions.update(elevator)
+        else:
+            elevator.target_floors.add(elevator.current_floor)
+            elevator.load_passenger(f"q{time}", rng.randint(1, 10), time)
+        floor = rng.randint(1, 10)
+        assert nearest_available(elevators, "p", floor, 1) is nearest_available(
+            plain, "p", floor, 1
+        )
+        rank = rng.randrange(len(elevators))
+        by_load = sorted(plain, key=lambda e: len(e.passengers))
+        assert elevators.positions.by_load(rank) is by_load[rank]
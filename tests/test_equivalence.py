@@ -0,0 +1,72 @@
+"""Event-driven runs must match a plain tick-by-tick `Building` run exactly."""
+
+import random
+
+import pytest
+
+from orrery.matching import BatchMatcher
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.routes import best_insertion
+from orrery.simulator import (
+    Building,
+    nearest_available,
+    random_available,
+    random_choice,
+)
+
+# inputs
+
+FLOORS, ELEVATORS, CAPACITY = 20, 4, 6
+STRATEGIES = [nearest_available, random_available, random_choice, best_insertion]
+
+
+def requests(seed, arriving_every, duration=1000):
+    random.seed(seed)
+    return generate_requests(generate_hall_calls(duration, FLOORS, arriving_every))
+
+
+# Light to saturated traffic
+TRAFFIC = [(1, 15.0), (2, 3.0), (3, 1.0), (4, 0.6)]
+
+
+# helper functions
+
+
+def run(requests, strategy, event_driven):
+    random.seed(0)
+    building = Building(FLOORS, ELEVATORS, CAPACITY, strategy)
+    building.run_simulation(requests, event_driven=event_driven, report=False)
+    return building
+
+
+def outcome(building):
+    return dict(building.state_log), building.wait_times, building.travel_times
+
+
+# outputs
+
+
+@pytest.mark.parametrize("seed, arriving_every", TRAFFIC)
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: s.__name__)
+def test_event_driven_matches_ticking(strategy, seed, arriving_every):
+    calls = requests(seed, arriving_every)
+    ticking = run(calls, strategy, event_driven=False)
+    event_driven = run(calls, strategy, event_driven=True)
+    assert outcome(event_driven) == outcome(ticking)
+
+
+@pytest.mark.parametrize("seed, arriving_every", TRAFFIC)
+def test_event_driven_batch_matches_ticking(seed, arriving_every):
+    calls = requests(seed, arriving_every)
+    buildings = []
+    for event_driven in (False, True):
+        building = Building(
+            FLOORS,
+            ELEVATORS,
+            CAPACITY,
+            nearest_available,
+            batch_strategy=BatchMatcher(),
+        )
+        building.run_simulation(calls, event_driven=event_driven, report=False)
+        buildings.append(building)
+    assert outcome(buildings[1]) == outcome(buildings[0])
@@ -0,0 +1,41 @@
+from orrery.event_trace import EventTrace, decode, read_events
+from orrery.simulator import Building, nearest_available
+
+# inputs
+
+REQUESTS = [(0, 7, 1, 5), (0, "a\nb", 3, 1), (2, "x", 4, 2), (5, 8, 2, 6)]
+
+
+# helper functions
+
+
+def traced_run(capacity=1 << 10):
+    building = Building(6, 2, 4, nearest_available, event_trace=EventTrace(capacity))
+    building.run_simulation(REQUESTS, report=False)
+    return building
+
+
+# outputs
+
+
+def test_mixed_and_multiline_ids_decode(tmp_path):
+    path = tmp_path / "events.bin"
+    traced_run().event_trace.save(path)
+    events, dropped, names = read_events(path)
+    assert dropped == 0 and names == ["a\nb", "x"]
+    lines = list(decode(path))
+    for pid in (7, "a\nb", "x", 8):
+        assert any(f"Passenger {pid} unloads" in line for line in lines)
+    assert not any("Passenger 0 " in line or "Passenger 1 " in line for line in lines)
+    assert all("passenger" not in line.lower() for line in decode(path, passenger="9"))
+    assert len(list(decode(path, passenger="x"))) == 3  # Assign, board, unload
+
+
+def test_ring_buffer_keeps_latest_events(tmp_path):
+    full, ring = traced_run(), traced_run(capacity=5)
+    full_path, ring_path = tmp_path / "full.bin", tmp_path / "ring.bin"
+    full.event_trace.save(full_path)
+    ring.event_trace.save(ring_path)
+    lines = list(decode(ring_path))
+    assert lines[0] == f"({len(full.event_trace) - 5} earlier events overwritten)"
+    assert lines[1:] == list(decode(full_path))[-5:]
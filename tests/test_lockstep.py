@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from orrery.lockstep import compare_strategies
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.routes import best_insertion
+from orrery.simulator import Building, nearest_available
+from orrery.stats import PassengerStats
+
+# inputs
+
+FLOORS, ELEVATORS, CAPACITY = 20, 4, 6
+STRATEGIES = {"nearest": nearest_available, "bestinsert": best_insertion}
+
+
+def requests(seed, arriving_every, duration=1000):
+    random.seed(seed)
+    return generate_requests(generate_hall_calls(duration, FLOORS, arriving_every))
+
+
+# Light to saturated traffic
+TRAFFIC = [(1, 15.0), (2, 3.0), (3, 1.0), (4, 0.6)]
+
+
+# outputs
+
+
+@pytest.mark.parametrize("seed, arriving_every", TRAFFIC)
+@pytest.mark.parametrize("event_driven", [False, True])
+def test_lockstep_matches_own_runs(seed, arriving_every, event_driven):
+    calls = requests(seed, arriving_every)
+    summaries = compare_strategies(
+        FLOORS, ELEVATORS, CAPACITY, STRATEGIES, calls, event_driven=event_driven
+    )
+    for name, strategy in STRATEGIES.items():
+        building = Building(
+            FLOORS,
+            ELEVATORS,
+            CAPACITY,
+            strategy,
+            stats=PassengerStats(),
+            keep_passenger_times=False,
+        )
+        building.run_simulation(calls, event_driven=event_driven, report=False)
+        assert summaries[name] == building.summary_statistics()
@@ -0,0 +1,75 @@
+import itertools
+import sys
+
+import numpy as np
+import pytest
+
+from orrery.lockstep import run_lockstep
+from orrery.matching import BatchMatcher, min_cost_assignment
+from orrery.simulator import Building, main, nearest_available
+
+# inputs
+
+
+def burst_requests(duration=400, burst=10, every=20, floors=15):
+    requests = []
+    for tick in range(0, duration, every):
+        for index in range(burst):
+            dest = 2 + (tick + 7 * index) % (floors - 1)
+            requests.append((tick, len(requests), 1, dest))
+        requests.append((tick + 3, len(requests), floors, 1 + tick % (floors - 1)))
+    return sorted(requests)
+
+
+# helper functions
+
+
+def batch_building():
+    return Building(15, 4, 6, nearest_available, batch_strategy=BatchMatcher())
+
+
+# outputs
+
+
+def test_min_cost_assignment_matches_brute_force():
+    rng = np.random.default_rng(3)
+    for rows, columns in [(3, 3), (3, 5), (4, 6), (5, 5)]:
+        cost = rng.integers(0, 20, size=(rows, columns)).astype(float)
+        assignment = min_cost_assignment(cost)
+        assert len(set(assignment)) == rows
+        best = min(
+            sum(cost[row, column] for row, column in enumerate(columns_chosen))
+            for columns_chosen in itertools.permutations(range(columns), rows)
+        )
+        assert sum(cost[row, column] for row, column in enumerate(assignment)) == best
+
+
+def test_batch_beats_sequential_nearest_at_up_peak():
+    requests = burst_requests()
+    sequential = Building(15, 4, 6, nearest_available)
+    sequential.run_simulation(requests, report=False)
+    batch = batch_building()
+    batch.run_simulation(requests, report=False)
+    summary = batch.summary_statistics()
+    assert summary["passengers"] == len(requests)
+    assert summary["mean_wait"] < sequential.summary_statistics()["mean_wait"]
+
+
+def test_lockstep_batches_each_tick_like_own_run():
+    requests = burst_requests()
+    own = batch_building()
+    own.run_simulation(requests, report=False)
+    lockstep = batch_building()
+    run_lockstep([lockstep, Building(15, 4, 6, nearest_available)], requests)
+    assert lockstep.wait_times == own.wait_times
+    assert lockstep.travel_times == own.travel_times
+    assert lockstep.batch_strategy.calls == own.batch_strategy.calls == len(requests)
+
+
+def test_cli_rejects_strategy_with_batch(monkeypatch, capsys, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    argv = ["simulator", "-f", "5", "-e", "1", "-c", "4", "--generate", "10"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--batch", "-s", "bestinsert"])
+    with pytest.raises(SystemExit):
+        main()
+    assert "--batch" in capsys.readouterr().err
@@ -0,0 +1,45 @@
+import math
+
+from orrery.montecarlo import (
+    BuildingConfig,
+    aggregate,
+    plan_jobs,
+    print_aggregate,
+    run_job,
+)
+
+# inputs
+
+CONFIG = BuildingConfig(10, 2, 4)
+
+
+# helper functions
+
+
+def summaries(arriving_every, seeds=range(1, 5), duration=200):
+    jobs = plan_jobs(seeds, ["nearest"], [CONFIG], duration, arriving_every)
+    return [run_job(job) for job in jobs]
+
+
+# outputs
+
+
+def test_empty_runs_are_left_out_of_wait_and_travel():
+    busy = summaries(2.0)
+    empty = summaries(2.0, seeds=[9, 10], duration=0)
+    aggregated = aggregate(busy + empty)[(CONFIG, "nearest")]
+    assert aggregated["runs"] == 6 and aggregated["empty_runs"] == 2
+    busy_only = aggregate(busy)[(CONFIG, "nearest")]
+    for kpi in ("mean_wait", "max_wait", "mean_travel", "max_travel"):
+        assert aggregated[kpi] == busy_only[kpi]
+        assert not math.isnan(aggregated[kpi][1])
+    assert aggregated["ticks"] != busy_only["ticks"]
+
+
+def test_only_empty_runs(capsys):
+    aggregated = aggregate(summaries(2.0, duration=0))
+    kpi_stats = aggregated[(CONFIG, "nearest")]
+    assert kpi_stats["empty_runs"] == kpi_stats["runs"] == 4
+    assert all(math.isnan(value) for value in kpi_stats["mean_wait"])
+    print_aggregate(aggregated)
+    assert "4 runs, 4 without passengers excluded" in capsys.readouterr().out
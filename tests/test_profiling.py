@@ -0,0 +1,32 @@
+from orrery.matching import BatchMatcher
+from orrery.profiling import PhaseProfile
+from orrery.simulator import Building, nearest_available
+
+# inputs
+
+# Three calls per tick for 50 ticks
+REQUESTS = [
+    (tick, 3 * tick + i, 1, 2 + (tick + i) % 8) for tick in range(50) for i in range(3)
+]
+
+
+# outputs
+
+
+def test_strategy_decisions_timed():
+    profile = PhaseProfile()
+    building = Building(10, 3, 6, nearest_available, profile=profile)
+    building.run_simulation(REQUESTS, report=False)
+    assert profile.calls["strategy"] == profile.decisions.count == len(REQUESTS)
+    assert "batch" not in profile.phases()
+
+
+def test_batch_decisions_timed():
+    profile = PhaseProfile()
+    building = Building(
+        10, 3, 6, nearest_available, profile=profile, batch_strategy=BatchMatcher()
+    )
+    building.run_simulation(REQUESTS, report=False)
+    assert profile.calls["batch"] == profile.decisions.count == 50
+    assert profile.summary()["decisions"]["count"] == 50
+    assert building.summary_statistics()["batches"] == 50
@@ -0,0 +1,64 @@
+from orrery.reopt import Reoptimizer
+from orrery.request_generator import generate_hall_call_chunks, stream_requests
+from orrery.simulator import Building, make_strategy
+
+# inputs
+
+
+def requests(duration=400):
+    return list(stream_requests(generate_hall_call_chunks(duration, 12, 2.0, 7)))
+
+
+# helper functions
+
+
+def run(strategy):
+    building = Building(12, 3, 6, strategy)
+    building.run_simulation(requests(), event_driven=True, report=False)
+    return building.summary_statistics()
+
+
+# outputs
+
+
+def test_never_worse_than_best_insertion():
+    reoptimizer = Reoptimizer(time_budget=10)
+    gaps = []
+
+    def checked(elevators, passenger_id, source_floor, dest_floor):
+        current = sum(e.route.cost(e.current_floor) for e in elevators)
+        request = (source_floor, dest_floor)
+        marginal = min(
+            e.route.best_insertion(
+                e.current_floor, len(e.passengers), e.max_passengers, *request
+            ).cost
+            for e in elevators
+        )
+        elevator = reoptimizer(elevators, passenger_id, source_floor, dest_floor)
+        solution = reoptimizer.last_solution
+        assert current <= solution.lower_bound <= solution.cost <= current + marginal
+        gaps.append(solution.gap)
+        return elevator
+
+    checked.plans_routes = True
+    summary = run(checked)
+    assert summary["passengers"] == len(requests())
+    assert gaps and max(gaps) == 0  # Proven optimal within the ample budget
+
+
+def test_memo_bounded_between_decisions():
+    reoptimizer = Reoptimizer(max_memo=50)
+    building = Building(12, 3, 6, reoptimizer)
+    for time, pid, source, dest in requests(100):
+        building.process_request(time, pid, source, dest)
+        reoptimizer.trim_memo()
+        assert len(reoptimizer.exact) <= 50 and len(reoptimizer.lower) <= 50
+        building.simulate_time_step(time)
+
+
+def test_each_building_gets_its_own_reoptimizer():
+    first, second = make_strategy("reopt"), make_strategy("reopt")
+    assert isinstance(first, Reoptimizer) and first is not second
+    assert make_strategy("nearest") is make_strategy("nearest")
+    # A warm memo from another run doesn't change results
+    assert run(first) == run(second) == run(make_strategy("reopt"))
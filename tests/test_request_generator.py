@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from orrery.request_generator import (
+    generate_hall_call_chunks,
+    generate_scheduled_chunks,
+    read_requests_binary,
+    stream_requests,
+    write_chunks_to_binary,
+)
+
+# inputs
+
+FLOORS = 10
+PERIOD = 4000
+# Quiet night, morning peak, then a moderate day, repeating every PERIOD
+SCHEDULE = [(0, 4.0), (1000, 0.5), (1500, 2.0)]
+DURATION = 5 * PERIOD
+SIGMAS = 5  # Tolerance in standard deviations of the sampling noise
+
+
+# helper functions
+
+
+def generated(seed=11, chunk_size=1000):
+    chunks = list(
+        generate_scheduled_chunks(
+            DURATION, FLOORS, SCHEDULE, seed, chunk_size, period=PERIOD
+        )
+    )
+    times = np.concatenate([chunk.times for chunk in chunks])
+    origins = np.concatenate([chunk.origins for chunk in chunks])
+    destinations = np.concatenate([chunk.destinations for chunk in chunks])
+    return chunks, times, origins, destinations
+
+
+def assert_shares(counts, share):
+    """Assert each count's share is within noise of the expected share."""
+    total = counts.sum()
+    noise = SIGMAS * np.sqrt(share * (1 - share) / total)
+    assert np.all(np.abs(counts / total - share) <= noise)
+
+
+# outputs
+
+
+def test_arrival_rate_per_schedule_entry():
+    _, times, _, _ = generated()
+    offsets = times % PERIOD
+    ends = [start for start, _ in SCHEDULE[1:]] + [PERIOD]
+    for (start, every), end in zip(SCHEDULE, ends):
+        calls = np.count_nonzero((offsets >= start) & (offsets < end))
+        expected = DURATION // PERIOD * (end - start) / every
+        # Poisson counts: variance equals the mean
+        assert abs(calls - expected) <= SIGMAS * np.sqrt(expected)
+
+
+def test_origin_and_destination_shares_uniform_over_distinct_floors():
+    _, _, origins, destinations = generated()
+    assert np.all(origins != destinations)
+    floors = np.arange(1, FLOORS + 1)
+    for column in (origins, destinations):
+        assert set(np.unique(column)) == set(floors)
+        assert_shares(np.bincount(column, minlength=FLOORS + 1)[1:], 1 / FLOORS)
+    pairs = (origins - 1) * FLOORS + (destinations - 1)
+    pair_counts = np.bincount(pairs, minlength=FLOORS * FLOORS)
+    off_diagonal = pair_counts.reshape(FLOORS, FLOORS)[~np.eye(FLOORS, dtype=bool)]
+    assert_shares(off_diagonal, 1 / (FLOORS * (FLOORS - 1)))
+
+
+def test_ids_and_times_continue_across_chunks_and_periods():
+    chunks, times, _, _ = generated(chunk_size=97)
+    assert np.all(np.diff(times) >= 0) and times[0] >= 0 and times[-1] < DURATION
+    first_ids = [chunk.first_id for chunk in chunks]
+    sizes = [len(chunk.times) for chunk in chunks]
+    assert first_ids == list(np.cumsum([1] + sizes[:-1]))
+    # Reproducible from the seed
+    _, same_times, _, _ = generated(chunk_size=97)
+    assert np.array_equal(times, same_times)
+
+
+def test_schedule_must_start_at_zero():
+    with pytest.raises(ValueError):
+        next(generate_scheduled_chunks(100, FLOORS, [(10, 1.0)]))
+
+
+def test_binary_requests_round_trip(tmp_path):
+    path = tmp_path / "requests.bin"
+    chunks = list(generate_hall_call_chunks(2000, FLOORS, 1.0, 3, chunk_size=128))
+    assert write_chunks_to_binary(chunks, path) == sum(len(c.times) for c in chunks)
+    records = read_requests_binary(path)
+    columns = [records[field].tolist() for field in records.dtype.names]
+    assert list(zip(*columns)) == list(stream_requests(chunks))
+
+
+def test_empty_binary_requests_file(tmp_path):
+    path = tmp_path / "requests.bin"
+    assert write_chunks_to_binary(generate_hall_call_chunks(0, FLOORS), path) == 0
+    assert len(read_requests_binary(path)) == 0
+
+
+def test_truncated_binary_requests_file(tmp_path):
+    path = tmp_path / "requests.bin"
+    write_chunks_to_binary(generate_hall_call_chunks(200, FLOORS, 1.0, 3), path)
+    size = path.stat().st_size
+    with open(path, "r+b") as file:
+        file.truncate(size - 1)
+    with pytest.raises(ValueError, match="truncated"):
+        read_requests_binary(path)
+    with open(path, "r+b") as file:
+        file.truncate(10)
+    with pytest.raises(ValueError, match="not a binary requests file"):
+        read_requests_binary(path)
+
+
+def test_chunked_calls_are_ordered_and_numbered_across_chunks():
+    chunks = list(generate_hall_call_chunks(3000, FLOORS, 0.7, 9, chunk_size=64))
+    requests = list(stream_requests(chunks))
+    assert len(chunks) > 1 and all(len(chunk.times) <= 64 for chunk in chunks)
+    times, ids, origins, destinations = map(np.array, zip(*requests))
+    assert np.all(np.diff(times) >= 0) and times[0] >= 0 and times[-1] < 3000
+    assert np.array_equal(ids, np.arange(1, len(requests) + 1))
+    assert np.all(origins != destinations)
+    for floors in (origins, destinations):
+        assert floors.min() >= 1 and floors.max() <= FLOORS
+    again = generate_hall_call_chunks(3000, FLOORS, 0.7, 9, chunk_size=64)
+    assert list(stream_requests(again)) == requests
@@ -0,0 +1,76 @@
+import os
+
+from orrery.result_cache import ResultCache, cache_key, file_digest
+from orrery.simulator import make_strategy, nearest_available
+from orrery.state_trace import StateTrace
+from orrery.sweep import SweepPoint, point_keys, run_sweep
+
+# inputs
+
+CONFIG = {"floors": 10, "elevators": 2, "capacity": 4, "movement": "nearest"}
+
+
+def write_requests(path):
+    rows = [(t, f"passenger{t}", 1 + t % 9, 10 - t % 9) for t in range(0, 60, 3)]
+    with open(path, "w") as file:
+        file.write("time,id,source,dest\n")
+        file.writelines(f"{t},{pid},{s},{d}\n" for t, pid, s, d in rows if s != d)
+    return str(path)
+
+
+# outputs
+
+
+def test_key_depends_on_every_input(tmp_path):
+    digest = file_digest(write_requests(tmp_path / "requests.csv"))
+    key = cache_key(CONFIG, nearest_available, digest)
+    assert key == cache_key(dict(CONFIG), nearest_available, digest)
+    assert key != cache_key({**CONFIG, "capacity": 5}, nearest_available, digest)
+    assert key != cache_key(CONFIG, make_strategy("bestinsert"), digest)
+    assert key != cache_key(CONFIG, nearest_available, "0" * 64)
+    # Stateful strategies are keyed by class, not by instance
+    reopt_keys = {cache_key(CONFIG, make_strategy("reopt"), digest) for _ in range(2)}
+    assert len(reopt_keys) == 1
+
+
+def test_put_get_and_trace_round_trip(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    assert cache.get("a") is None and "a" not in cache
+    trace = tmp_path / "trace.bin"
+    trace.write_bytes(b"state trace bytes" * 100)
+    cache.put("a", {"mean_wait": 1.5}, CONFIG, str(trace))
+    assert "a" in cache and cache.get("a") == {"mean_wait": 1.5}
+    assert cache.extract_trace("a", tmp_path / "out.bin")
+    assert (tmp_path / "out.bin").read_bytes() == trace.read_bytes()
+    cache.put("b", {"mean_wait": 2.0})
+    assert not cache.extract_trace("b", tmp_path / "none.bin")
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1000)
+    for key in "abc":
+        cache.put(key, {"padding": "x" * 200})
+        os.utime(cache.summary_path(key), (0, {"a": 1, "b": 2, "c": 3}[key]))
+    cache.get("a")  # Now the most recently used
+    cache.put("d", {"padding": "x" * 600})
+    assert "a" in cache and "d" in cache
+    assert "b" not in cache
+
+
+def test_sweep_simulates_only_missing_points(tmp_path, capsys):
+    requests = write_requests(tmp_path / "requests.csv")
+    cache = ResultCache(tmp_path / "cache")
+    points = [
+        SweepPoint(requests, 10, elevators, 4, strategy, "nearest", 1)
+        for elevators in (1, 2)
+        for strategy in ("nearest", "bestinsert")
+    ]
+    first = run_sweep(points[:2], cache, traces=True, max_workers=1)
+    assert "0 of 2 points cached" in capsys.readouterr().out
+    second = run_sweep(points, cache, max_workers=1)
+    assert "2 of 4 points cached" in capsys.readouterr().out
+    assert all(second[point] == first[point] for point in points[:2])
+    key = point_keys(points[:1])[0]
+    assert cache.extract_trace(key, tmp_path / "point.trace")
+    trace = StateTrace(tmp_path / "point.trace")
+    assert len(trace) == second[points[0]]["ticks"]
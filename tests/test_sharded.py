@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from orrery.request_generator import (
+    generate_hall_call_chunks,
+    generate_hall_calls,
+    generate_requests,
+    stream_requests,
+)
+from orrery.sharded import Bank, ZoneRouter, parse_bank, run_sharded
+from orrery.simulator import Building, nearest_available
+from orrery.state_trace import StateTrace
+from orrery.stats import PassengerStats
+
+# inputs
+
+BANKS = [Bank(10, 2), Bank(20, 3)]
+
+
+def site_requests(duration=1500):
+    return list(stream_requests(generate_hall_call_chunks(duration, 20, 1.5, 9)))
+
+
+def bank_requests(seed, arriving_every, duration=1000):
+    random.seed(seed)
+    return generate_requests(generate_hall_calls(duration, 20, arriving_every))
+
+
+# outputs
+
+
+def test_zone_router_picks_lowest_bank_serving_both_floors():
+    router = ZoneRouter(BANKS)
+    assert router((0, 1, 1, 10)) == 0
+    assert router((0, 2, 11, 1)) == 1
+    with pytest.raises(ValueError):
+        router((0, 3, 1, 21))
+    assert parse_bank("20:4") == Bank(20, 4)
+
+
+def test_banks_match_their_own_runs(tmp_path):
+    requests = site_requests()
+    trace_path = tmp_path / "site.trace"
+    stats, results = run_sharded(BANKS, requests, 6, window=200, trace=str(trace_path))
+    router = ZoneRouter(BANKS)
+    merged = PassengerStats()
+    for index, bank in enumerate(BANKS):
+        building = Building(
+            bank.top_floor,
+            bank.elevators,
+            6,
+            nearest_available,
+            stats=PassengerStats(),
+            keep_passenger_times=False,
+        )
+        own = [request for request in requests if router(request) == index]
+        building.run_simulation(own, report=False)
+        assert results[index].stats.summary() == building.stats.summary()
+        merged.merge(building.stats)
+    assert stats.summary() == merged.summary()
+    assert stats.passengers == len(requests)
+    trace = StateTrace(trace_path)
+    assert trace.elevator_ids == [1, 2, 3, 4, 5]
+    assert len(trace) == max(result.ticks for result in results)
+
+
+@pytest.mark.parametrize("seed, arriving_every", [(2, 3.0), (3, 1.0)])
+def test_single_bank_matches_plain_run(tmp_path, seed, arriving_every):
+    requests = bank_requests(seed, arriving_every)
+    trace_path = tmp_path / "sharded.trace"
+    stats, results = run_sharded(
+        [Bank(20, 4)], requests, 6, window=100, trace=str(trace_path)
+    )
+    building = Building(
+        20,
+        4,
+        6,
+        nearest_available,
+        stats=PassengerStats(),
+        keep_passenger_times=False,
+    )
+    building.run_simulation(requests, report=False)
+    assert stats.summary() == building.stats.summary()
+    assert results[0].ticks == len(building.state_log)
+    trace = StateTrace(trace_path)
+    assert list(trace.rows()) == [
+        (time, elevator_id, floor)
+        for time, states in sorted(building.state_log.items())
+        for elevator_id, floor in states.items()
+    ]
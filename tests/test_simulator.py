@@ -0,0 +1,166 @@
+import math
+import random
+import sys
+
+import pytest
+
+from orrery.montecarlo import BuildingConfig, MonteCarloJob, run_job
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import (
+    Building,
+    PassengerIds,
+    PassengerTimes,
+    RequestColumns,
+    load_requests_from_csv,
+    main,
+    nearest_available,
+    stream_requests_from_csv,
+    stream_requests_from_shards,
+)
+
+# helper functions
+
+
+def write_requests(path, rows):
+    with open(path, "w") as file:
+        file.write("time,id,source,dest\n")
+        file.writelines(f"{t},{pid},{source},{dest}\n" for t, pid, source, dest in rows)
+    return str(path)
+
+
+# outputs
+
+
+def test_streamed_requests_match_loaded_requests(tmp_path):
+    random.seed(5)
+    requests = generate_requests(generate_hall_calls(300, 10, 1.0))
+    path = write_requests(tmp_path / "requests.csv", requests)
+    assert list(stream_requests_from_csv(path)) == load_requests_from_csv(path)
+    names = PassengerIds(keep_names=True)
+    interned = list(stream_requests_from_csv(path, names))
+    assert [pid for _, pid, _, _ in interned] == list(range(1, len(requests) + 1))
+    assert [names.name(pid) for _, pid, _, _ in interned] == [
+        pid for _, pid, _, _ in requests
+    ]
+
+
+def test_stream_of_header_only_file(tmp_path):
+    path = write_requests(tmp_path / "requests.csv", [])
+    assert list(stream_requests_from_csv(path)) == []
+
+
+def test_stream_rejects_unsorted_file(tmp_path):
+    rows = [(0, "p1", 1, 5), (4, "p2", 2, 6), (3, "p3", 6, 1)]
+    path = write_requests(tmp_path / "requests.csv", rows)
+    stream = stream_requests_from_csv(path)
+    assert next(stream) == (0, "p1", 1, 5)
+    with pytest.raises(ValueError, match="line 4"):
+        list(stream)
+
+
+def test_shards_merge_by_time_then_shard_order(tmp_path):
+    first = write_requests(tmp_path / "a.csv", [(0, "a1", 1, 5), (3, "a2", 2, 6)])
+    second = write_requests(tmp_path / "b.csv", [(0, "b1", 4, 1), (2, "b2", 5, 1)])
+    merged = [pid for _, pid, _, _ in stream_requests_from_shards([first, second])]
+    assert merged == ["a1", "b1", "b2", "a2"]
+
+
+def test_run_reads_stream_as_time_reaches_it():
+    pulled = []
+
+    def requests():
+        for time in range(0, 100, 10):
+            pulled.append(time)
+            yield time, f"p{time}", 1, 5
+
+    building = Building(5, 2, 4, nearest_available)
+    building.run_simulation(requests(), report=False, until=35)
+    assert pulled == [0, 10, 20, 30, 40]  # One request of lookahead
+
+
+def test_request_columns_store_24_bytes_per_request():
+    requests = [(time, time + 1, 1 + time % 50, 50 - time % 50) for time in range(100)]
+    columns = RequestColumns(requests)
+    assert list(columns) == requests
+    arrays = (columns.times, columns.pids, columns.sources, columns.dests)
+    assert sum(array.itemsize for array in arrays) == 24
+
+
+def test_passenger_times_behave_as_dict():
+    times = PassengerTimes()
+    times[3] = 0
+    times[1] = 12
+    times[1] = 14
+    assert len(times) == 2
+    assert dict(times) == {1: 14, 3: 0}
+    assert times.values() == [14, 0]
+    for missing in (0, 2, 4, 10**6, -1):
+        assert missing not in times
+    del times[3]
+    assert dict(times) == {1: 14}
+    with pytest.raises(KeyError):
+        del times[3]
+    with pytest.raises(KeyError):
+        times[-1] = 5
+
+
+def test_empty_passenger_times():
+    times = PassengerTimes()
+    assert len(times) == 0 and list(times) == [] and times.values() == []
+    with pytest.raises(KeyError):
+        times[1]
+
+
+def test_compact_run_matches_dict_run():
+    random.seed(4)
+    requests = generate_requests(generate_hall_calls(500, 10, 1.5))
+    names = PassengerIds(keep_names=True)
+    interned = [(t, names(pid), source, dest) for t, pid, source, dest in requests]
+    buildings = []
+    for calls, compact in ((requests, False), (interned, True)):
+        building = Building(10, 3, 6, nearest_available, compact=compact)
+        building.run_simulation(calls, report=False)
+        buildings.append(building)
+    plain, compact = buildings
+    for kind in ("wait_times", "travel_times"):
+        times = getattr(compact, kind)
+        assert isinstance(times, PassengerTimes)
+        named = {names.name(pid): time for pid, time in times.items()}
+        assert named == getattr(plain, kind)
+    assert compact.summary_statistics() == plain.summary_statistics()
+
+
+def test_run_without_passengers_reports_nan(capsys):
+    building = Building(5, 2, 4, nearest_available)
+    building.run_simulation([], report=False)
+    summary = building.summary_statistics()
+    assert summary["passengers"] == 0
+    assert all(math.isnan(summary[kpi]) for kpi in ("min_wait", "max_travel"))
+    building.output_statistics()
+    assert "n/a" in capsys.readouterr().out
+
+
+def test_monte_carlo_job_without_requests():
+    job = MonteCarloJob(1, "nearest", BuildingConfig(5, 2, 4), 0, 5)
+    _, summary = run_job(job)
+    assert summary["passengers"] == 0 and math.isnan(summary["mean_wait"])
+
+
+def test_cli_needs_one_request_source(monkeypatch, capsys, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for request_args in ([], ["-r", "requests.csv", "--generate", "10"]):
+        argv = ["simulator", "-f", "5", "-e", "1", "-c", "4", *request_args]
+        monkeypatch.setattr(sys, "argv", argv)
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == 2
+        assert "--generate" in capsys.readouterr().err
+
+
+def test_cli_rejects_period_without_schedule(monkeypatch, capsys, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    argv = ["simulator", "-f", "5", "-e", "1", "-c", "4", "--generate", "10"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--period", "100"])
+    with pytest.raises(SystemExit):
+        main()
+    assert "--schedule" in capsys.readouterr().err
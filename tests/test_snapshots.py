@@ -0,0 +1,97 @@
+import sys
+from functools import partial
+
+import pytest
+
+from orrery.request_generator import generate_hall_call_chunks, stream_requests
+from orrery.profiling import PhaseProfile
+from orrery.simulator import Building, main, nearest_available
+from orrery.snapshots import run_variant, run_with_snapshots, use_strategy
+
+# inputs
+
+
+def busy_requests(duration=1500):
+    """20 floors, 4 cars, a call every 1.2 ticks."""
+    return list(stream_requests(generate_hall_call_chunks(duration, 20, 1.2, 5)))
+
+
+# helper functions
+
+
+def snapshot_at(requests, every):
+    building = Building(20, 4, 8, nearest_available)
+    time, snapshot = next(run_with_snapshots(building, requests, every))
+    return time, snapshot
+
+
+# outputs
+
+
+def test_resumed_run_matches_uninterrupted_run():
+    requests = busy_requests()
+    uninterrupted = Building(20, 4, 8, nearest_available)
+    uninterrupted.run_simulation(requests, report=False)
+    _, snapshot = snapshot_at(requests, 700)
+    assert run_variant(snapshot, None, requests) == uninterrupted.summary_statistics()
+
+
+def test_switch_to_routing_strategy_plans_assigned_passengers():
+    requests = busy_requests()
+    _, snapshot = snapshot_at(requests, 700)
+    building = Building.restore(snapshot)
+    use_strategy("bestinsert", building)
+    for elevator in building.elevators:
+        stops = {(stop.pid, stop.dropoff) for stop in elevator.route}
+        riders = {(pid, True) for pid in elevator.passengers}
+        waiting = {
+            (passenger.pid, dropoff)
+            for (_, elevator_id), queue in building.occupancy.queues.items()
+            if elevator_id == elevator.id
+            for passenger in queue
+            for dropoff in (False, True)
+        }
+        assert stops == riders | waiting
+    assert len(building.occupancy)  # Passengers assigned by nearest still waiting
+    for name in ("bestinsert", "reopt"):
+        summary = run_variant(snapshot, partial(use_strategy, name), requests)
+        assert summary["passengers"] == len(requests)
+
+
+def test_switch_back_from_routing_strategy_drops_routes():
+    building = Building(20, 4, 8, nearest_available)
+    use_strategy("bestinsert", building)
+    building.run_simulation(busy_requests(300), report=False, until=150)
+    assert any(elevator.route for elevator in building.elevators)
+    use_strategy("nearest", building)
+    assert not any(elevator.route for elevator in building.elevators)
+
+
+def test_profiled_building_refuses_snapshot(monkeypatch, capsys, tmp_path):
+    building = Building(20, 4, 8, nearest_available, profile=PhaseProfile())
+    building.run_simulation(busy_requests(100), report=False, until=50)
+    with pytest.raises(ValueError):
+        building.snapshot()
+    monkeypatch.chdir(tmp_path)
+    argv = ["simulator", "-f", "10", "-e", "2", "-c", "4", "--generate", "500"]
+    options = ["--seed", "1", "--profile", "prof.json", "--snapshot-every", "100"]
+    monkeypatch.setattr(sys, "argv", argv + options)
+    with pytest.raises(SystemExit):
+        main()
+    assert "--profile" in capsys.readouterr().err
+
+
+def test_pausing_keeps_reading_the_same_request_stream():
+    requests = busy_requests()
+    uninterrupted = Building(20, 4, 8, nearest_available)
+    uninterrupted.run_simulation(requests, report=False)
+    # A one-shot stream can't be re-read from the start on each resume
+    stream = iter(requests)
+    paused = Building(20, 4, 8, nearest_available)
+    until = 100
+    while not paused.run_simulation(stream, report=False, until=until):
+        # Snapshots leave the live stream out
+        assert Building.restore(paused.snapshot()).paused_requests is None
+        until += 100
+    assert paused.summary_statistics() == uninterrupted.summary_statistics()
+    assert dict(paused.state_log) == dict(uninterrupted.state_log)
@@ -0,0 +1,47 @@
+import numpy as np
+
+from orrery.simulator import Building, nearest_available
+from orrery.state_trace import StateTrace, StateTraceWriter, merge_traces
+
+# helper functions
+
+
+def write_trace(path, requests, elevators=2):
+    with StateTraceWriter(path) as writer:
+        building = Building(8, elevators, 4, nearest_available, writer)
+        building.run_simulation(requests, report=False)
+    return StateTrace(path)
+
+
+def write_header_only(path, elevator_ids):
+    with StateTraceWriter(path) as writer:
+        writer.start(0, elevator_ids)
+    return StateTrace(path)
+
+
+# outputs
+
+
+def test_merge_pads_shorter_traces_with_last_row(tmp_path):
+    long = write_trace(tmp_path / "long.trace", [(0, 1, 1, 8), (3, 2, 6, 2)])
+    short = write_trace(tmp_path / "short.trace", [(0, 1, 2, 1)])
+    merged = StateTrace(
+        merge_traces([long.floors.filename, short.floors.filename], tmp_path / "m")
+    )
+    assert len(merged) == len(long) > len(short)
+    assert np.array_equal(merged.floors[:, :2], long.floors)
+    assert np.array_equal(merged.floors[: len(short), 2:], short.floors)
+    assert (merged.floors[len(short) :, 2:] == short.floors[-1]).all()
+
+
+def test_merge_with_trace_without_ticks(tmp_path):
+    trace = write_trace(tmp_path / "a.trace", [(0, 1, 1, 5)])
+    empty = write_header_only(tmp_path / "empty.trace", [1, 2])
+    assert len(empty) == 0
+    paths = [tmp_path / "empty.trace", tmp_path / "a.trace"]
+    merged = StateTrace(merge_traces(paths, tmp_path / "m", [1, 2, 3, 4]))
+    assert merged.elevator_ids == [1, 2, 3, 4]
+    assert np.array_equal(merged.floors[:, 2:], trace.floors)
+    assert (merged.floors[:, :2] == 1).all()
+    only_empty = StateTrace(merge_traces(paths[:1], tmp_path / "e"))
+    assert len(only_empty) == 0
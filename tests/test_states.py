@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import Building, nearest_available
+from orrery.states import CompactStateLog
+
+# inputs
+
+TICKS = [
+    (0, {1: 1, 2: 1}),
+    (1, {1: 2, 2: 1}),
+    (2, {1: 3, 2: 1}),
+    (3, {1: 3, 2: 1}),
+    (4, {1: 3, 2: 2}),
+]
+
+
+# helper functions
+
+
+def compact_log(ticks):
+    log = CompactStateLog()
+    for time, states in ticks:
+        log[time] = states
+    return log
+
+
+# outputs
+
+
+def test_empty_log():
+    log = CompactStateLog()
+    assert len(log) == 0
+    assert list(log) == []
+    assert list(log.rows()) == []
+    assert log.changes() == 0
+    assert 0 not in log
+    with pytest.raises(KeyError):
+        log[0]
+
+
+def test_single_tick():
+    log = compact_log([(7, {1: 4, 2: 9})])
+    assert len(log) == 1
+    assert list(log.rows()) == [(7, 1, 4), (7, 2, 9)]
+    assert log.floor_at(2, 7) == 9
+    with pytest.raises(KeyError):
+        log.floor_at(1, 8)
+
+
+def test_runs_merge_unchanged_floors():
+    log = compact_log(TICKS)
+    assert log.changes() == 5  # Car 1 changes at 0, 1, 2; car 2 at 0, 4
+    assert dict(log.items()) == dict(TICKS)
+    assert list(log.rows()) == [
+        (time, elevator_id, floor)
+        for time, states in TICKS
+        for elevator_id, floor in states.items()
+    ]
+    assert [log.floor_at(1, time) for time in range(5)] == [1, 2, 3, 3, 3]
+
+
+def test_rerecording_latest_tick_overwrites_it():
+    log = compact_log(TICKS[:2])
+    log[1] = {1: 1, 2: 1}
+    assert log.changes() == 2
+    assert log[1] == {1: 1, 2: 1}
+    with pytest.raises(ValueError):
+        log[0] = {1: 1, 2: 1}
+
+
+def test_building_log_matches_dict_log():
+    random.seed(3)
+    requests = generate_requests(generate_hall_calls(500, 20, 2.0))
+    logs = []
+    for state_log in (None, CompactStateLog()):
+        random.seed(0)
+        building = Building(20, 4, 6, nearest_available, state_log=state_log)
+        building.run_simulation(requests, report=False)
+        logs.append(building.state_log)
+    assert dict(logs[1].items()) == dict(logs[0])
+    assert logs[1].changes() < len(logs[0]) * 4
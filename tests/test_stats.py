@@ -0,0 +1,32 @@
+import math
+
+from orrery.stats import PassengerStats
+
+# outputs
+
+
+def test_time_to_destination_sla_is_share_within_limit():
+    stats = PassengerStats()
+    # Mean total is 55, but one passenger in four takes over 100
+    for wait, travel in [(10, 20), (10, 30), (5, 15), (40, 90)]:
+        stats.record(wait, travel)
+    report = {description: row for description, *row in stats.sla_report()}
+    achieved, target, passed = report["100% of times to destination ≤ 100"]
+    assert (achieved, target, passed) == (0.75, 1.0, False)
+    assert stats.summary()["total_at_most_100"] == 0.75
+
+
+def test_limit_itself_meets_time_to_destination_sla():
+    stats = PassengerStats()
+    stats.record(20, 80)
+    assert all(passed for *_, passed in stats.sla_report())
+
+
+def test_empty_stats_report_na(capsys):
+    stats = PassengerStats()
+    summary = stats.summary()
+    assert summary["passengers"] == 0
+    assert math.isnan(summary["min_wait"]) and math.isnan(summary["max_total"])
+    stats.print_report()
+    output = capsys.readouterr().out
+    assert "n/a" in output and "inf" not in output
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from orrery.simulator import Elevator
+from orrery.targets import TargetFloors
+
+# helper functions
+
+
+def elevator_at(floor, targets, direction=0, movement="nearest"):
+    elevator = Elevator(1, 8, movement)
+    elevator.current_floor = floor
+    elevator.direction = direction
+    for target in targets:
+        elevator.target_floors.add(target)
+    return elevator
+
+
+def scanned_next_floor(floor, targets, direction, movement):
+    """Next floor by a linear scan over the targets, as before the index."""
+    elsewhere = [target for target in targets if target != floor]
+    if not elsewhere:
+        return None
+    ahead = [target for target in elsewhere if (target - floor) * direction > 0]
+    behind = [target for target in elsewhere if (target - floor) * direction < 0]
+    if movement == "look" and direction and ahead and behind:
+        return min(ahead, key=lambda target: abs(target - floor))
+    return min(
+        elsewhere,
+        key=lambda t: (abs(t - floor), (t - floor) * direction < 0, t),
+    )
+
+
+# outputs
+
+
+def test_counts_repeated_floors():
+    floors = TargetFloors([5, 3, 5, 9])
+    assert list(floors) == [3, 5, 5, 9]
+    assert len(floors) == 4 and floors.count(5) == 2
+    floors.remove(5)
+    assert 5 in floors and floors.count(5) == 1
+    floors.remove(5)
+    assert 5 not in floors and list(floors) == [3, 9]
+    with pytest.raises(ValueError):
+        floors.remove(5)
+
+
+def test_nearest_above_and_below_are_strict():
+    floors = TargetFloors([3, 5, 9])
+    assert floors.nearest_above(5) == 9
+    assert floors.nearest_below(5) == 3
+    assert floors.nearest_above(9) is None
+    assert floors.nearest_below(3) is None
+    empty = TargetFloors()
+    assert empty.nearest_above(1) is None and empty.nearest_below(1) is None
+
+
+def test_look_keeps_direction_while_targets_lie_ahead():
+    assert elevator_at(5, [4, 8], direction=1, movement="look").next_floor() == 8
+    assert elevator_at(5, [4, 8], direction=1).next_floor() == 4
+    assert elevator_at(5, [4, 2], direction=1, movement="look").next_floor() == 4
+    assert elevator_at(5, [5]).next_floor() is None
+
+
+def test_ties_go_to_direction_of_travel_else_lower_floor():
+    assert elevator_at(5, [3, 7], direction=1).next_floor() == 7
+    assert elevator_at(5, [3, 7], direction=-1).next_floor() == 3
+    assert elevator_at(5, [3, 7]).next_floor() == 3
+
+
+def test_full_elevator_only_heads_for_dropoffs():
+    elevator = elevator_at(5, [6])
+    elevator.max_passengers = 1
+    elevator.passengers["p1"] = 2
+    elevator.target_floors.add(2)
+    elevator.dropoff_floors.add(2)
+    assert elevator.next_floor() == 2
+
+
+@pytest.mark.parametrize("movement", ["nearest", "look"])
+def test_next_floor_matches_linear_scan(movement):
+    rng = random.Random(7)
+    for _ in range(2000):
+        floor = rng.randint(1, 20)
+        targets = [rng.randint(1, 20) for _ in range(rng.randint(0, 6))]
+        direction = rng.choice([-1, 0, 1])
+        elevator = elevator_at(floor, targets, direction, movement)
+        assert elevator.next_floor() == scanned_next_floor(
+            floor, targets, direction, movement
+        )
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from orrery.request_generator import generate_hall_calls, generate_requests
+from orrery.simulator import (
+    Building,
+    nearest_available,
+    random_available,
+    random_choice,
+)
+from orrery.vectorized import VectorBuilding
+
+# inputs
+
+FLOORS, ELEVATORS, CAPACITY = 20, 4, 6
+
+
+def requests(seed, arriving_every, duration=500):
+    random.seed(seed)
+    return generate_requests(generate_hall_calls(duration, FLOORS, arriving_every))
+
+
+# Light to saturated traffic
+TRAFFIC = [(1, 15.0), (2, 3.0), (3, 1.0), (4, 0.6)]
+
+
+# helper functions
+
+
+def run(requests, strategy, seed, building_class):
+    random.seed(seed)
+    building = building_class(FLOORS, ELEVATORS, CAPACITY, strategy)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        building.run_simulation(requests)
+    return building, output.getvalue()
+
+
+def outcome(building):
+    return dict(building.state_log), building.wait_times, building.travel_times
+
+
+# outputs
+
+
+@pytest.mark.parametrize("seed, arriving_every", TRAFFIC)
+@pytest.mark.parametrize(
+    "strategy",
+    [nearest_available, random_available, random_choice],
+    ids=lambda s: s.__name__,
+)
+def test_vector_building_matches_building(strategy, seed, arriving_every):
+    calls = requests(seed, arriving_every)
+    building, report = run(calls, strategy, seed, Building)
+    vector, vector_report = run(calls, strategy, seed, VectorBuilding)
+    assert outcome(vector) == outcome(building)
+    assert vector_report == report